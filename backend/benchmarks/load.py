@@ -0,0 +1,309 @@
+# Run from the backend directory, e.g.
+# `python -m benchmarks.load --projects 100000 --concurrency 32`,
+# to drive the inference and CRUD apps in-process with concurrent clients.
+# /analysis calls the configured LLM and only runs when listed explicitly:
+# `python -m benchmarks.load --scenarios analysis --requests 20`.
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.stats import print_table, summarize, write_report
+from benchmarks.synthetic import (
+    BENCHMARK_DIR,
+    generate_catalog,
+    random_description,
+    random_request,
+    random_skills,
+    synthetic_service,
+)
+from settings import settings
+
+INFERENCE_SCENARIOS = ("predict", "predict_batch", "analysis")
+CRUD_SCENARIOS = ("crud_create_project", "crud_list_projects", "crud_interaction")
+DEFAULT_SCENARIOS = (
+    "predict",
+    "predict_batch",
+    "crud_create_project",
+    "crud_list_projects",
+    "crud_interaction",
+)
+
+# (method, url, json body) of the i-th request of a scenario
+MakeRequest = Callable[[int], Tuple[str, str, Any]]
+
+
+async def drive(
+    client, make_request: MakeRequest, n_requests: int, concurrency: int
+) -> Dict[str, Any]:
+    """
+    Send `n_requests` requests from `concurrency` concurrent clients.
+
+    Each client takes the next request index as soon as its previous
+    response is read, so the server always has `concurrency` requests in
+    flight. Latency covers the full response body, including streams.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        `summarize` of the successful requests plus `errors` and a count per
+        status code.
+    """
+    next_index = iter(range(n_requests))
+    seconds: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        for i in next_index:
+            method, url, body = make_request(i)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            statuses[status] += 1
+            if status.startswith("2"):
+                seconds.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        **summarize(seconds, wall),
+        "errors": n_requests - len(seconds),
+        "status_codes": dict(statuses),
+        "wall_seconds": round(wall, 3),
+    }
+
+
+def inference_requests(
+    scenario: str, rng: np.random.Generator, top_k: int, batch_size: int
+) -> MakeRequest:
+    if scenario == "predict":
+        bodies = [random_request(rng, top_k) for _ in range(1024)]
+        return lambda i: ("POST", "/predict/", bodies[i % len(bodies)])
+    if scenario == "predict_batch":
+        return lambda i: (
+            "POST",
+            "/predict/batch",
+            {"requests": [random_request(rng, top_k) for _ in range(batch_size)]},
+        )
+    if scenario == "analysis":
+        return lambda i: (
+            "POST",
+            "/analysis/",
+            {
+                "employee_skills": random_skills(rng),
+                "employee_description": random_description(rng),
+                "project_skills": random_skills(rng),
+                "project_description": random_description(rng),
+                "score": float(rng.random()),
+            },
+        )
+    raise ValueError(f"Unknown inference scenario {scenario!r}")
+
+
+def crud_requests(scenario: str, rng: np.random.Generator, run_id: str) -> MakeRequest:
+    if scenario == "crud_create_project":
+        return lambda i: (
+            "POST",
+            "/api/projects/",
+            {
+                "project": {
+                    "external_id": f"bench_{run_id}_{i}",
+                    "description": random_description(rng),
+                },
+                "skills": random_skills(rng),
+            },
+        )
+    if scenario == "crud_list_projects":
+        return lambda i: ("GET", f"/api/projects/?skip={i % 10 * 100}&limit=100", None)
+    if scenario == "crud_interaction":
+        return lambda i: (
+            "POST",
+            "/api/interactions/",
+            {
+                "user_id": f"user_{i % 500}",
+                "project_id": f"bench_{run_id}_{i % 1000}",
+                "rating": float(rng.integers(1, 6)),
+            },
+        )
+    raise ValueError(f"Unknown CRUD scenario {scenario!r}")
+
+
+async def run_inference(args, scenarios: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Drive inference_app against a synthetic catalog, or against the real
+    model and data with `--real-model` (the app's own lifespan loads them).
+    """
+    import httpx
+
+    from inference_app import app
+
+    transport = httpx.ASGITransport(app=app)
+    rng = np.random.default_rng(args.seed)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        if args.real_model:
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+            while (await client.get("/readyz")).status_code == 503:
+                if app.state.startup_error is not None:
+                    raise RuntimeError(app.state.startup_error)
+                await asyncio.sleep(0.5)
+        else:
+            service = synthetic_service(
+                generate_catalog(args.projects, seed=args.seed), args.precision
+            )
+            # Not `start()`: the synthetic catalog has no employee index to load
+            if service.user_batcher is not None:
+                await service.user_batcher.start()
+            await service.warm_up()
+            app.state.started_at = time.monotonic()
+            app.state.startup_error = None
+            app.state.recommendation_service = service
+        try:
+            for scenario in scenarios:
+                make_request = inference_requests(
+                    scenario, rng, args.top_k, args.batch_size
+                )
+                # /analysis waits on an external LLM; keep the default count small
+                n = args.requests if scenario != "analysis" else min(args.requests, 50)
+                results[scenario] = await drive(
+                    client, make_request, n, args.concurrency
+                )
+        finally:
+            if args.real_model:
+                await lifespan.__aexit__(None, None, None)
+            else:
+                await app.state.recommendation_service.stop()
+    return results
+
+
+async def run_crud(args, scenarios: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Drive crud_app against a fresh SQLite database in a temporary directory."""
+    import httpx
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import schemas.orm  # noqa: F401 (registers the tables)
+    from crud_app import app
+    from database import Base, get_db
+
+    rng = np.random.default_rng(args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def bench_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = bench_db
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://bench",
+                timeout=None,
+            ) as client:
+                for scenario in scenarios:
+                    results[scenario] = await drive(
+                        client,
+                        crud_requests(scenario, rng, str(args.seed)),
+                        args.requests,
+                        args.concurrency,
+                    )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="In-process load test of the inference and CRUD apps"
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(DEFAULT_SCENARIOS),
+        help=f"comma-separated, from {', '.join(INFERENCE_SCENARIOS + CRUD_SCENARIOS)}",
+    )
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="requests per /predict/batch call"
+    )
+    parser.add_argument(
+        "--precision", default=settings.EMBEDDING_PRECISION, help="float32/float16/int8"
+    )
+    parser.add_argument(
+        "--real-model",
+        action="store_true",
+        help="serve the trained model and data/weights instead of a synthetic catalog",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="report path, '-' for stdout")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(INFERENCE_SCENARIOS + CRUD_SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {}
+    inference = [s for s in scenarios if s in INFERENCE_SCENARIOS]
+    if inference:
+        results.update(asyncio.run(run_inference(args, inference)))
+    crud = [s for s in scenarios if s in CRUD_SCENARIOS]
+    if crud:
+        results.update(asyncio.run(run_crud(args, crud)))
+
+    out = args.out or os.path.join(
+        BENCHMARK_DIR, f"load_{args.projects}_c{args.concurrency}.json"
+    )
+    write_report(
+        out,
+        "load",
+        {
+            **vars(args),
+            "out": out,
+            "inference_backend": (
+                settings.INFERENCE_BACKEND if args.real_model else "numpy"
+            ),
+            "batch_max_size": settings.BATCH_MAX_SIZE,
+            "response_cache_backend": settings.RESPONSE_CACHE_BACKEND,
+            "inference_workers": settings.INFERENCE_WORKERS,
+            "metrics_enabled": settings.METRICS_ENABLED,
+        },
+        results,
+    )
+    if out != "-":
+        print_table(results)
+        for scenario, r in results.items():
+            if r["errors"]:
+                print(f"{scenario}: {r['errors']} errors {r['status_codes']}")
+        print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# Run from the backend directory, e.g.
+# `python -m benchmarks.micro --projects 1000000 --precision int8`,
+# to time each stage of RecommendationService.recommend on a synthetic
+# catalog. Catalogs are generated once under data/benchmarks/ and reused.
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from benchmarks.stats import print_table, summarize, write_report
+from benchmarks.synthetic import generate_catalog, random_request, synthetic_service
+from services.filters import LEVEL_RANK, ProjectFilter
+from settings import settings
+
+
+def time_calls(
+    fn: Callable[..., Any], calls: Sequence[tuple], warmup: int = 3
+) -> List[float]:
+    """Seconds taken by `fn(*args)` for each args tuple, after `warmup` untimed calls."""
+    for args in calls[:warmup]:
+        fn(*args)
+    seconds = []
+    for args in calls:
+        start = time.perf_counter()
+        fn(*args)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+async def time_async_calls(
+    fn: Callable[..., Any], calls: Sequence[tuple], warmup: int = 3
+) -> List[float]:
+    for args in calls[:warmup]:
+        await fn(*args)
+    seconds = []
+    for args in calls:
+        start = time.perf_counter()
+        await fn(*args)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def run_stages(
+    service, requests: List[Dict[str, Any]], top_k: int, batch_size: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Time every stage of a recommendation separately, then end to end.
+
+    Stage inputs are computed up front, so each stage is timed on its own:
+    `embed_text_cold` embeds descriptions never seen before and
+    `embed_text_cached` the same descriptions again, from the LRU cache.
+    """
+    skills = [(r["skills"],) for r in requests]
+    # A per-request suffix keeps the cold pass from hitting the cache
+    texts = [(f"{r['description']} {i}",) for i, r in enumerate(requests)]
+
+    results = {"build_user_vector": time_calls(service.build_user_vector, skills)}
+    num = np.vstack([service.build_user_vector(*s) for s in skills])
+    service.embedding_cache.clear()
+    results["embed_text_cold"] = time_calls(
+        lambda t: service.embed_texts([t]), texts, warmup=0
+    )
+    results["embed_text_cached"] = time_calls(lambda t: service.embed_texts([t]), texts)
+    txt = service.embed_texts([t for t, in texts])
+
+    rows = [(num[i : i + 1], txt[i : i + 1]) for i in range(len(requests))]
+    results["employee_tower"] = time_calls(service.encode_users, rows)
+    user_embs = service.encode_users(num, txt)
+
+    queries = [(user_embs[i], top_k, "exact") for i in range(len(requests))]
+    results["score_top_k"] = time_calls(service.search, queries)
+    if service.ann_index is not None:
+        results["ann_search"] = time_calls(
+            service.search, [(q, k, "ann") for q, k, _ in queries]
+        )
+    if service.hybrid_index is not None:
+        # Pool retrieval plus re-ranking; the description embedding is cached
+        results["hybrid_search"] = time_calls(
+            service.search_hybrid,
+            [
+                (user_embs[i], num[i], r["description"], top_k)
+                for i, r in enumerate(requests)
+            ],
+        )
+    # A selective prefilter (one skill at the top level) and a dense one
+    # (a single excluded project), which take the gather and the scan paths
+    for name, filters in (
+        (
+            "score_prefiltered_selective",
+            ProjectFilter(required=[(0, max(LEVEL_RANK.values()))]),
+        ),
+        ("score_prefiltered_dense", ProjectFilter(exclude_project_ids=["project_0"])),
+    ):
+        results[name] = time_calls(
+            service.search, [(q, k, mode, filters) for q, k, mode in queries]
+        )
+
+    catalog = service.projects.snapshot
+    ranked = [service.search(*q) for q in queries]
+    results["enrich"] = time_calls(
+        service.enrich,
+        [(catalog, idxs.tolist(), scores.tolist()) for idxs, scores in ranked],
+    )
+
+    batches = [
+        (user_embs[start : start + batch_size], top_k)
+        for start in range(0, len(requests) - batch_size + 1, batch_size)
+    ]
+    if batches:
+        results[f"score_batch_{batch_size}"] = time_calls(service.search_batch, batches)
+
+    async def end_to_end() -> Dict[str, List[float]]:
+        calls = [(r["skills"], r["description"], top_k) for r in requests]
+        return {
+            "recommend": await time_async_calls(service.recommend, calls),
+            "recommend_with_metadata": await time_async_calls(
+                service.recommend_with_metadata, calls
+            ),
+        }
+
+    results.update(asyncio.run(end_to_end()))
+    return {stage: summarize(seconds) for stage, seconds in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-stage latency of RecommendationService.recommend"
+    )
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--precision", default=settings.EMBEDDING_PRECISION, help="float32/float16/int8"
+    )
+    parser.add_argument("--ann", action="store_true", help="also time the IVF index")
+    parser.add_argument(
+        "--hybrid",
+        action="store_true",
+        help="also time hybrid retrieval (generates project text embeddings)",
+    )
+    parser.add_argument(
+        "--fastembed",
+        action="store_true",
+        help="embed with fastembed instead of the hash stand-in (downloads the model)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="report path, '-' for stdout")
+    args = parser.parse_args()
+
+    catalog = generate_catalog(args.projects, with_text=args.hybrid, seed=args.seed)
+    text_model = None
+    if args.fastembed:
+        from fastembed import TextEmbedding
+
+        text_model = TextEmbedding()
+    # The micro-batcher is left off: stages are timed one request at a time
+    service = synthetic_service(
+        catalog,
+        args.precision,
+        text_model,
+        batch_max_size=1,
+        ann=args.ann,
+        hybrid=args.hybrid,
+    )
+
+    rng = np.random.default_rng(args.seed)
+    requests = [random_request(rng, args.top_k) for _ in range(args.requests)]
+    results = run_stages(service, requests, args.top_k, args.batch_size)
+    service.executor.shutdown(wait=False)
+
+    out = args.out or f"{catalog.out_dir}/micro_{args.precision}.json"
+    write_report(
+        out,
+        "micro",
+        {
+            **vars(args),
+            "out": out,
+            "inference_workers": settings.INFERENCE_WORKERS,
+            "metrics_enabled": settings.METRICS_ENABLED,
+        },
+        results,
+    )
+    if out != "-":
+        print_table(results)
+        print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
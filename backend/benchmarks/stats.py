@@ -0,0 +1,99 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+
+def summarize(seconds: Sequence[float], wall_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Latency percentiles in milliseconds of a list of timings in seconds.
+
+    Parameters:
+    -----------
+    seconds : Sequence[float]
+        One duration per call.
+    wall_seconds : float
+        Elapsed time of the whole run; when given, throughput is `n / wall`
+        (concurrent callers overlap), otherwise `n / sum(seconds)`.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        n, mean_ms, p50_ms, p95_ms, p99_ms, max_ms and throughput_per_s.
+    """
+    if not len(seconds):
+        return {"n": 0}
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    elapsed = wall_seconds or float(np.sum(seconds))
+    return {
+        "n": int(ms.size),
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "throughput_per_s": round(ms.size / elapsed, 2) if elapsed else None,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment() -> Dict[str, Any]:
+    """What a result depends on besides the code: interpreter, NumPy, hardware."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": git_commit(),
+    }
+
+
+def write_report(
+    path: str, kind: str, config: Dict[str, Any], results: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Write a benchmark report as JSON (to stdout when `path` is "-")."""
+    report = {
+        "benchmark": kind,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "config": config,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    return report
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    """One line of percentiles and throughput per stage or scenario."""
+    print(f"{'name':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>12}")
+    for name, s in results.items():
+        if not s.get("n"):
+            print(f"{name:<30}{'no samples':>10}")
+            continue
+        print(
+            f"{name:<30}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+            f"{s['p99_ms']:>10.3f}{s['throughput_per_s']:>12.1f}"
+        )
@@ -0,0 +1,338 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from constants import LEVEL_WEIGHT, SKILL_CATEGORIES
+from data.quantize import load_quantized
+from models.extract import FoldedTower
+from models.numpy_tower import save_towers
+from schemas.predict import SkillMetadata
+
+LEVELS = list(LEVEL_WEIGHT)
+
+# Generated catalogs and reports (git-ignored)
+BENCHMARK_DIR = "data/benchmarks"
+
+# Rows generated per chunk, so a 10M-project catalog never sits in memory
+GENERATE_CHUNK_ROWS = 262144
+
+TEXT_DIM = 384
+EMB_SIZE = 32
+
+DESCRIPTION_WORDS = (
+    "build maintain scalable data pipelines services dashboards models "
+    "cloud backend frontend analytics platform migration automation testing "
+    "research reporting api integration monitoring"
+).split()
+
+
+def random_skills(rng: np.random.Generator, max_skills: int = 4) -> List[Dict]:
+    """Skill dicts drawn from SKILL_CATEGORIES and LEVEL_WEIGHT, as the API takes them."""
+    n = int(rng.integers(1, max_skills + 1))
+    names = rng.choice(len(SKILL_CATEGORIES), size=n, replace=False)
+    return [
+        {
+            "skill_name": SKILL_CATEGORIES[i],
+            "level": LEVELS[int(rng.integers(len(LEVELS)))],
+            "months": int(rng.integers(1, 61)),
+        }
+        for i in names
+    ]
+
+
+def random_description(rng: np.random.Generator, n_words: int = 12) -> str:
+    return " ".join(rng.choice(DESCRIPTION_WORDS, size=n_words))
+
+
+def random_request(rng: np.random.Generator, top_k: int = 5) -> Dict[str, Any]:
+    """A /predict request body."""
+    return {
+        "skills": random_skills(rng),
+        "description": random_description(rng),
+        "top_k": top_k,
+    }
+
+
+def random_folded_tower(
+    rng: np.random.Generator,
+    n_skills: int,
+    text_dim: int = TEXT_DIM,
+    emb_size: int = EMB_SIZE,
+    depth: int = 3,
+) -> FoldedTower:
+    """A tower of the trained model's shape with random He-initialised weights."""
+
+    def dense(fan_in: int) -> Tuple[np.ndarray, np.ndarray]:
+        kernel = rng.normal(0, np.sqrt(2 / fan_in), (fan_in, emb_size))
+        return kernel.astype(np.float32), np.zeros(emb_size, np.float32)
+
+    return FoldedTower(
+        init_num=dense(n_skills),
+        init_txt=dense(text_dim),
+        blocks_num=[dense(emb_size) for _ in range(depth)],
+        blocks_txt=[dense(emb_size) for _ in range(depth)],
+    )
+
+
+class HashTextEmbedding:
+    """
+    Stand-in for fastembed's TextEmbedding: a deterministic random unit vector
+    per text, so benchmarks run without downloading the ONNX text model.
+    """
+
+    def __init__(self, dim: int = TEXT_DIM):
+        self.dim = dim
+
+    def embed(self, texts: Iterable[str]) -> Iterable[np.ndarray]:
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:8], "little")
+            vec = np.random.default_rng(seed).normal(size=self.dim)
+            yield (vec / np.linalg.norm(vec)).astype(np.float32)
+
+
+class SyntheticMetadata:
+    """
+    Metadata snapshot over a synthetic catalog, generated row by row on access.
+
+    Project `i` is `project_{i}`; its skills are read back from the level and
+    profile matrices, so results look like real catalog rows without
+    materializing millions of Python objects.
+    """
+
+    def __init__(self, profiles: np.ndarray, levels: np.ndarray):
+        self.profiles = profiles
+        self.levels = levels
+        self.mtime = 0.0
+
+    def __len__(self) -> int:
+        return self.profiles.shape[0]
+
+    def row(self, idx: int) -> Tuple[str, str, List[SkillMetadata]]:
+        skills = [
+            SkillMetadata(
+                skill_name=SKILL_CATEGORIES[j],
+                level=LEVELS[code],
+                months=round(float(self.profiles[idx, j]) / LEVEL_WEIGHT[LEVELS[code]]),
+            )
+            for j, code in enumerate(self.levels[idx].tolist())
+            if code >= 0
+        ]
+        rng = np.random.default_rng(idx)
+        return f"project_{idx}", random_description(rng), skills
+
+    def index_of(self, project_id: str) -> Optional[int]:
+        prefix, _, number = project_id.partition("_")
+        if prefix != "project" or not number.isdigit() or int(number) >= len(self):
+            return None
+        return int(number)
+
+
+class StaticMetadataStore:
+    """`ProjectMetadataStore` stand-in holding one snapshot that never refreshes."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def refresh_due(self) -> bool:
+        return False
+
+    def refresh(self) -> bool:
+        return False
+
+
+@dataclass
+class SyntheticCatalog:
+    """Paths of a generated catalog; see `generate_catalog`."""
+
+    out_dir: str
+    n_projects: int
+
+    @property
+    def profiles_path(self) -> str:
+        return os.path.join(self.out_dir, "project_profiles.npy")
+
+    @property
+    def levels_path(self) -> str:
+        return os.path.join(self.out_dir, "project_levels.npy")
+
+    @property
+    def text_embs_path(self) -> str:
+        return os.path.join(self.out_dir, "project_text_embs.npy")
+
+    @property
+    def tower_embs_path(self) -> str:
+        return os.path.join(self.out_dir, "project_tower_embs.npy")
+
+    @property
+    def towers_path(self) -> str:
+        return os.path.join(self.out_dir, "two_tower_folded.npz")
+
+
+def catalog_dir(n_projects: int) -> str:
+    return os.path.join(BENCHMARK_DIR, f"catalog_{n_projects}")
+
+
+def generate_catalog(
+    n_projects: int,
+    out_dir: Optional[str] = None,
+    with_text: bool = False,
+    text_dim: int = TEXT_DIM,
+    emb_size: int = EMB_SIZE,
+    seed: int = 0,
+) -> SyntheticCatalog:
+    """
+    Write a synthetic catalog of `n_projects` projects to `out_dir`
+    (default `data/benchmarks/catalog_{n_projects}`).
+
+    Files, all written chunk by chunk into .npy memmaps:
+    - project_profiles.npy: skill profiles, `months * LEVEL_WEIGHT[level]`
+      for about 2.5 random skills per project, like the training pipeline builds
+    - project_levels.npy: the level of each of those skills, as an index
+      into LEVEL_WEIGHT (-1 where the skill is not required)
+    - project_tower_embs.npy: random project-tower outputs (float32)
+    - project_text_embs.npy: random unit text embeddings, only with
+      `with_text` (10M x 384 float32 is 15 GB)
+    - two_tower_folded.npz: random tower weights for the NumPy backend
+
+    Existing files for the same size are reused, so repeated runs with the
+    same seed measure the same data.
+    """
+    out_dir = out_dir or catalog_dir(n_projects)
+    os.makedirs(out_dir, exist_ok=True)
+    catalog = SyntheticCatalog(out_dir, n_projects)
+    rng = np.random.default_rng(seed)
+    n_skills = len(SKILL_CATEGORIES)
+    level_weights = np.array([LEVEL_WEIGHT[level] for level in LEVELS])
+
+    def fresh(path: str) -> bool:
+        return (
+            os.path.exists(path) and np.load(path, mmap_mode="r").shape[0] == n_projects
+        )
+
+    if not fresh(catalog.profiles_path) or not fresh(catalog.levels_path):
+        shape = (n_projects, n_skills)
+        profiles = open_memmap(catalog.profiles_path, "w+", np.float32, shape)
+        levels = open_memmap(catalog.levels_path, "w+", np.int8, shape)
+        for start in range(0, n_projects, GENERATE_CHUNK_ROWS):
+            n = min(GENERATE_CHUNK_ROWS, n_projects - start)
+            has_skill = rng.random((n, n_skills)) < 2.5 / n_skills
+            months = rng.integers(1, 61, (n, n_skills))
+            codes = rng.integers(len(LEVELS), size=(n, n_skills))
+            profiles[start : start + n] = has_skill * months * level_weights[codes]
+            levels[start : start + n] = np.where(has_skill, codes, -1)
+        profiles.flush()
+        levels.flush()
+
+    if not fresh(catalog.tower_embs_path):
+        embs = open_memmap(
+            catalog.tower_embs_path, "w+", np.float32, (n_projects, emb_size)
+        )
+        for start in range(0, n_projects, GENERATE_CHUNK_ROWS):
+            n = min(GENERATE_CHUNK_ROWS, n_projects - start)
+            embs[start : start + n] = rng.normal(size=(n, emb_size))
+        embs.flush()
+
+    if with_text and not fresh(catalog.text_embs_path):
+        text = open_memmap(
+            catalog.text_embs_path, "w+", np.float32, (n_projects, text_dim)
+        )
+        for start in range(0, n_projects, GENERATE_CHUNK_ROWS):
+            n = min(GENERATE_CHUNK_ROWS, n_projects - start)
+            block = rng.normal(size=(n, text_dim))
+            text[start : start + n] = block / np.linalg.norm(
+                block, axis=1, keepdims=True
+            )
+        text.flush()
+
+    tower_rng = np.random.default_rng(seed + 1)
+    save_towers(
+        {
+            name: random_folded_tower(tower_rng, n_skills, text_dim, emb_size)
+            for name in ("employee_tower", "project_tower")
+        },
+        catalog.towers_path,
+    )
+    return catalog
+
+
+def synthetic_service(
+    catalog: SyntheticCatalog,
+    precision: str = "float32",
+    text_model: Any = None,
+    batch_max_size: Optional[int] = None,
+    ann: bool = False,
+    hybrid: bool = False,
+):
+    """
+    Build a RecommendationService around a synthetic catalog.
+
+    The components `load_components` would read from the trained model and
+    the real catalog are built from the synthetic files instead; everything
+    else is set up by `RecommendationService.__init__` as in production.
+    The towers run on the NumPy backend with random weights and, unless a
+    `text_model` is given, texts are embedded with `HashTextEmbedding`.
+    With `ann`, an IVF index is built (or reused) next to the catalog, and
+    with `hybrid` the hybrid-retrieval index, which needs a catalog generated
+    `with_text`.
+    """
+    from services.ann import load_ann_index
+    from services.backends import NumpyTowers
+    from services.filters import LEVEL_RANK, ProjectFilterIndex, RatedProjectIndex
+    from services.hybrid import hybrid_vectors, load_hybrid_index
+    from services.predict import RecommendationService, ServiceComponents
+    from settings import settings
+
+    project_profiles = np.load(catalog.profiles_path, mmap_mode="r")
+    project_embs = load_quantized(catalog.tower_embs_path, precision)
+    ann_index = (
+        load_ann_index(
+            project_embs,
+            os.path.join(catalog.out_dir, "project_ann"),
+            catalog.tower_embs_path,
+            n_lists=settings.ANN_N_LISTS or None,
+        )
+        if ann
+        else None
+    )
+    hybrid_index = (
+        load_hybrid_index(
+            lambda: hybrid_vectors(
+                project_profiles, np.load(catalog.text_embs_path, mmap_mode="r")
+            ),
+            catalog.n_projects,
+            os.path.join(catalog.out_dir, "project_hybrid_ann"),
+            (catalog.profiles_path, catalog.text_embs_path),
+            n_lists=settings.ANN_N_LISTS or None,
+        )
+        if hybrid
+        else None
+    )
+    levels = np.load(catalog.levels_path, mmap_mode="r")
+    # Level codes to ranks; -1 (no skill) picks the trailing -1
+    rank_of_code = np.array([LEVEL_RANK[level] for level in LEVELS] + [-1], np.int8)
+    components = ServiceComponents(
+        towers=NumpyTowers("", catalog.towers_path),
+        model_version="synthetic",
+        project_profiles=project_profiles,
+        project_embs=project_embs,
+        text_model=text_model or HashTextEmbedding(),
+        projects=StaticMetadataStore(SyntheticMetadata(project_profiles, levels)),
+        filters=ProjectFilterIndex.from_level_matrix(rank_of_code[levels]),
+        # Synthetic users have rated nothing
+        rated_projects=RatedProjectIndex(
+            np.empty(0, np.int64),
+            np.empty(0, np.int64),
+            np.empty(0, str),
+            catalog.n_projects,
+        ),
+        ann_index=ann_index,
+        hybrid_index=hybrid_index,
+    )
+    return RecommendationService(components, batch_max_size=batch_max_size)
@@ -14,5 +14,11 @@ SKILL_CATEGORIES = [
 ]
 LEVEL_WEIGHT = {"Basic": 1.0, "CollegeResearch": 2.0, "Professional": 3.0, "Other": 1.5}
 
+# Weight of the skill cosine against the description cosine in the hybrid
+# score. dataset_generation/2_generate_training_dataset.py labels the training
+# interactions with this score and runs standalone, so it defines its own
+# HYBRID_ALPHA; the two must hold the same value.
+HYBRID_ALPHA = 0.65
+
 
 skill2idx: Dict[str, int] = {s: i for i, s in enumerate(SKILL_CATEGORIES)}
@@ -2,14 +2,23 @@ from fastapi import Depends, FastAPI
 from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
+from database import ensure_schema
 from routes import crud
 from settings import settings
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Add columns missing from databases created by older releases
+    ensure_schema()
+    yield
+
+
 # App definition
 app = FastAPI(
     title="JTP: CRUD Pod for Project Recommender",
     description="JTP: CRUD Pod for Project Recommender",
+    lifespan=lifespan,
 )
 
 # Adding CORSMiddleware
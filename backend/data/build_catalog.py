@@ -0,0 +1,29 @@
+# Run from the backend directory with
+# `python -m data.build_catalog [training_data.json] [output_dir]` whenever
+# training_data.json is regenerated.
+
+import json
+import sys
+
+from data.catalog import DEFAULT_CATALOG_PATH, write_catalog
+from data.load_projects import DEFAULT_TRAINING_DATA_PATH
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TRAINING_DATA_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CATALOG_PATH
+
+    with open(source, encoding="utf-8") as f:
+        training_data = json.load(f)
+    out_dir = write_catalog(training_data, target)
+
+    with open(out_dir / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    print(
+        f"Wrote catalog to {out_dir}: {manifest['n_projects']} projects, "
+        f"{manifest['n_users']} users, {manifest['n_interactions']} interactions"
+    )
+
+
+if __name__ == "__main__":
+    main()
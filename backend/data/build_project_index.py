@@ -0,0 +1,29 @@
+# Run from the backend directory with `python -m data.build_project_index` after
+# retraining the model or regenerating the project weights, so workers can load
+# data/weights/project_tower_embs.npy instead of encoding the catalog at boot.
+
+import numpy as np
+
+from services.backends import KerasTowers
+from services.predict import (
+    MODEL_PATH,
+    PROJECT_PROFILES_PATH,
+    PROJECT_TEXT_EMBS_PATH,
+    PROJECT_TOWER_EMBS_PATH,
+    build_project_index,
+)
+
+
+def main():
+    towers = KerasTowers(MODEL_PATH)
+    project_embs = build_project_index(
+        towers.encode_projects,
+        np.load(PROJECT_PROFILES_PATH),
+        np.load(PROJECT_TEXT_EMBS_PATH),
+        PROJECT_TOWER_EMBS_PATH,
+    )
+    print(f"Wrote {project_embs.shape} project index to {PROJECT_TOWER_EMBS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from constants import LEVEL_WEIGHT, SKILL_CATEGORIES
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / "catalog"
+MANIFEST_FILE = "manifest.json"
+CATALOG_FORMAT_VERSION = 1
+
+# Column files written for each entity ("project" / "user")
+ENTITY_COLUMNS = (
+    "ids",
+    "desc_offsets",
+    "desc_bytes",
+    "skill_idx",
+    "skill_level",
+    "skill_months",
+)
+INTERACTION_COLUMNS = ("interaction_indptr", "interaction_user", "interaction_rating")
+
+
+# ---------- Writing ----------
+
+
+def _encode_texts(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings as one UTF-8 byte buffer plus (n + 1) offsets."""
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, buffer
+
+
+def _encode_skills(
+    skill_lists: List[List[Dict[str, Any]]],
+    skill_names: List[str],
+    level_names: List[str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode skill lists as fixed-width (n, max_skills) arrays padded with -1.
+
+    Unseen skill or level names are appended to the vocabularies so the
+    conversion is lossless.
+    """
+    skill_codes = {s: i for i, s in enumerate(skill_names)}
+    level_codes = {l: i for i, l in enumerate(level_names)}
+    width = max((len(skills) for skills in skill_lists), default=0)
+    shape = (len(skill_lists), width)
+    skill_idx = np.full(shape, -1, dtype=np.int16)
+    skill_level = np.full(shape, -1, dtype=np.int16)
+    skill_months = np.zeros(shape, dtype=np.int32)
+    for row, skills in enumerate(skill_lists):
+        for col, s in enumerate(skills):
+            name = s.get("skill_name", "Unknown")
+            level = s.get("level", "Unknown")
+            if name not in skill_codes:
+                skill_codes[name] = len(skill_names)
+                skill_names.append(name)
+            if level not in level_codes:
+                level_codes[level] = len(level_names)
+                level_names.append(level)
+            skill_idx[row, col] = skill_codes[name]
+            skill_level[row, col] = level_codes[level]
+            skill_months[row, col] = s.get("months", 0)
+    return skill_idx, skill_level, skill_months
+
+
+def _write_entity(
+    out_dir: Path,
+    prefix: str,
+    ids: List[str],
+    records: List[Dict[str, Any]],
+    skill_names: List[str],
+    level_names: List[str],
+) -> None:
+    offsets, buffer = _encode_texts([r.get("description", "") for r in records])
+    skill_idx, skill_level, skill_months = _encode_skills(
+        [r.get("skills", []) for r in records], skill_names, level_names
+    )
+    columns = {
+        "ids": np.array(ids, dtype=str),
+        "desc_offsets": offsets,
+        "desc_bytes": buffer,
+        "skill_idx": skill_idx,
+        "skill_level": skill_level,
+        "skill_months": skill_months,
+    }
+    for name, array in columns.items():
+        np.save(out_dir / f"{prefix}_{name}.npy", array)
+
+
+def write_catalog(training_data: Dict[str, Any], out_dir: str) -> Path:
+    """
+    Convert a training_data.json document into a columnar catalog directory.
+
+    Projects keep their JSON order, so row `i` stays aligned with row `i` of
+    the project weight matrices. Interactions are stored project-major in CSR
+    form, pointing into the user columns. Users that only appear in
+    interactions are appended after the `n_users` real users with no skills.
+
+    The catalog is assembled in a sibling temporary directory and moved into
+    place at the end so readers never see a partial catalog.
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    users = training_data.get("users", {})
+    projects = training_data.get("projects", {})
+    skill_names = list(SKILL_CATEGORIES)
+    level_names = list(LEVEL_WEIGHT)
+
+    user_ids = list(users.keys())
+    user_records = list(users.values())
+    user_codes = {uid: i for i, uid in enumerate(user_ids)}
+
+    indptr = np.zeros(len(projects) + 1, dtype=np.int64)
+    interaction_user, interaction_rating = [], []
+    for row, info in enumerate(projects.values()):
+        for it in info.get("interactions", []):
+            uid = it["user_id"]
+            if uid not in user_codes:
+                user_codes[uid] = len(user_ids)
+                user_ids.append(uid)
+                user_records.append({})
+            interaction_user.append(user_codes[uid])
+            interaction_rating.append(it["rating"])
+        indptr[row + 1] = len(interaction_user)
+
+    _write_entity(
+        tmp_dir,
+        "project",
+        list(projects.keys()),
+        list(projects.values()),
+        skill_names,
+        level_names,
+    )
+    _write_entity(tmp_dir, "user", user_ids, user_records, skill_names, level_names)
+    np.save(tmp_dir / "interaction_indptr.npy", indptr)
+    np.save(
+        tmp_dir / "interaction_user.npy", np.array(interaction_user, dtype=np.int32)
+    )
+    np.save(
+        tmp_dir / "interaction_rating.npy",
+        np.array(interaction_rating, dtype=np.float64),
+    )
+
+    manifest = {
+        "format_version": CATALOG_FORMAT_VERSION,
+        "n_projects": len(projects),
+        "n_users": len(users),
+        "n_interactions": len(interaction_user),
+        "skill_names": skill_names,
+        "level_names": level_names,
+    }
+    with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return out_dir
+
+
+# ---------- Reading ----------
+
+
+class ColumnarCatalog:
+    """
+    Read-only accessor over a catalog directory written by `write_catalog`.
+
+    All columns are opened with `np.load(mmap_mode="r")`, so opening a catalog
+    costs a handful of syscalls and the pages are shared through the OS page
+    cache by every worker that maps the same files. Rows are decoded on demand.
+
+    Parameters:
+    -----------
+    path : str, optional
+        Catalog directory. Defaults to `data/catalog`.
+    mmap : bool
+        Map the columns instead of reading them into the heap.
+    """
+
+    def __init__(self, path: Optional[str] = None, mmap: bool = True):
+        self.path = Path(path or DEFAULT_CATALOG_PATH)
+        with open(self.path / MANIFEST_FILE, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest["format_version"] != CATALOG_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported catalog format {self.manifest['format_version']}"
+            )
+        self.mtime = os.path.getmtime(self.path / MANIFEST_FILE)
+        self.n_projects: int = self.manifest["n_projects"]
+        self.n_users: int = self.manifest["n_users"]
+        self.skill_names: List[str] = self.manifest["skill_names"]
+        self.level_names: List[str] = self.manifest["level_names"]
+
+        mmap_mode = "r" if mmap else None
+        self.columns: Dict[str, np.ndarray] = {}
+        for prefix in ("project", "user"):
+            for name in ENTITY_COLUMNS:
+                key = f"{prefix}_{name}"
+                self.columns[key] = np.load(
+                    self.path / f"{key}.npy", mmap_mode=mmap_mode
+                )
+        for key in INTERACTION_COLUMNS:
+            self.columns[key] = np.load(self.path / f"{key}.npy", mmap_mode=mmap_mode)
+
+    @property
+    def project_ids(self) -> np.ndarray:
+        return self.columns["project_ids"]
+
+    @property
+    def user_ids(self) -> np.ndarray:
+        return self.columns["user_ids"]
+
+    def description(self, prefix: str, idx: int) -> str:
+        offsets = self.columns[f"{prefix}_desc_offsets"]
+        buffer = self.columns[f"{prefix}_desc_bytes"]
+        return buffer[offsets[idx] : offsets[idx + 1]].tobytes().decode("utf-8")
+
+    def skills(self, prefix: str, idx: int) -> List[Dict[str, Any]]:
+        skill_idx = self.columns[f"{prefix}_skill_idx"][idx]
+        skill_level = self.columns[f"{prefix}_skill_level"][idx]
+        skill_months = self.columns[f"{prefix}_skill_months"][idx]
+        return [
+            {
+                "skill_name": self.skill_names[s],
+                "level": self.level_names[l],
+                "months": int(m),
+            }
+            for s, l, m in zip(skill_idx, skill_level, skill_months)
+            if s >= 0
+        ]
+
+    def project_interactions(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (user row indices, ratings) for one project."""
+        indptr = self.columns["interaction_indptr"]
+        start, stop = indptr[idx], indptr[idx + 1]
+        return (
+            self.columns["interaction_user"][start:stop],
+            self.columns["interaction_rating"][start:stop],
+        )
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (user_id, record) in the training_data.json shape."""
+        for i in range(self.n_users):
+            yield str(self.user_ids[i]), {
+                "description": self.description("user", i),
+                "skills": self.skills("user", i),
+            }
+
+    def iter_projects(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (project_id, record) in the training_data.json shape."""
+        for i in range(self.n_projects):
+            users, ratings = self.project_interactions(i)
+            yield str(self.project_ids[i]), {
+                "description": self.description("project", i),
+                "skills": self.skills("project", i),
+                "interactions": [
+                    {"user_id": str(self.user_ids[u]), "rating": float(r)}
+                    for u, r in zip(users, ratings)
+                ],
+            }
@@ -1,21 +1,299 @@
 import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 
-# Global variables to store city data.
-training_data_dict = {}
+from schemas.predict import SkillMetadata
+from data.catalog import DEFAULT_CATALOG_PATH, MANIFEST_FILE, ColumnarCatalog
 
+DEFAULT_TRAINING_DATA_PATH = Path(__file__).parent / "training_data.json"
 
-async def load_projects(file_path: str = None):
+
+@dataclass(frozen=True)
+class ProjectMetadataSnapshot:
+    """
+    Immutable, index-aligned view of the project catalog.
+
+    Row `i` describes the project whose weights live in row `i` of
+    `project_profiles.npy` / `project_text_embs.npy`.
+    """
+
+    project_ids: np.ndarray
+    descriptions: List[str]
+    skills: List[List[SkillMetadata]]
+    mtime: float
+
+    def __len__(self) -> int:
+        return len(self.project_ids)
+
+    def row(self, idx: int) -> Tuple[str, str, List[SkillMetadata]]:
+        """Return (project_id, description, required_skills) for a catalog row."""
+        return str(self.project_ids[idx]), self.descriptions[idx], self.skills[idx]
+
+    @cached_property
+    def row_of(self) -> Dict[str, int]:
+        """Map from project_id to catalog row, built on first use."""
+        return {str(pid): i for i, pid in enumerate(self.project_ids)}
+
+    def index_of(self, project_id: str) -> Optional[int]:
+        return self.row_of.get(project_id)
+
+
+class CatalogMetadataSnapshot:
+    """
+    Snapshot backed by a memory-mapped columnar catalog.
+
+    Rows are decoded into SkillMetadata on demand, so opening the catalog does
+    not allocate per-project Python objects.
+    """
+
+    def __init__(self, catalog: ColumnarCatalog):
+        self.catalog = catalog
+        self.project_ids = catalog.project_ids
+        self.mtime = catalog.mtime
+
+    def __len__(self) -> int:
+        return self.catalog.n_projects
+
+    def row(self, idx: int) -> Tuple[str, str, List[SkillMetadata]]:
+        """Return (project_id, description, required_skills) for a catalog row."""
+        return (
+            str(self.project_ids[idx]),
+            self.catalog.description("project", idx),
+            [SkillMetadata(**s) for s in self.catalog.skills("project", idx)],
+        )
+
+    @cached_property
+    def row_of(self) -> Dict[str, int]:
+        """Map from project_id to catalog row, built on first use."""
+        return {str(pid): i for i, pid in enumerate(self.project_ids)}
+
+    def index_of(self, project_id: str) -> Optional[int]:
+        return self.row_of.get(project_id)
+
+
+class ExtendedMetadataSnapshot:
     """
-    Loads cities from the given CSV file into global lists.
+    A file-backed snapshot plus rows appended at runtime.
+
+    Appended rows get the row numbers following the base snapshot. When a
+    project is appended again (its data changed), `index_of` resolves to the
+    newest row.
+
+    The appended rows and their per-project row lists are shared by every
+    snapshot of a store and only ever appended to; a snapshot sees the first
+    `n_extra` of them, so publishing new rows does not copy the earlier ones.
     """
-    global training_data_dict
 
-    if file_path is None:
-        file_path = Path(__file__).parent / "training_data.json"
+    def __init__(
+        self,
+        base,
+        rows: List[Tuple[str, str, List[SkillMetadata]]],
+        n_extra: int,
+        rows_of: Dict[str, List[int]],
+    ):
+        self.base = base
+        self.mtime = base.mtime
+        self.n_base = len(base)
+        self.n_extra = n_extra
+        self._rows = rows
+        self._rows_of = rows_of
+
+    def __len__(self) -> int:
+        return self.n_base + self.n_extra
+
+    @property
+    def extra(self) -> List[Tuple[str, str, List[SkillMetadata]]]:
+        """The rows appended at runtime, in row order."""
+        return self._rows[: self.n_extra]
+
+    def row(self, idx: int) -> Tuple[str, str, List[SkillMetadata]]:
+        if idx < self.n_base:
+            return self.base.row(idx)
+        if idx >= len(self):
+            raise IndexError(idx)
+        return self._rows[idx - self.n_base]
+
+    def index_of(self, project_id: str) -> Optional[int]:
+        # Rows past this snapshot's length were published later
+        for row in reversed(self._rows_of.get(project_id, ())):
+            if row < len(self):
+                return row
+        return self.base.index_of(project_id)
+
+
+def default_metadata_path() -> Path:
+    """Prefer the columnar catalog and fall back to training_data.json."""
+    if (DEFAULT_CATALOG_PATH / MANIFEST_FILE).exists():
+        return DEFAULT_CATALOG_PATH
+    return DEFAULT_TRAINING_DATA_PATH
+
+
+def source_mtime(file_path: str) -> float:
+    """Modification time of a catalog directory (its manifest) or JSON file."""
+    if os.path.isdir(file_path):
+        return os.path.getmtime(os.path.join(file_path, MANIFEST_FILE))
+    return os.path.getmtime(file_path)
+
+
+def load_user_records(file_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (user_id, {"description", "skills"}) pairs from a catalog or JSON file."""
+    if os.path.isdir(file_path):
+        return list(ColumnarCatalog(file_path).iter_users())
+    with open(file_path, encoding="utf-8") as f:
+        return list(json.load(f).get("users", {}).items())
+
+
+def load_interactions(file_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return the catalog's interactions as (project rows, user rows, user ids).
+
+    Project rows follow the catalog order; user rows index into the returned
+    user ids.
+    """
+    if os.path.isdir(file_path):
+        catalog = ColumnarCatalog(file_path)
+        indptr = catalog.columns["interaction_indptr"]
+        project_rows = np.repeat(np.arange(catalog.n_projects), np.diff(indptr))
+        return project_rows, catalog.columns["interaction_user"], catalog.user_ids
 
     with open(file_path, encoding="utf-8") as f:
-        training_data_dict = json.load(f)
+        projects = json.load(f)["projects"]
+    user_codes: Dict[str, int] = {}
+    project_rows, user_rows = [], []
+    for row, project_data in enumerate(projects.values()):
+        for it in project_data.get("interactions", []):
+            project_rows.append(row)
+            user_rows.append(user_codes.setdefault(it["user_id"], len(user_codes)))
+    return (
+        np.array(project_rows, dtype=np.int64),
+        np.array(user_rows, dtype=np.int64),
+        np.array(list(user_codes), dtype=str),
+    )
+
+
+def build_snapshot(file_path: str):
+    """Open a columnar catalog directory, or parse training_data.json once."""
+    if os.path.isdir(file_path):
+        return CatalogMetadataSnapshot(ColumnarCatalog(file_path))
+
+    mtime = os.path.getmtime(file_path)
+    with open(file_path, encoding="utf-8") as f:
+        projects = json.load(f)["projects"]
+
+    descriptions, skills = [], []
+    for project_data in projects.values():
+        descriptions.append(project_data.get("description", ""))
+        skills.append(
+            [
+                SkillMetadata(
+                    skill_name=s.get("skill_name", "Unknown"),
+                    level=s.get("level", "Unknown"),
+                    months=s.get("months", 0),
+                )
+                for s in project_data.get("skills", [])
+            ]
+        )
+    return ProjectMetadataSnapshot(
+        project_ids=np.array(list(projects.keys())),
+        descriptions=descriptions,
+        skills=skills,
+        mtime=mtime,
+    )
+
+
+class ProjectMetadataStore:
+    """
+    Project metadata loaded once and shared by all requests.
+
+    Readers take `store.snapshot` once per request and keep using it, while
+    `refresh` builds a complete replacement when the file changes and `append`
+    adds rows for projects ingested at runtime. Both swap the snapshot in with
+    a single attribute assignment, so a request never observes a half-loaded
+    catalog.
+
+    Parameters:
+    -----------
+    file_path : str, optional
+        Path to a columnar catalog directory or to training_data.json.
+        Defaults to `data/catalog` when it exists, else `data/training_data.json`.
+    check_interval : float
+        Minimum number of seconds between two `os.stat` calls in `refresh`.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, check_interval: float = 5.0):
+        self.file_path = str(file_path or default_metadata_path())
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        # Rows appended at runtime, shared by the snapshots `append` publishes
+        self._extra: List[Tuple[str, str, List[SkillMetadata]]] = []
+        self._extra_rows_of: Dict[str, List[int]] = {}
+        self.snapshot = build_snapshot(self.file_path)
+        self._loaded_mtime = self.snapshot.mtime
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def refresh_due(self) -> bool:
+        """True once `check_interval` has passed since the last file check."""
+        return time.monotonic() - self._last_check >= self.check_interval
+
+    def refresh(self) -> bool:
+        """
+        Reload the catalog if the file changed since the last load.
+
+        A reload that changes the number of projects is refused: rows must
+        stay aligned with the weight matrices, which only change on restart.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        # Only one caller pays for the reload; others keep the current snapshot
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = now
+            try:
+                mtime = source_mtime(self.file_path)
+            except OSError:
+                return False
+            if mtime == self._loaded_mtime:
+                return False
+            self._loaded_mtime = mtime
+            current = self.snapshot
+            base = build_snapshot(self.file_path)
+            if isinstance(current, ExtendedMetadataSnapshot):
+                if len(base) != current.n_base:
+                    return False
+                base = ExtendedMetadataSnapshot(
+                    base, self._extra, current.n_extra, self._extra_rows_of
+                )
+            elif len(base) != len(current):
+                return False
+            self.snapshot = base
+            return True
+        finally:
+            self._lock.release()
 
-    return training_data_dict
+    def append(self, rows: List[Tuple[str, str, List[SkillMetadata]]]) -> None:
+        """Publish metadata for projects ingested at runtime, in row order."""
+        with self._lock:
+            current = self.snapshot
+            if isinstance(current, ExtendedMetadataSnapshot):
+                current = current.base
+            n_base = len(current)
+            for project_id, description, skills in rows:
+                self._extra_rows_of.setdefault(project_id, []).append(
+                    n_base + len(self._extra)
+                )
+                self._extra.append((project_id, description, skills))
+            self.snapshot = ExtendedMetadataSnapshot(
+                current, self._extra, len(self._extra), self._extra_rows_of
+            )
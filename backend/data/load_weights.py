@@ -0,0 +1,99 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+def _default_file_mode() -> int:
+    """Mode `open()` gives new files under the process umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once at import: os.umask can only be queried by setting it
+DEFAULT_FILE_MODE = _default_file_mode()
+
+
+@contextmanager
+def atomic_write(path: str, suffix: str = "") -> Iterator[BinaryIO]:
+    """
+    Binary file that replaces `path` once the block exits without error.
+
+    The data goes to a uniquely named temporary file in the same directory,
+    so concurrent writers (e.g. several workers rebuilding the same file at
+    startup) never write into each other's file, and readers only ever see
+    a complete one. The temporary file is removed if the block raises.
+    It is created owner-only, so it gets the usual umask-based mode before
+    it replaces `path`.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=suffix, delete=False) as f:
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, DEFAULT_FILE_MODE)
+    os.replace(f.name, path)
+
+
+def save_array_atomic(path: str, array: np.ndarray) -> None:
+    """Write an .npy file through a temporary name so readers never see a partial file."""
+    with atomic_write(path, suffix=".npy") as f:
+        np.save(f, array)
+
+
+def converted_path(path: str, dtype: str) -> str:
+    """Sibling file holding `path` converted to `dtype`, e.g. x.npy -> x.float16.npy."""
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.{dtype}{p.suffix}"))
+
+
+def load_weight_array(
+    path: str, dtype: Optional[str] = "float32", mmap: bool = True
+) -> np.ndarray:
+    """
+    Load a weight matrix, optionally memory-mapped and in a storage dtype.
+
+    With `mmap=True` the array is opened read-only with `mmap_mode="r"`, so
+    every Uvicorn worker maps the same file and the OS page cache holds a
+    single copy instead of one heap copy per process.
+
+    A memory map can only expose the dtype stored on disk, so when `dtype`
+    differs from the file's dtype a converted sibling (`<name>.<dtype>.npy`)
+    is written once, atomically, and mapped instead. It is rewritten whenever
+    the source file is newer.
+
+    Parameters:
+    -----------
+    path : str
+        Source .npy file.
+    dtype : str, optional
+        Storage dtype, "float32" or "float16". None keeps the file's dtype.
+    mmap : bool
+        Map the file instead of reading it into the process heap.
+
+    Returns:
+    --------
+    np.ndarray
+        A read-only memmap when `mmap` is set, otherwise an in-memory array.
+    """
+    if dtype is not None and dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported weight dtype {dtype!r}")
+    mmap_mode = "r" if mmap else None
+
+    array = np.load(path, mmap_mode="r")
+    if dtype is None or array.dtype == np.dtype(dtype):
+        return np.load(path, mmap_mode=mmap_mode)
+
+    target = converted_path(path, dtype)
+    if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(path):
+        save_array_atomic(target, np.asarray(array, dtype=dtype))
+    return np.load(target, mmap_mode=mmap_mode)
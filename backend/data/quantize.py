@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from data.load_weights import converted_path, save_array_atomic
+
+PRECISIONS = ("float32", "float16", "int8")
+
+# Rows quantized at a time when writing a store
+QUANTIZE_BLOCK_ROWS = 16384
+
+# Float32 elements dequantized at a time when scoring (1 MiB, stays in L2)
+DEQUANT_BLOCK_ELEMENTS = 262144
+
+
+def quantize_rows(
+    array: np.ndarray, precision: str
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Encode a float matrix in a storage precision.
+
+    "int8" is symmetric per-row quantization: every row is divided by
+    `max(|row|) / 127` and rounded, and that divisor is kept as the row's
+    float32 scale. The other precisions are a plain cast with no scale.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, Optional[np.ndarray]]
+        The codes and the per-row scales (None unless `precision` is "int8").
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision {precision!r}")
+    if precision != "int8":
+        return np.asarray(array, dtype=precision), None
+
+    codes = np.empty(array.shape, dtype=np.int8)
+    scale = np.empty(array.shape[0], dtype=np.float32)
+    for start in range(0, array.shape[0], QUANTIZE_BLOCK_ROWS):
+        block = np.asarray(array[start : start + QUANTIZE_BLOCK_ROWS], np.float32)
+        block_scale = np.abs(block).max(axis=1) / 127.0
+        # All-zero rows keep a scale of 1 so that decoding stays exact
+        block_scale[block_scale == 0] = 1.0
+        codes[start : start + len(block)] = np.clip(
+            np.rint(block / block_scale[:, np.newaxis]), -127, 127
+        )
+        scale[start : start + len(block)] = block_scale
+    return codes, scale
+
+
+class QuantizedMatrix:
+    """
+    Read-only (n, dim) matrix stored as float32, float16 or per-row int8.
+
+    Nothing is dequantized up front. Scoring goes through `matmul`, which
+    converts a cache-sized block of rows at a time into one reused float32
+    buffer and multiplies it while it is still in cache, so a scan reads 2 or
+    4 times fewer bytes from memory than a float32 matrix and never
+    materializes a float32 copy of the whole catalog. For int8 the per-row
+    scale is applied to the block's scores rather than to the block itself.
+    How much of the bandwidth saving turns into speed depends on the
+    conversion: int8 widens cheaply on any CPU, while float16 is only as fast
+    as NumPy's half-precision conversion on the host.
+
+    Row access (`m[i]`, `m[a:b]`) returns float32, so code written against a
+    plain ndarray keeps working.
+
+    Parameters:
+    -----------
+    codes : np.ndarray
+        Stored values, possibly a memmap.
+    scale : np.ndarray, optional
+        Per-row float32 scale, required when `codes` is int8.
+    """
+
+    def __init__(self, codes: np.ndarray, scale: Optional[np.ndarray] = None):
+        if codes.dtype == np.int8 and scale is None:
+            raise ValueError("int8 codes need a per-row scale")
+        self.codes = codes
+        self.scale = scale
+        self.precision = str(codes.dtype)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (0 if self.scale is None else self.scale.nbytes)
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def __getitem__(self, idx: Union[int, slice]) -> np.ndarray:
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step == 1:
+                return self.dequantize(start, stop)
+        values = np.asarray(self.codes[idx], dtype=np.float32)
+        if self.scale is not None:
+            scale = self.scale[idx]
+            values = values * (scale[..., np.newaxis] if np.ndim(scale) else scale)
+        return values
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.dequantize()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def dequantize(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Rows [start, stop) as float32 (a view when already stored as float32)."""
+        values = np.asarray(self.codes[start:stop], dtype=np.float32)
+        if self.scale is not None:
+            values = values * self.scale[start:stop, np.newaxis]
+        return values
+
+    def matmul(
+        self, queries: np.ndarray, start: int = 0, stop: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Scores of rows [start, stop) against one query or a batch of queries.
+
+        Parameters:
+        -----------
+        queries : np.ndarray
+            (dim,) or (B, dim) float32 queries.
+
+        Returns:
+        --------
+        np.ndarray
+            (stop - start,) for a single query, (B, stop - start) for a batch.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        queries = np.asarray(queries, dtype=np.float32)
+        out = np.empty(queries.shape[:-1] + (max(0, stop - start),), np.float32)
+        if self.codes.dtype == np.float32:
+            out[...] = queries @ self.codes[start:stop].T
+            return out
+
+        rows = max(1, DEQUANT_BLOCK_ELEMENTS // self.shape[1])
+        buffer = np.empty((min(rows, max(0, stop - start)), self.shape[1]), np.float32)
+        for lo in range(start, stop, rows):
+            hi = min(lo + rows, stop)
+            block = buffer[: hi - lo]
+            np.copyto(block, self.codes[lo:hi], casting="unsafe")
+            scores = out[..., lo - start : hi - start]
+            np.matmul(queries, block.T, out=scores)
+            if self.scale is not None:
+                scores *= self.scale[lo:hi]
+        return out
+
+
+def quantized_paths(path: str, precision: str) -> Tuple[str, str]:
+    """Codes and scale files of `path` in `precision`, e.g. x.int8.npy / x.int8_scale.npy."""
+    return converted_path(path, precision), converted_path(path, f"{precision}_scale")
+
+
+def load_quantized(
+    path: str, precision: str = "float32", mmap: bool = True
+) -> QuantizedMatrix:
+    """
+    Load a float matrix in a storage precision, quantizing it on first use.
+
+    Like `load_weight_array`, the converted files are written once next to
+    the source, atomically, and rewritten whenever the source is newer. The
+    scale is written before the codes, so fresh codes imply a fresh scale.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision {precision!r}")
+    mmap_mode = "r" if mmap else None
+
+    source = np.load(path, mmap_mode="r")
+    if source.dtype == np.dtype(precision):
+        return QuantizedMatrix(np.load(path, mmap_mode=mmap_mode))
+
+    codes_path, scale_path = quantized_paths(path, precision)
+    if not os.path.exists(codes_path) or os.path.getmtime(
+        codes_path
+    ) < os.path.getmtime(path):
+        codes, scale = quantize_rows(source, precision)
+        if scale is not None:
+            save_array_atomic(scale_path, scale)
+        save_array_atomic(codes_path, codes)
+    scale = np.load(scale_path, mmap_mode=mmap_mode) if precision == "int8" else None
+    return QuantizedMatrix(np.load(codes_path, mmap_mode=mmap_mode), scale)
+
+
+def agreement_report(
+    reference: np.ndarray,
+    matrix: QuantizedMatrix,
+    queries: np.ndarray,
+    k: int = 10,
+) -> Dict[str, Any]:
+    """
+    Compare rankings from a quantized matrix against float32 ones.
+
+    Parameters:
+    -----------
+    reference : np.ndarray
+        (n, dim) float32 matrix.
+    matrix : QuantizedMatrix
+        The same rows in a storage precision.
+    queries : np.ndarray
+        (q, dim) float32 queries.
+    k : int
+        Ranking depth compared.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        `recall_at_k` (mean overlap of the top-K sets), `top1_agreement`,
+        `max_abs_error` / `mean_abs_error` of the scores, `bytes` of both
+        representations and `scan_ms` per query for both.
+    """
+    from services.topk import top_k_rows
+
+    k = min(k, reference.shape[0])
+    exact = QuantizedMatrix(np.asarray(reference, dtype=np.float32))
+    timings = {}
+    scores = {}
+    for name, m in (("float32", exact), (matrix.precision, matrix)):
+        start = time.perf_counter()
+        for q in queries:
+            m.matmul(q)
+        timings[name] = (time.perf_counter() - start) * 1000 / len(queries)
+        scores[name] = m.matmul(queries)
+
+    ref_scores, q_scores = scores["float32"], scores[matrix.precision]
+    ref_idx, _ = top_k_rows(ref_scores, k)
+    q_idx, _ = top_k_rows(q_scores, k)
+    overlap = [len(set(a.tolist()) & set(b.tolist())) for a, b in zip(ref_idx, q_idx)]
+    error = np.abs(ref_scores - q_scores)
+    return {
+        "precision": matrix.precision,
+        "k": k,
+        "recall_at_k": float(np.mean(overlap)) / k,
+        "top1_agreement": float(np.mean(ref_idx[:, 0] == q_idx[:, 0])),
+        "max_abs_error": float(error.max()),
+        "mean_abs_error": float(error.mean()),
+        "bytes": {"float32": exact.nbytes, matrix.precision: matrix.nbytes},
+        "scan_ms": timings,
+    }
+
+
+def main():
+    """
+    Ranking agreement of float16 and int8 storage against float32.
+
+    Usage, from the backend directory:
+        python -m data.quantize [matrix.npy] [k]
+    """
+    from services.predict import PROJECT_TOWER_EMBS_PATH
+
+    path = sys.argv[1] if len(sys.argv) > 1 else PROJECT_TOWER_EMBS_PATH
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    reference = np.load(path).astype(np.float32)
+    rng = np.random.default_rng(0)
+
+    # Queries drawn around stored vectors so they land in populated regions
+    sample = reference[rng.choice(len(reference), min(200, len(reference)))]
+    queries = sample + rng.normal(scale=sample.std(), size=sample.shape)
+    queries = queries.astype(np.float32)
+
+    print(f"{path}: {reference.shape[0]} x {reference.shape[1]}, k={k}")
+    for precision in ("float16", "int8"):
+        report = agreement_report(
+            reference, QuantizedMatrix(*quantize_rows(reference, precision)), queries, k
+        )
+        print(
+            f"{precision:<8s} recall@{k}={report['recall_at_k']:.4f} "
+            f"top1={report['top1_agreement']:.3f} "
+            f"max_err={report['max_abs_error']:.3g} "
+            f"size={report['bytes'][precision] / report['bytes']['float32']:.2f}x "
+            f"scan={report['scan_ms'][precision]:.3f}ms "
+            f"(float32 {report['scan_ms']['float32']:.3f}ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
@@ -17,3 +17,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def ensure_schema():
+    """Create missing tables and add columns introduced after the first release."""
+    Base.metadata.create_all(bind=engine)
+    columns = {c["name"] for c in inspect(engine).get_columns("projects")}
+    if "description" not in columns:
+        with engine.begin() as conn:
+            conn.execute(
+                text("ALTER TABLE projects ADD COLUMN description VARCHAR DEFAULT ''")
+            )
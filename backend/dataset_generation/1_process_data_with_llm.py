@@ -9,7 +9,13 @@ import openai
 from pydantic import BaseModel, ValidationError
 
 from helpers import process_jobs, process_resumes
-from llm_config import ModelProvider, OllamaModels, OpenAIModels, init_llm_client
+from llm_config import (
+    ModelProvider,
+    OllamaModels,
+    OpenAIModels,
+    init_async_llm_client,
+)
+from settings import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,9 +36,10 @@ async def main():
     # model = OpenAIModels.GPT_4_1
 
     # Initialize Client
-    client = init_llm_client(provider, model)
+    client = init_async_llm_client(provider, model, timeout=settings.LLM_TIMEOUT)
 
-    # Process data
+    # Process data; results are appended to outputs/*.jsonl as they arrive,
+    # so an interrupted run resumes where it stopped
 
     resumes_csv = "data/resume_scraped.csv"
     jobs_csv = "data/jobs_scraped.csv"
@@ -45,6 +52,7 @@ async def main():
         "outputs/output_employee_data.json",
         "outputs/output_employee_mapping.json",
         max_records=5000,
+        concurrency=settings.LLM_CONCURRENCY,
     )
 
     await process_jobs(
@@ -55,6 +63,7 @@ async def main():
         "outputs/output_projects_data.json",
         "outputs/output_projects_mapping.json",
         max_records=1000,
+        concurrency=settings.LLM_CONCURRENCY,
     )
 
 
@@ -34,7 +34,10 @@ DESC_COLLECTION = "employees_by_description"
 TOP_K = 50  # positive candidates
 NEG_K = 5  # hard negatives per method
 RAND_NEG_K = 10  # random negatives per project
-HYBRID_ALPHA = 0.65  # weight for skill vs description
+# Weight for skill vs description. RETRIEVAL_MODE=hybrid in the backend ranks
+# its candidate pool with the same score, so backend/constants.py HYBRID_ALPHA
+# must hold the same value.
+HYBRID_ALPHA = 0.65
 SCORE_THRESHOLD = 0.3  # minimum for positive
 OUTPUT_PATH = "outputs/interactions.json"
 
@@ -1,19 +1,33 @@
 # This file is run once to initialize the data into SQL Alchemy
 
 import json
-from database import SessionLocal, Base, engine
+import os
+from database import SessionLocal, ensure_schema
 from schemas.orm import Skill, User, Project, Interaction
+from data.catalog import ColumnarCatalog
+
+CATALOG_PATH = "./data/catalog"
+TRAINING_DATA_PATH = "./data/training_data.json"
 
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
 
 
-def ingest():
-    with open("./data/training_data.json") as f:
+def load_records():
+    """Return (users, projects) iterables, preferring the columnar catalog."""
+    if os.path.isdir(CATALOG_PATH):
+        catalog = ColumnarCatalog(CATALOG_PATH)
+        return catalog.iter_users(), catalog.iter_projects()
+    with open(TRAINING_DATA_PATH) as f:
         data = json.load(f)
+    return data.get("users", {}).items(), data.get("projects", {}).items()
+
+
+def ingest():
+    users, projects = load_records()
     db = SessionLocal()
-    for uid, info in data.get("users", {}).items():
+    for uid, info in users:
         user = User(external_id=uid)
         db.add(user)
         db.commit()
@@ -23,8 +37,8 @@ def ingest():
             skill.users.append(user)
             db.add(skill)
         db.commit()
-    for pid, info in data.get("projects", {}).items():
-        proj = Project(external_id=pid)
+    for pid, info in projects:
+        proj = Project(external_id=pid, description=info.get("description", ""))
         db.add(proj)
         db.commit()
         db.refresh(proj)
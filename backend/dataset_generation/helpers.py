@@ -1,9 +1,11 @@
 import os
+import asyncio
 import logging
 import json
+import random
 import pandas as pd
 from enum import Enum
-from typing import Dict, Callable, List, Any, Literal
+from typing import Dict, Callable, List, Any, Literal, Optional, Set, Tuple
 
 import openai
 from pydantic import BaseModel, ValidationError
@@ -27,6 +29,18 @@ SKILL_CATEGORIES: List[str] = [
 ]
 LEVEL_WEIGHT = {"Basic": 1.0, "CollegeResearch": 2.0, "Professional": 3.0, "Other": 1.5}
 
+CSV_CHUNK_ROWS = 256  # rows read from a CSV at a time
+MAX_CONCURRENCY = 8  # LLM calls in flight
+MAX_RETRIES = 5  # retries of a transient LLM error
+RETRY_BASE_DELAY = 1.0  # seconds before the first retry, doubled for each next one
+
+# Errors worth retrying: the server is unreachable, slow, throttling or failing
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
 # ---------- Data Models ----------
 
 
@@ -65,13 +79,22 @@ def dedupe_skills(skills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 async def recognize_skills(
-    client: openai.Client,
+    client: openai.AsyncClient,
     model_name: str,
     text: str,
     max_tokens: int = 40,
     temperature: float = 0.2,
+    max_retries: int = MAX_RETRIES,
 ) -> List[Dict[str, Any]]:
+    """
+    Extract skills from free-form text with the LLM.
 
+    Transient API errors (see RETRYABLE_ERRORS) are retried with exponential
+    backoff and jitter, then re-raised; other API errors are re-raised at
+    once. Either way the caller can leave the record for a later run rather
+    than record it as having no skills. Only a response that does not parse
+    yields an empty list.
+    """
     prompt = (
         "You are an expert data extraction agent. Given any free-form text, "
         "identify mentions of: " + ", ".join(SKILL_CATEGORIES) + ". "
@@ -82,21 +105,31 @@ async def recognize_skills(
         "{'skill_name': 'Git', 'level': 'Basic', 'months': 6}"
         "]"
     )
-    try:
-        resp = client.beta.chat.completions.parse(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": text},
-            ],
-            max_tokens=max_tokens,
-            temperature=temperature,
-            response_format=SkillList,
-        )
-        return [s.model_dump() for s in resp.choices[0].message.parsed.skills]
-    except Exception as e:
-        logger.error(f"Skill recognition failed: {e}")
-        return []
+    for attempt in range(max_retries + 1):
+        try:
+            resp = await client.beta.chat.completions.parse(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": text},
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format=SkillList,
+            )
+            parsed = resp.choices[0].message.parsed
+            return [s.model_dump() for s in parsed.skills] if parsed else []
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = RETRY_BASE_DELAY * 2**attempt * (0.5 + random.random())
+            logger.warning(f"LLM call failed ({e}); retry in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except openai.APIError:
+            raise
+        except Exception as e:
+            logger.error(f"Skill recognition failed: {e}")
+            return []
 
 
 def write_json(path: str, data: Any) -> None:
@@ -104,45 +137,144 @@ def write_json(path: str, data: Any) -> None:
         json.dump(data, f, indent=2)
 
 
-# ---------- Processing Functions ----------
+# ---------- Checkpointed Pipeline ----------
+
+# Turns (row index, CSV row, skills) into (id, parsed key, parsed value, data record)
+RecordBuilder = Callable[
+    [int, pd.Series, List[Dict[str, Any]]], Tuple[int, str, Dict, Dict]
+]
 
 
-async def process_resumes(
-    client: openai.Client,
+def read_checkpoint(path: str) -> Set[int]:
+    """
+    CSV rows already recorded in a JSONL results file.
+
+    A line cut short by an interrupted run is dropped from the file, so its
+    row is processed again and later lines start on a fresh line.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        content = f.read()
+        end = content.rfind(b"\n") + 1
+        if end < len(content):
+            f.truncate(end)
+    return {json.loads(line)["row"] for line in content[:end].splitlines() if line}
+
+
+async def extract_csv(
+    client: openai.AsyncClient,
     model_name: str,
-    resumes_path: str,
-    output_parsed: str,
-    output_data: str,
-    output_map: str,
-    max_records: int = None,
-):
-    df = pd.read_csv(resumes_path)
-    parsed, data, mapping = [], [], {}
+    csv_path: str,
+    to_text: Callable[[pd.Series], str],
+    build_record: RecordBuilder,
+    output_jsonl: str,
+    max_tokens: int,
+    max_records: Optional[int] = None,
+    concurrency: int = MAX_CONCURRENCY,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> None:
+    """
+    Run skill extraction over a CSV with up to `concurrency` LLM calls in flight.
 
-    for idx, row in df.iterrows():
-        if max_records and idx >= max_records:
-            break
-        skills = await recognize_skills(
-            client, model_name, row["text"], max_tokens=12000
-        )
-        skills = dedupe_skills(skills)
-        if not skills:
-            continue
+    The CSV is read `chunk_rows` rows at a time. A row's call starts as soon
+    as a slot is free, so calls keep flowing across chunk boundaries and
+    reading stays at most `concurrency` rows ahead of the calls. Each
+    finished row is appended to `output_jsonl` as soon as its call returns,
+    in completion order. The file doubles as the checkpoint: rows it already
+    holds are skipped, so a rerun resumes where the previous one stopped.
+    Rows without skills are recorded too; rows whose call still failed
+    after retries are not, and are retried by the next run.
+    """
+    done = read_checkpoint(output_jsonl)
+    if done:
+        logger.info(f"Resuming {csv_path}: {len(done)} rows already in {output_jsonl}")
+    slots = asyncio.Semaphore(concurrency)
+    in_flight: Set[asyncio.Task] = set()
+    errors: List[BaseException] = []
+    counts = {"written": 0, "failed": 0}
+
+    def finished(task: asyncio.Task) -> None:
+        in_flight.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            errors.append(task.exception())
+
+    with open(output_jsonl, "a", encoding="utf-8") as out:
+
+        async def extract(idx: int, row: pd.Series) -> None:
+            try:
+                skills = await recognize_skills(
+                    client, model_name, to_text(row), max_tokens=max_tokens
+                )
+            except openai.APIError as e:
+                logger.error(f"Row {idx} failed: {e}")
+                counts["failed"] += 1
+                return
+            finally:
+                slots.release()
+            skills = dedupe_skills(skills)
+            line = {"row": idx}
+            if skills:
+                record_id, key, parsed, data = build_record(idx, row, skills)
+                line.update(id=record_id, key=key, parsed=parsed, data=data)
+            out.write(json.dumps(line) + "\n")
+            out.flush()
+            counts["written"] += 1
 
-        emp_id = int(row["resume_id"])
-        key = f"employee_{emp_id}"
-        parsed.append({key: {"description": row["text"], "skills": skills}})
-        data.append(
-            {
-                "employee_id": emp_id,
-                "resume_text": row["text"],
-                "roles": "_".join(eval(row["labels"])),
-            }
-        )
-        mapping[emp_id] = {
+        try:
+            for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+                if max_records:
+                    chunk = chunk[chunk.index < max_records]
+                for idx, row in chunk.iterrows():
+                    if int(idx) in done:
+                        continue
+                    await slots.acquire()
+                    if errors:
+                        raise errors[0]
+                    task = asyncio.create_task(extract(int(idx), row))
+                    in_flight.add(task)
+                    task.add_done_callback(finished)
+                logger.info(
+                    f"{csv_path}: {counts['written']} rows written, "
+                    f"{counts['failed']} failed"
+                )
+                if max_records and len(chunk) < chunk_rows:
+                    break
+            await asyncio.gather(*in_flight)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+    if errors:
+        raise errors[0]
+    logger.info(
+        f"{csv_path}: {counts['written']} rows written, {counts['failed']} failed"
+    )
+    if counts["failed"]:
+        logger.warning(f"{counts['failed']} rows failed; rerun to retry them")
+
+
+def write_outputs(
+    output_jsonl: str, output_parsed: str, output_data: str, output_map: str
+) -> None:
+    """Write the parsed, data and mapping JSON files from a JSONL results file."""
+    lines = {}
+    with open(output_jsonl, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                lines[record["row"]] = record
+    parsed, data, mapping = [], [], {}
+    for row in sorted(lines):
+        record = lines[row]
+        if "key" not in record:
+            continue
+        parsed.append({record["key"]: record["parsed"]})
+        data.append(record["data"])
+        mapping[record["id"]] = {
             "parsed_index": len(parsed) - 1,
             "data_index": len(data) - 1,
-            "parsed_key": key,
+            "parsed_key": record["key"],
         }
 
     write_json(output_parsed, parsed)
@@ -150,44 +282,95 @@ async def process_resumes(
     write_json(output_map, mapping)
 
 
-async def process_jobs(
-    client: openai.Client,
+def checkpoint_path(output_parsed: str) -> str:
+    """JSONL results file kept next to a parsed output file."""
+    return os.path.splitext(output_parsed)[0] + ".jsonl"
+
+
+# ---------- Processing Functions ----------
+
+
+def resume_record(idx: int, row: pd.Series, skills: List[Dict[str, Any]]):
+    emp_id = int(row["resume_id"])
+    key = f"employee_{emp_id}"
+    return (
+        emp_id,
+        key,
+        {"description": row["text"], "skills": skills},
+        {
+            "employee_id": emp_id,
+            "resume_text": row["text"],
+            "roles": "_".join(eval(row["labels"])),
+        },
+    )
+
+
+def job_text(row: pd.Series) -> str:
+    return f"{row['jobtitle']}: {row['jobdescription']}"
+
+
+def job_record(idx: int, row: pd.Series, skills: List[Dict[str, Any]]):
+    proj_id = idx + 1
+    key = f"project_{proj_id}"
+    return (
+        proj_id,
+        key,
+        {"description": job_text(row), "skills": skills},
+        {
+            "project_id": proj_id,
+            "project_text": job_text(row),
+            "roles": row["jobtitle"],
+            # Missing values stay NaN, as the outputs always had them
+            "experience": row.get("experience"),
+        },
+    )
+
+
+async def process_resumes(
+    client: openai.AsyncClient,
     model_name: str,
-    jobs_path: str,
+    resumes_path: str,
     output_parsed: str,
     output_data: str,
     output_map: str,
     max_records: int = None,
+    concurrency: int = MAX_CONCURRENCY,
 ):
-    df = pd.read_csv(jobs_path)
-    parsed, data, mapping = [], [], {}
-
-    for idx, row in df.iterrows():
-        if max_records and idx >= max_records:
-            break
-        desc = f"{row['jobtitle']}: {row['jobdescription']}"
-        skills = await recognize_skills(client, model_name, desc, max_tokens=10000)
-        skills = dedupe_skills(skills)
-        if not skills:
-            continue
+    output_jsonl = checkpoint_path(output_parsed)
+    await extract_csv(
+        client,
+        model_name,
+        resumes_path,
+        lambda row: row["text"],
+        resume_record,
+        output_jsonl,
+        max_tokens=12000,
+        max_records=max_records,
+        concurrency=concurrency,
+    )
+    write_outputs(output_jsonl, output_parsed, output_data, output_map)
 
-        proj_id = idx + 1
-        key = f"project_{proj_id}"
-        parsed.append({key: {"description": desc, "skills": skills}})
-        data.append(
-            {
-                "project_id": proj_id,
-                "project_text": desc,
-                "roles": row["jobtitle"],
-                "experience": row.get("experience"),
-            }
-        )
-        mapping[proj_id] = {
-            "parsed_index": len(parsed) - 1,
-            "data_index": len(data) - 1,
-            "parsed_key": key,
-        }
 
-    write_json(output_parsed, parsed)
-    write_json(output_data, data)
-    write_json(output_map, mapping)
+async def process_jobs(
+    client: openai.AsyncClient,
+    model_name: str,
+    jobs_path: str,
+    output_parsed: str,
+    output_data: str,
+    output_map: str,
+    max_records: int = None,
+    concurrency: int = MAX_CONCURRENCY,
+):
+    output_jsonl = checkpoint_path(output_parsed)
+    await extract_csv(
+        client,
+        model_name,
+        jobs_path,
+        job_text,
+        job_record,
+        output_jsonl,
+        max_tokens=10000,
+        max_records=max_records,
+        concurrency=concurrency,
+    )
+    write_outputs(output_jsonl, output_parsed, output_data, output_map)
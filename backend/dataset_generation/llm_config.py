@@ -1,6 +1,6 @@
 import os
 from enum import Enum
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Optional
 import openai
 from settings import settings
 
@@ -53,3 +53,17 @@ def get_model_config(provider: ModelProvider, model: Enum) -> Dict[str, Any]:
 def init_llm_client(provider: ModelProvider, model: Enum) -> openai.Client:
     config = get_model_config(provider, model)
     return openai.Client(base_url=config["base_url"], api_key=config["api_key"])
+
+
+def init_async_llm_client(
+    provider: ModelProvider, model: Enum, timeout: Optional[float] = None
+) -> openai.AsyncClient:
+    """Async client for concurrent pipelines; `timeout` is per call, in seconds."""
+    config = get_model_config(provider, model)
+    # Retries and backoff are handled per record by helpers.recognize_skills
+    return openai.AsyncClient(
+        base_url=config["base_url"],
+        api_key=config["api_key"],
+        timeout=openai.DEFAULT_TIMEOUT if timeout is None else timeout,
+        max_retries=0,
+    )
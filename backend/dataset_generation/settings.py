@@ -18,6 +18,10 @@ class AppSettings(BaseSettings):
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/v1/")
 
+    # LLM skill extraction: concurrent calls and per-call timeout in seconds
+    LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "8"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "120"))
+
     # Qdrant API Config
     QDRANT_URL: str = os.getenv("QDRANT_URL", "")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
@@ -0,0 +1,105 @@
+# Minimal OpenAI-compatible chat completions server for running the skill
+# extraction pipeline without a model. Skills are found by keyword match.
+#   python stub_llm_server.py --port 8008 --fail-rate 0.2 --delay 0.05
+#   OLLAMA_BASE_URL=http://localhost:8008/v1/ python 1_process_data_with_llm.py
+# --fail-rate answers that share of calls with 429/503 to exercise retries.
+# Structured outputs other than a skill list (e.g. /analysis) get "stub" for
+# every string field of the requested schema.
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from helpers import LEVEL_WEIGHT, SKILL_CATEGORIES
+
+
+def extract(text: str):
+    lowered = text.lower()
+    return [
+        {
+            "skill_name": skill,
+            "level": random.choice(list(LEVEL_WEIGHT)),
+            "months": random.randint(1, 60),
+        }
+        for skill in SKILL_CATEGORIES
+        if skill.split()[0].lower() in lowered
+    ]
+
+
+def answer(request: dict) -> dict:
+    """Content matching the request's response_format schema."""
+    schema = request.get("response_format", {}).get("json_schema", {}).get("schema", {})
+    properties = schema.get("properties", {"skills": {}})
+    if "skills" in properties:
+        return {"skills": extract(request["messages"][-1]["content"])}
+    return {name: "stub" for name in properties}
+
+
+def make_handler(fail_rate: float, delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(delay)
+            if not self.path.endswith("/chat/completions"):
+                self.reply(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            if random.random() < fail_rate:
+                status = random.choice([429, 503])
+                self.reply(status, {"error": {"message": "Stub failure"}})
+                return
+            self.reply(
+                200,
+                {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": json.dumps(answer(request)),
+                            },
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                        "total_tokens": 0,
+                    },
+                },
+            )
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible LLM server")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds per call")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port), make_handler(args.fail_rate, args.delay)
+    )
+    print(f"Stub LLM listening on http://127.0.0.1:{args.port}/v1/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
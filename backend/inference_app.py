@@ -1,15 +1,61 @@
-from fastapi import Depends, FastAPI
+import asyncio
+import logging
+import time
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from routes import predict, analysis
+from routes import health, metrics as metrics_routes, predict, analysis
+from services.metrics import REQUEST_SECONDS, REQUESTS, metrics
+from services.predict import RecommendationService
 
 from settings import settings
 
+logger = logging.getLogger(__name__)
+
+
+async def load_service(app: FastAPI) -> None:
+    """Load the model, weights and text embedder once per process, then warm up."""
+    try:
+        # Loading is blocking (file I/O, model deserialization); keep the loop free
+        service = await asyncio.to_thread(RecommendationService)
+        await service.start()
+        try:
+            await service.warm_up()
+        except Exception:
+            # Do not leave the batcher, feed and executor running unserved
+            await service.stop()
+            raise
+    except Exception as e:
+        # Reported through /readyz; the pod stays up so the error is visible
+        logger.exception("Failed to load the recommendation service")
+        app.state.startup_error = repr(e)
+        return
+    app.state.recommendation_service = service
+    logger.info(service.startup.summary())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.started_at = time.monotonic()
+    app.state.recommendation_service = None
+    app.state.startup_error = None
+    loader = asyncio.create_task(load_service(app))
+    if not settings.WARM_UP_IN_BACKGROUND:
+        await loader
+        if app.state.startup_error is not None:
+            raise RuntimeError(app.state.startup_error)
+    yield
+    loader.cancel()
+    if app.state.recommendation_service is not None:
+        await app.state.recommendation_service.stop()
+
 
 # App definition
 app = FastAPI(
     title="JTP: ML Inference Pod for Project Recommender",
     description="JTP: ML Inference Pod for Project Recommender",
+    lifespan=lifespan,
 )
 
 # Adding CORSMiddleware
@@ -18,9 +64,25 @@ app.add_middleware(
     allow_origins=settings.BACKEND_CORS_ORIGINS,  # You can restrict this to specific origins
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=[predict.CURSOR_HEADER, "ETag"],  # Readable by browser clients
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if not metrics.enabled:
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Route templates keep label cardinality bounded; streaming responses
+    # are timed until their headers are sent
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    metrics.inc(REQUESTS, path, request.method, str(response.status_code))
+    metrics.observe(REQUEST_SECONDS, time.perf_counter() - start, path)
+    return response
+
+
 # Health Check
 @app.get("/", tags=["Health"])
 def root():
@@ -28,5 +90,7 @@ def root():
 
 
 # Routers
+app.include_router(health.router)
+app.include_router(metrics_routes.router)
 app.include_router(predict.router)
 app.include_router(analysis.router)
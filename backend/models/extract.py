@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from constants import LEVEL_WEIGHT
+
+# (kernel, bias) of a Dense layer with any BatchNormalization folded in
+DenseWeights = Tuple[np.ndarray, np.ndarray]
+
+TOWER_NAMES = ("employee_tower", "project_tower")
+
+# Relative error above which an exported tower is rejected
+MAX_RELATIVE_ERROR = 1e-4
+
+# Longest experience, in months, of the skill inputs of the parity check
+MAX_SKILL_MONTHS = 60
+
+
+@dataclass
+class FoldedTower:
+    """
+    Inference-only weights of a `Tower`.
+
+    Every branch is `relu(x @ W + b)` followed by residual blocks
+    `x + relu(x @ W + b)`; the two branch outputs are added. BatchNormalization
+    is folded into the block kernels and Dropout, an identity at inference,
+    is dropped.
+    """
+
+    init_num: DenseWeights
+    init_txt: DenseWeights
+    blocks_num: List[DenseWeights]
+    blocks_txt: List[DenseWeights]
+
+    @property
+    def emb_size(self) -> int:
+        return self.init_num[0].shape[1]
+
+
+def fold_batch_norm(
+    kernel: np.ndarray,
+    bias: np.ndarray,
+    gamma: np.ndarray,
+    beta: np.ndarray,
+    mean: np.ndarray,
+    variance: np.ndarray,
+    epsilon: float,
+) -> DenseWeights:
+    """
+    Fold an inference-mode BatchNormalization into the preceding Dense layer.
+
+    `bn(x @ W + b) = (x @ W + b - mean) * gamma / sqrt(var + eps) + beta`,
+    which is again affine: `x @ (W * s) + ((b - mean) * s + beta)` with
+    `s = gamma / sqrt(var + eps)` applied per output column.
+    """
+    scale = gamma / np.sqrt(variance + epsilon)
+    return (
+        (kernel * scale).astype(np.float32),
+        ((bias - mean) * scale + beta).astype(np.float32),
+    )
+
+
+def _dense_weights(dense) -> DenseWeights:
+    kernel, *rest = [np.asarray(w, dtype=np.float64) for w in dense.get_weights()]
+    bias = rest[0] if rest else np.zeros(kernel.shape[1])
+    return kernel, bias
+
+
+def _activation_name(layer) -> str:
+    return getattr(layer.activation, "__name__", str(layer.activation))
+
+
+def _fold_block(block) -> DenseWeights:
+    kernel, bias = _dense_weights(block.dense)
+    bn = block.bn
+    weights = [np.asarray(w, dtype=np.float64) for w in bn.get_weights()]
+    gamma = weights.pop(0) if bn.scale else np.ones(kernel.shape[1])
+    beta = weights.pop(0) if bn.center else np.zeros(kernel.shape[1])
+    mean, variance = weights
+    if _activation_name(block.dense) != "linear":
+        raise ValueError(f"{block.name}: expected a linear Dense before BatchNorm")
+    return fold_batch_norm(kernel, bias, gamma, beta, mean, variance, bn.epsilon)
+
+
+def _fold_init(dense) -> DenseWeights:
+    if _activation_name(dense) != "relu":
+        raise ValueError(f"{dense.name}: expected a relu projection")
+    kernel, bias = _dense_weights(dense)
+    return kernel.astype(np.float32), bias.astype(np.float32)
+
+
+def extract_tower(tower) -> FoldedTower:
+    """Read the weights of a built Keras `Tower` into a `FoldedTower`."""
+    return FoldedTower(
+        init_num=_fold_init(tower.init_num),
+        init_txt=_fold_init(tower.init_txt),
+        blocks_num=[_fold_block(b) for b in tower.blocks_num],
+        blocks_txt=[_fold_block(b) for b in tower.blocks_txt],
+    )
+
+
+def extract_towers(model_path: str) -> Dict[str, FoldedTower]:
+    """
+    Load a saved two-tower model and return both towers' folded weights.
+
+    Keras is imported here and in `compare_with_keras` only; everything that
+    runs a `FoldedTower` works without it.
+    """
+    import keras
+
+    from models.two_tower import find_two_tower
+
+    two_tower = find_two_tower(keras.saving.load_model(model_path, compile=False))
+    return {name: extract_tower(getattr(two_tower, name)) for name in TOWER_NAMES}
+
+
+def compare_with_keras(
+    model_path: str,
+    forwards: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]],
+    n: int = 256,
+) -> Dict[str, float]:
+    """
+    Largest difference between Keras and another runtime per tower, relative
+    to the largest Keras output.
+
+    `forwards` maps a tower name to a function of (num, txt) float32 batches;
+    both are fed the same random inputs in the ranges the service produces:
+    skill entries are months x level weight (up to MAX_SKILL_MONTHS x the
+    largest weight, zero for about half the skills), as `build_user_vector`
+    computes them, and text inputs have roughly unit norm like fastembed's.
+    """
+    import keras
+
+    from models.two_tower import find_two_tower
+
+    two_tower = find_two_tower(keras.saving.load_model(model_path, compile=False))
+    rng = np.random.default_rng(0)
+    diffs = {}
+    for name, forward in forwards.items():
+        tower = getattr(two_tower, name)
+        num_dim = tower.init_num.kernel.shape[0]
+        txt_dim = tower.init_txt.kernel.shape[0]
+        months = rng.integers(1, MAX_SKILL_MONTHS + 1, (n, num_dim))
+        weights = rng.choice(list(LEVEL_WEIGHT.values()), (n, num_dim))
+        has_skill = rng.random((n, num_dim)) < 0.5
+        num = (months * weights * has_skill).astype(np.float32)
+        txt = rng.normal(0, 0.05, (n, txt_dim)).astype(np.float32)
+        expected = keras.ops.convert_to_numpy(tower([num, txt], training=False))
+        error = np.abs(expected - forward(num, txt)).max()
+        diffs[name] = float(error / max(np.abs(expected).max(), 1e-12))
+    return diffs
@@ -0,0 +1,104 @@
+# Run from the backend directory with `python -m models.numpy_tower` after
+# retraining, to write data/weights/two_tower_folded.npz for
+# INFERENCE_BACKEND=numpy and check it against the Keras model.
+
+import sys
+from typing import Dict
+
+import numpy as np
+
+from data.load_weights import atomic_write
+from models.extract import (
+    MAX_RELATIVE_ERROR,
+    TOWER_NAMES,
+    DenseWeights,
+    FoldedTower,
+    compare_with_keras,
+    extract_towers,
+)
+
+FOLDED_TOWERS_PATH = "data/weights/two_tower_folded.npz"
+
+
+def _branch(x: np.ndarray, init: DenseWeights, blocks) -> np.ndarray:
+    kernel, bias = init
+    x = x @ kernel
+    x += bias
+    np.maximum(x, 0, out=x)
+    for kernel, bias in blocks:
+        y = x @ kernel
+        y += bias
+        np.maximum(y, 0, out=y)
+        x += y
+    return x
+
+
+def forward(tower: FoldedTower, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+    """
+    Run a folded tower over float32 (batch, n_skills) and (batch, text_dim) inputs.
+
+    Equivalent to `Tower(..., training=False)`: two branches of matmuls,
+    bias adds, ReLUs and residual adds, summed at the end. Intermediates are
+    updated in place, so a call allocates one array per matmul.
+    """
+    out = _branch(num, tower.init_num, tower.blocks_num)
+    out += _branch(txt, tower.init_txt, tower.blocks_txt)
+    return out
+
+
+def save_towers(towers: Dict[str, FoldedTower], path: str = FOLDED_TOWERS_PATH):
+    """Write folded towers to one .npz, through a temporary file."""
+    arrays = {}
+    for name, tower in towers.items():
+        for branch in ("num", "txt"):
+            layers = [getattr(tower, f"init_{branch}")]
+            layers += getattr(tower, f"blocks_{branch}")
+            for i, (kernel, bias) in enumerate(layers):
+                arrays[f"{name}/{branch}/{i}/kernel"] = kernel
+                arrays[f"{name}/{branch}/{i}/bias"] = bias
+    with atomic_write(path, suffix=".npz") as f:
+        np.savez(f, **arrays)
+
+
+def load_towers(path: str = FOLDED_TOWERS_PATH) -> Dict[str, FoldedTower]:
+    """Read folded towers written by `save_towers`."""
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    def layers(name: str, branch: str):
+        out, i = [], 0
+        while f"{name}/{branch}/{i}/kernel" in arrays:
+            prefix = f"{name}/{branch}/{i}"
+            out.append((arrays[f"{prefix}/kernel"], arrays[f"{prefix}/bias"]))
+            i += 1
+        return out
+
+    towers = {}
+    for name in TOWER_NAMES:
+        num, txt = layers(name, "num"), layers(name, "txt")
+        if not num or not txt:
+            raise ValueError(f"{path} has no weights for {name}")
+        towers[name] = FoldedTower(num[0], txt[0], num[1:], txt[1:])
+    return towers
+
+
+def main():
+    from services.predict import MODEL_PATH
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else MODEL_PATH
+    save_towers(extract_towers(model_path))
+    print(f"Wrote folded towers to {FOLDED_TOWERS_PATH}")
+
+    towers = load_towers()
+    forwards = {
+        name: lambda num, txt, tower=tower: forward(tower, num, txt)
+        for name, tower in towers.items()
+    }
+    for name, diff in compare_with_keras(model_path, forwards).items():
+        print(f"{name}: max relative |keras - numpy| = {diff:.3g}")
+        if diff > MAX_RELATIVE_ERROR:
+            sys.exit(f"{name} does not match the Keras model")
+
+
+if __name__ == "__main__":
+    main()
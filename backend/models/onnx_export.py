@@ -0,0 +1,127 @@
+# Run from the backend directory with `python -m models.onnx_export` after
+# retraining, to write data/weights/{employee,project}_tower.onnx for
+# INFERENCE_BACKEND=onnx. Requires the `onnx` package (export time only).
+
+import os
+import sys
+from typing import Dict
+
+from data.load_weights import atomic_write
+from models.extract import (
+    MAX_RELATIVE_ERROR,
+    TOWER_NAMES,
+    FoldedTower,
+    compare_with_keras,
+    extract_towers,
+)
+
+ONNX_OPSET = 17
+ONNX_IR_VERSION = 9
+
+ONNX_DIR = "data/weights"
+
+
+def onnx_path(tower_name: str, out_dir: str = ONNX_DIR) -> str:
+    return os.path.join(out_dir, f"{tower_name}.onnx")
+
+
+def tower_to_onnx(tower: FoldedTower, name: str):
+    """
+    Build an ONNX graph computing a folded tower.
+
+    Inputs are `num` (batch, n_skills) and `txt` (batch, text_dim), the
+    output is `emb` (batch, emb_size); the batch dimension is dynamic.
+    """
+    from onnx import TensorProto, helper, numpy_helper
+
+    nodes, initializers = [], []
+
+    def dense(x: str, weights, prefix: str) -> str:
+        kernel, bias = weights
+        initializers.append(numpy_helper.from_array(kernel, f"{prefix}_W"))
+        initializers.append(numpy_helper.from_array(bias, f"{prefix}_b"))
+        nodes.append(helper.make_node("MatMul", [x, f"{prefix}_W"], [f"{prefix}_mm"]))
+        nodes.append(
+            helper.make_node("Add", [f"{prefix}_mm", f"{prefix}_b"], [f"{prefix}_z"])
+        )
+        nodes.append(helper.make_node("Relu", [f"{prefix}_z"], [f"{prefix}_relu"]))
+        return f"{prefix}_relu"
+
+    def branch(x: str, init, blocks, prefix: str) -> str:
+        x = dense(x, init, f"{prefix}_init")
+        for i, block in enumerate(blocks):
+            y = dense(x, block, f"{prefix}_res_{i}")
+            nodes.append(helper.make_node("Add", [x, y], [f"{prefix}_res_{i}_out"]))
+            x = f"{prefix}_res_{i}_out"
+        return x
+
+    x_num = branch("num", tower.init_num, tower.blocks_num, "num")
+    x_txt = branch("txt", tower.init_txt, tower.blocks_txt, "txt")
+    nodes.append(helper.make_node("Add", [x_num, x_txt], ["emb"]))
+
+    def tensor(name: str, width: int):
+        return helper.make_tensor_value_info(name, TensorProto.FLOAT, ["batch", width])
+
+    graph = helper.make_graph(
+        nodes,
+        name,
+        inputs=[
+            tensor("num", tower.init_num[0].shape[0]),
+            tensor("txt", tower.init_txt[0].shape[0]),
+        ],
+        outputs=[tensor("emb", tower.emb_size)],
+        initializer=initializers,
+    )
+    model = helper.make_model(
+        graph,
+        opset_imports=[helper.make_opsetid("", ONNX_OPSET)],
+        producer_name="jtp-two-tower",
+    )
+    model.ir_version = ONNX_IR_VERSION
+    return model
+
+
+def export_towers(model_path: str, out_dir: str = ONNX_DIR) -> Dict[str, str]:
+    """Export both towers of a saved model, returning tower name -> written path."""
+    import onnx
+
+    paths = {}
+    for name, tower in extract_towers(model_path).items():
+        model = tower_to_onnx(tower, name)
+        onnx.checker.check_model(model)
+        path = onnx_path(name, out_dir)
+        with atomic_write(path, suffix=".onnx") as f:
+            onnx.save(model, f)
+        paths[name] = path
+    return paths
+
+
+def onnx_forwards(out_dir: str = ONNX_DIR):
+    """onnxruntime forward functions of the exported towers, for `compare_with_keras`."""
+    import onnxruntime as ort
+
+    forwards = {}
+    for name in TOWER_NAMES:
+        session = ort.InferenceSession(
+            onnx_path(name, out_dir), providers=["CPUExecutionProvider"]
+        )
+        forwards[name] = lambda num, txt, session=session: session.run(
+            None, {"num": num, "txt": txt}
+        )[0]
+    return forwards
+
+
+def main():
+    from services.predict import MODEL_PATH
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else MODEL_PATH
+    for name, path in export_towers(model_path).items():
+        print(f"Wrote {name} to {path}")
+    for name, diff in compare_with_keras(model_path, onnx_forwards()).items():
+        print(f"{name}: max relative |keras - onnxruntime| = {diff:.3g}")
+        if diff > MAX_RELATIVE_ERROR:
+            sys.exit(f"{name} does not match the Keras model")
+
+
+if __name__ == "__main__":
+    main()
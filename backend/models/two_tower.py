@@ -113,6 +113,16 @@ class TwoTowerModel(keras.Model):
         return config
 
 
+def find_two_tower(model: keras.Model) -> TwoTowerModel:
+    """Return the TwoTowerModel inside a saved (possibly functional) wrapper model."""
+    if isinstance(model, TwoTowerModel):
+        return model
+    for layer in model.layers:
+        if isinstance(layer, TwoTowerModel):
+            return layer
+    raise ValueError("Saved model does not contain a TwoTowerModel layer")
+
+
 def build_model(
     n_skills: int,
     text_emb_size: int,
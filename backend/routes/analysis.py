@@ -1,17 +1,14 @@
 from fastapi import APIRouter, HTTPException
 
-from typing import Any, Dict, List
-
-import openai
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from constants import SKILL_CATEGORIES, LEVEL_WEIGHT
 from schemas.predict import AnalysisInput, AnalysisOutput
-from dataset_generation.llm_config import (
-    ModelProvider,
-    OllamaModels,
-    OpenAIModels,
-    init_llm_client,
-)
+
+# openai and the LLM config are imported on the first /analysis request so
+# that they stay off the inference pod's startup path
+if TYPE_CHECKING:
+    import openai
 
 from settings import settings
 
@@ -23,7 +20,7 @@ router = APIRouter(
 
 
 async def perform_analysis_from_context(
-    client: openai.Client,
+    client: "openai.Client",
     model_name: str,
     text: str,
     max_tokens: int = 200,
@@ -112,6 +109,13 @@ async def generate_analysis(payload: AnalysisInput) -> AnalysisOutput:
     ```
     """
     try:
+        from dataset_generation.llm_config import (
+            ModelProvider,
+            OllamaModels,
+            OpenAIModels,
+            init_llm_client,
+        )
+
         if settings.OPENAI_API_KEY == "":
             model_name = OllamaModels.GEMMA3_1B
             client = init_llm_client(ModelProvider.OLLAMA, model_name)
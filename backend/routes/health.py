@@ -0,0 +1,67 @@
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(tags=["Health"])
+
+
+def model_state(request: Request) -> str:
+    if request.app.state.recommendation_service is not None:
+        return "ready"
+    if request.app.state.startup_error is not None:
+        return "failed"
+    return "loading"
+
+
+@router.get("/healthz")
+def healthz(request: Request):
+    """
+    Liveness probe: the process is up and its event loop is serving.
+
+    Always 200, also while the model is loading, so that a slow start does
+    not get the pod restarted. Use `/readyz` to gate traffic.
+
+    Returns:
+    --------
+    dict
+        - status: "alive"
+        - model_state: "loading", "ready" or "failed"
+        - uptime_seconds: time since the app started
+    """
+    return {
+        "status": "alive",
+        "model_state": model_state(request),
+        "uptime_seconds": round(time.monotonic() - request.app.state.started_at, 3),
+    }
+
+
+@router.get("/readyz")
+def readyz(request: Request):
+    """
+    Readiness probe: 200 only once the weights are loaded and a warm-up
+    inference has succeeded, 503 before that or after a failed load.
+
+    Returns:
+    --------
+    dict
+        - status: "ready", "loading" or "failed"
+        - model_version, backend, embedding_precision, retrieval_mode
+        - catalog_size: projects currently searchable
+        - employee_index_loaded: whether /predict/employees can answer
+        - warm_up_seconds: duration of the warm-up inference
+        - startup: duration of every loading stage
+        - error: the load failure, when status is "failed"
+    """
+    state = model_state(request)
+    if state == "ready":
+        service = request.app.state.recommendation_service
+        return {
+            "status": state,
+            **service.describe(),
+            "startup": service.startup.as_dict(),
+        }
+    content = {"status": state}
+    if state == "failed":
+        content["error"] = request.app.state.startup_error
+    return JSONResponse(status_code=503, content=content)
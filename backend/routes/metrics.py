@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from services.metrics import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Metrics in the Prometheus text exposition format.
+
+    Includes per-stage latency histograms of the predict pipeline, HTTP
+    request counts and latencies per route, employee-tower batch sizes,
+    embedding cache hit ratio and inference executor queue depth.
+    Returns 404 when METRICS_ENABLED is false.
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from schemas.predict import (
+    BatchRecommendationRequest,
+    EmployeeRecommendationRequest,
+    EmployeeRecommendationResult,
     RecommendationRequest,
-    RecommendationResponse,
     RecommendationWithMetaDataResult,
 )
-from services.predict import RecommendationService
-from typing import List
+from services.cache import body_etag, etag_matches
+from services.predict import RecommendationService, get_recommendation_service
+from services.executor import ExecutorOverloaded
+from services.employees import EmployeeIndexNotReady
+from settings import settings
+from typing import List, Optional
 
 
 router = APIRouter(
@@ -14,9 +21,16 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Response header carrying the cursor of the next page of a /predict ranking
+CURSOR_HEADER = "X-Result-Cursor"
+
 
 @router.post("/", response_model=List[RecommendationWithMetaDataResult])
-async def recommend_projects(payload: RecommendationRequest):
+async def recommend_projects(
+    payload: RecommendationRequest,
+    if_none_match: Optional[str] = Header(None),
+    service: RecommendationService = Depends(get_recommendation_service),
+):
     """
     Recommend the top-K most relevant projects based on user's skills and description.
 
@@ -31,6 +45,22 @@ async def recommend_projects(payload: RecommendationRequest):
         - skills: List of skills with name, level, and months of experience.
         - description: A short free-text description of the candidate (e.g., interests or goals).
         - top_k: Number of top matching projects to return.
+        - required_skills: Optional skills (with an optional min_level) every returned project must require.
+        - exclude_project_ids: Optional projects never to return.
+        - exclude_rated_by: Optional user id whose already rated projects are skipped.
+
+        Filtered-out projects are never scored, so fewer than top_k results
+        are returned when fewer projects pass the filters.
+
+        When more results are ranked than returned, the `X-Result-Cursor`
+        response header holds a cursor for `GET /predict/page`, which serves
+        the following results without rescoring for RESULT_CURSOR_TTL seconds.
+
+        Identical requests (same skills in any order, same normalized
+        description, top_k and filters) are answered from a response cache
+        until the model or the catalog changes. Every response carries an
+        `ETag`; a request whose `If-None-Match` header lists it gets an empty
+        304 instead of the body.
 
     Returns:
     --------
@@ -51,7 +81,9 @@ async def recommend_projects(payload: RecommendationRequest):
             {"skill_name": "Docker", "level": "Professional", "months": 6}
         ],
         "description": "I love backend development and want to work on scalable systems.",
-        "top_k": 3
+        "top_k": 3,
+        "required_skills": [{"skill_name": "Python", "min_level": "Professional"}],
+        "exclude_rated_by": "employee_42"
     }
 
     **Response:**
@@ -70,17 +102,202 @@ async def recommend_projects(payload: RecommendationRequest):
     ]
     """
     try:
-        service = RecommendationService()
+        body, cursor = await service.recommend_response(payload)
+
+        headers = {"ETag": body_etag(body)}
+        if cursor is not None:
+            headers[CURSOR_HEADER] = cursor
+        # /predict is a read-only query sent as POST, so it revalidates like a GET
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        if isinstance(e, ExecutorOverloaded):
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": "1"}
+            )
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/page", response_model=List[RecommendationWithMetaDataResult])
+def recommend_projects_page(
+    response: Response,
+    cursor: str = Query(..., description="X-Result-Cursor of the previous page"),
+    limit: Optional[int] = Query(
+        None, ge=1, description="Page size; defaults to the first page's top_k"
+    ),
+    service: RecommendationService = Depends(get_recommendation_service),
+):
+    """
+    Return the next page of a `/predict/` ranking from its result cursor.
+
+    Pages are sliced from the ranked list cached by the first request, so no
+    embedding or scoring runs again, and ranks continue where the previous
+    page stopped. Rankings are kept RESULT_CURSOR_DEPTH results deep for
+    RESULT_CURSOR_TTL seconds; the `X-Result-Cursor` header of each page
+    points to the next one and is absent on the last page.
+
+    Parameters:
+    -----------
+    **cursor** : `str`
+        The `X-Result-Cursor` header of the previous page.
+    **limit** : `int`, optional
+        Number of results in this page.
+
+    Returns:
+    --------
+    `List[RecommendationWithMetaDataResult]`
+        Same shape as the `/predict/` response. 404 once the cursor expired,
+        400 for a malformed cursor.
+
+    Example:
+    --------
+    **Request:**
+    GET /predict/page?cursor=3f2a...-9c1e0b7d.3.3
+
+    **Response:**
+    [
+        {"rank": 4, "project_id": "project_57", "score": 49120.4, ...},
+        ...
+    ]
+    """
+    try:
+        result, next_cursor = service.result_page(cursor, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers[CURSOR_HEADER] = next_cursor
+    return result
+
+
+@router.post("/batch")
+async def recommend_projects_batch(
+    payload: BatchRecommendationRequest,
+    service: RecommendationService = Depends(get_recommendation_service),
+):
+    """
+    Recommend projects for many candidates in one call, streamed as NDJSON.
+
+    All descriptions are embedded in one batch and the employee tower runs once
+    over the stacked skill matrix. Scores are computed block by block against
+    the project index with a per-row top-K, and each request's results are
+    written as soon as its block is done.
+
+    Parameters:
+    -----------
+    **payload** : `BatchRecommendationRequest`
+        - requests: List of `RecommendationRequest` objects. Requests with
+          prefilters are honoured and scored individually.
+
+    Returns:
+    --------
+    `application/x-ndjson`
+        One `BatchRecommendationResult` per line, in request order:
+        - index: Position of the request in `requests`.
+        - results: Same shape as the `/predict/` response.
+
+    Example:
+    --------
+    **Request body:**
+    {
+        "requests": [
+            {"skills": [{"skill_name": "Python", "level": "Professional", "months": 12}],
+             "description": "Backend developer", "top_k": 2},
+            {"skills": [{"skill_name": "Excel", "level": "Basic", "months": 3}],
+             "description": "Data analyst", "top_k": 1}
+        ]
+    }
+
+    **Response:**
+    {"index": 0, "results": [{"rank": 1, "project_id": "project_22", ...}, ...]}
+    {"index": 1, "results": [{"rank": 1, "project_id": "project_7", ...}]}
+    """
+    if len(payload.requests) > settings.PREDICT_BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.PREDICT_BATCH_MAX_REQUESTS} requests per batch",
+        )
+
+    results = service.recommend_batch(payload.requests)
+    try:
+        # Resolve the first line eagerly so errors still map to a status code
+        first = await anext(results, None)
+    except ExecutorOverloaded as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream():
+        if first is None:
+            return
+        yield first.model_dump_json() + "\n"
+        async for item in results:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 
-        result = await service.recommend_with_metadata(
+@router.post("/employees", response_model=List[EmployeeRecommendationResult])
+async def recommend_employees(
+    payload: EmployeeRecommendationRequest,
+    service: RecommendationService = Depends(get_recommendation_service),
+):
+    """
+    Recommend the top-K employees for a project.
+
+    The project is either a catalog project referenced by `project_id`, whose
+    project-tower embedding is already precomputed, or an ad-hoc project given
+    by its skills and description, which runs through the project tower once.
+    It is then scored against the precomputed employee-tower index.
+
+    Parameters:
+    -----------
+    **payload** : `EmployeeRecommendationRequest`
+        - project_id: Optional catalog project id.
+        - skills: Required skills when no project_id is given.
+        - description: Project description when no project_id is given.
+        - top_k: Number of employees to return.
+
+    Returns:
+    --------
+    `List[EmployeeRecommendationResult]`
+        - rank: Rank of the employee (1 being the best match).
+        - employee_id: Identifier of the employee.
+        - score: Relevance score from the two-tower model.
+
+    Example:
+    --------
+    **Request body:**
+    {"project_id": "project_22", "top_k": 2}
+
+    **Response:**
+    [
+        {"rank": 1, "employee_id": "employee_1031", "score": 812.4},
+        {"rank": 2, "employee_id": "employee_789", "score": 799.1}
+    ]
+    """
+    try:
+        return await service.recommend_employees(
+            project_id=payload.project_id,
             skills=[s.model_dump() for s in payload.skills],
             description=payload.description,
             top_k=payload.top_k,
         )
 
-        return result
-
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
+        if isinstance(e, KeyError):
+            raise HTTPException(status_code=404, detail=str(e.args[0]))
+        if isinstance(e, (EmployeeIndexNotReady, ExecutorOverloaded)):
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": "1"}
+            )
         raise HTTPException(status_code=500, detail=str(e))
@@ -29,6 +29,7 @@ class User(UserBase):
 
 class ProjectBase(BaseModel):
     external_id: str
+    description: str = ""
 
 
 class Project(ProjectBase):
@@ -41,6 +41,7 @@ class Project(Base):
     __tablename__ = "projects"
     id = Column(Integer, primary_key=True, index=True)
     external_id = Column(String, unique=True, index=True)
+    description = Column(String, default="")
     skills = relationship("Skill", secondary=project_skill, back_populates="projects")
 
 
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
+from settings import settings
+
 
 # Limit skill names to allowed values
 SkillName = Literal[
@@ -26,10 +28,33 @@ class Skill(BaseModel):
     months: int = Field(default=5, ge=0, description="Number of months of experience")
 
 
+class SkillRequirement(BaseModel):
+    skill_name: SkillName
+    min_level: Optional[SkillLevel] = Field(
+        None,
+        description="Lowest accepted level, ordered by level weight; any level when omitted",
+    )
+
+
 class RecommendationRequest(BaseModel):
     skills: List[Skill]
     description: str = Field(..., description="Short description of the candidate")
-    top_k: int = Field(5, description="How many entries to show")
+    top_k: int = Field(
+        5,
+        ge=1,
+        le=settings.MAX_TOP_K,
+        description="How many entries to show",
+    )
+    required_skills: List[SkillRequirement] = Field(
+        default_factory=list,
+        description="Only recommend projects requiring all of these skills",
+    )
+    exclude_project_ids: List[str] = Field(
+        default_factory=list, description="Projects never to recommend"
+    )
+    exclude_rated_by: Optional[str] = Field(
+        None, description="Skip the projects this user already rated"
+    )
 
 
 class RecommendationResponse(BaseModel):
@@ -51,6 +76,39 @@ class RecommendationWithMetaDataResult(BaseModel):
     required_skills: List[SkillMetadata]
 
 
+class BatchRecommendationRequest(BaseModel):
+    requests: List[RecommendationRequest] = Field(
+        ..., description="Independent recommendation requests scored together"
+    )
+
+
+class BatchRecommendationResult(BaseModel):
+    index: int = Field(..., description="Position of the request in the batch")
+    results: List[RecommendationWithMetaDataResult]
+
+
+class EmployeeRecommendationRequest(BaseModel):
+    project_id: Optional[str] = Field(
+        None, description="Catalog project to staff; overrides skills/description"
+    )
+    skills: List[Skill] = Field(
+        default_factory=list, description="Required skills of an ad-hoc project"
+    )
+    description: str = Field("", description="Description of an ad-hoc project")
+    top_k: int = Field(
+        5,
+        ge=1,
+        le=settings.MAX_TOP_K,
+        description="How many employees to show",
+    )
+
+
+class EmployeeRecommendationResult(BaseModel):
+    rank: int
+    employee_id: str
+    score: float
+
+
 class AnalysisInput(BaseModel):
     employee_skills: List[SkillMetadata]
     employee_description: str
@@ -0,0 +1,249 @@
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from services.topk import top_k as select_top_k
+
+IVF_MANIFEST_FILE = "ivf.json"
+
+
+class ExactIndex:
+    """Brute-force inner-product search; the reference every ANN index is checked against."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def search(self, query: np.ndarray, k: int, **_) -> Tuple[np.ndarray, np.ndarray]:
+        return select_top_k(self.vectors @ query, k)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 65536):
+    """Nearest centroid (L2) for every vector, computed block by block."""
+    c_norms = (centroids * centroids).sum(axis=1)
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], block):
+        v = np.asarray(vectors[start : start + block], dtype=np.float32)
+        # argmin ||v - c||^2 == argmin ||c||^2 - 2 v.c
+        labels[start : start + block] = np.argmin(c_norms - 2.0 * v @ centroids.T, 1)
+    return labels
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0
+) -> np.ndarray:
+    """Plain Lloyd k-means in NumPy, returning float32 centroids."""
+    rng = np.random.default_rng(seed)
+    data = np.asarray(vectors, dtype=np.float32)
+    centroids = data[rng.choice(len(data), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _assign(data, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        counts = np.bincount(labels, minlength=n_clusters)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters on random points so no list stays unused
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), int(empty.sum()))]
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) index for approximate maximum inner-product search.
+
+    Vectors are clustered with k-means into `n_lists` inverted lists and
+    stored contiguously list by list. A query scores the centroids, probes the
+    `nprobe` best lists and runs exact inner products only over their members,
+    so the work per query is about `nprobe / n_lists` of a full scan. `nprobe`
+    plays the role of HNSW's `ef`: larger values trade latency for recall.
+
+    Attributes:
+    -----------
+    centroids : np.ndarray
+        (n_lists, dim) cluster centres.
+    list_offsets : np.ndarray
+        (n_lists + 1,) start of each list in `ids` / `vectors`.
+    ids : np.ndarray
+        Original row of every stored vector, grouped by list.
+    vectors : np.ndarray
+        Stored vectors, grouped by list.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+    ):
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.ids = ids
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return self.ids.shape[0]
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_iter: int = 20,
+        max_train_points: int = 256,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Cluster `vectors` and lay them out by inverted list.
+
+        Parameters:
+        -----------
+        vectors : np.ndarray
+            (n, dim) vectors to index, e.g. project-tower outputs.
+        n_lists : int, optional
+            Number of inverted lists. Defaults to about sqrt(n).
+        n_iter : int
+            k-means iterations.
+        max_train_points : int
+            k-means is trained on at most this many points per list.
+        seed : int
+            Seed for sampling and centroid initialisation.
+        """
+        n = vectors.shape[0]
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        n_lists = max(1, min(n_lists, n))
+        rng = np.random.default_rng(seed)
+        train_size = min(n, n_lists * max_train_points)
+        train = vectors[np.sort(rng.choice(n, train_size, replace=False))]
+        centroids = kmeans(train, n_lists, n_iter=n_iter, seed=seed)
+
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=n_lists), out=offsets[1:])
+        return cls(
+            centroids,
+            offsets,
+            order.astype(np.int64),
+            np.asarray(vectors, dtype=np.float32)[order],
+        )
+
+    def search(
+        self, query: np.ndarray, k: int, nprobe: int = 8
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return approximate top-K original rows and scores, highest first."""
+        nprobe = max(1, min(nprobe, self.n_lists))
+        lists, _ = select_top_k(self.centroids @ query, nprobe)
+        ranges = [(self.list_offsets[l], self.list_offsets[l + 1]) for l in lists]
+        positions = np.concatenate([np.arange(a, b) for a, b in ranges])
+        if positions.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        best, scores = select_top_k(self.vectors[positions] @ query, k)
+        return self.ids[positions[best]], scores
+
+    def save(self, path: str) -> None:
+        """Write the index as .npy files plus a manifest, replacing `path` atomically."""
+        out_dir = Path(path)
+        tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name in ("centroids", "list_offsets", "ids", "vectors"):
+            np.save(tmp_dir / f"{name}.npy", getattr(self, name))
+        with open(tmp_dir / IVF_MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump({"n": len(self), "n_lists": self.n_lists}, f)
+        old_dir = out_dir.with_name(out_dir.name + ".old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if out_dir.exists():
+            os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFIndex":
+        """Open a saved index; with `mmap` the stored vectors stay in the page cache."""
+        mmap_mode = "r" if mmap else None
+        path = Path(path)
+        return cls(
+            np.load(path / "centroids.npy"),
+            np.load(path / "list_offsets.npy"),
+            np.load(path / "ids.npy", mmap_mode=mmap_mode),
+            np.load(path / "vectors.npy", mmap_mode=mmap_mode),
+        )
+
+
+def recall_at_k(
+    index, exact: ExactIndex, queries: np.ndarray, k: int, **search_params
+) -> float:
+    """Mean fraction of the exact top-K that `index` also returns."""
+    hits = 0
+    for q in queries:
+        truth = set(exact.search(q, k)[0].tolist())
+        found = set(index.search(q, k, **search_params)[0].tolist())
+        hits += len(truth & found)
+    return hits / (len(queries) * min(k, len(exact)))
+
+
+def load_ann_index(
+    vectors: np.ndarray,
+    index_path: str,
+    source_path: str,
+    n_lists: Optional[int] = None,
+    mmap: bool = True,
+) -> IVFIndex:
+    """Load the IVF index at `index_path`, rebuilding it if older than `source_path`."""
+    manifest = Path(index_path) / IVF_MANIFEST_FILE
+    if manifest.exists() and os.path.getmtime(manifest) >= os.path.getmtime(
+        source_path
+    ):
+        index = IVFIndex.load(index_path, mmap=mmap)
+        if len(index) == vectors.shape[0]:
+            return index
+    IVFIndex.build(np.asarray(vectors, dtype=np.float32), n_lists=n_lists).save(
+        index_path
+    )
+    return IVFIndex.load(index_path, mmap=mmap)
+
+
+def main():
+    """
+    Recall@K check of the IVF index against exact search.
+
+    Usage, from the backend directory:
+        python -m services.ann [index.npy] [k]
+    """
+    from services.predict import PROJECT_TOWER_EMBS_PATH
+
+    path = sys.argv[1] if len(sys.argv) > 1 else PROJECT_TOWER_EMBS_PATH
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    vectors = np.load(path).astype(np.float32)
+    rng = np.random.default_rng(0)
+
+    # Queries drawn around stored vectors so they land in populated regions
+    sample = vectors[rng.choice(len(vectors), min(200, len(vectors)))]
+    queries = sample + rng.normal(scale=sample.std(), size=sample.shape)
+
+    exact = ExactIndex(vectors)
+    index = IVFIndex.build(vectors)
+    print(f"{len(vectors)} vectors, {index.n_lists} lists, k={k}")
+    for nprobe in (1, 2, 4, 8, 16, 32):
+        if nprobe > index.n_lists:
+            break
+        recall = recall_at_k(index, exact, queries.astype(np.float32), k, nprobe=nprobe)
+        print(f"nprobe={nprobe:<3d} recall@{k}={recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
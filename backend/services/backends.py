@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import os
+from typing import Callable, Tuple
+
+import numpy as np
+
+from models.extract import TOWER_NAMES
+from models.numpy_tower import FOLDED_TOWERS_PATH, forward, load_towers as load_folded
+from models.onnx_export import onnx_path
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows pushed through a tower per forward pass when encoding the catalog
+ENCODE_BATCH_SIZE = 4096
+
+BACKENDS = ("keras", "onnx", "numpy")
+
+
+def model_version(paths: Tuple[str, ...]) -> str:
+    """
+    Identify the loaded model by its files' contents.
+
+    MODEL_VERSION overrides it, e.g. with a release tag set at deploy time.
+    """
+    if settings.MODEL_VERSION:
+        return settings.MODEL_VERSION
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def run_batched(
+    forward: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    num: np.ndarray,
+    txt: np.ndarray,
+    emb_size: int,
+) -> np.ndarray:
+    """Run `forward` over (num, txt) in ENCODE_BATCH_SIZE slices and stack the float32 outputs."""
+    outputs = []
+    for start in range(0, num.shape[0], ENCODE_BATCH_SIZE):
+        stop = start + ENCODE_BATCH_SIZE
+        outputs.append(
+            forward(
+                np.ascontiguousarray(num[start:stop], dtype=np.float32),
+                np.ascontiguousarray(txt[start:stop], dtype=np.float32),
+            )
+        )
+    if not outputs:
+        return np.zeros((0, emb_size), dtype=np.float32)
+    return np.vstack(outputs).astype(np.float32, copy=False)
+
+
+class KerasTowers:
+    """
+    Employee and project towers run through the saved Keras model.
+
+    Parameters:
+    -----------
+    model_path : str
+        Saved `.keras` model containing a TwoTowerModel.
+    """
+
+    name = "keras"
+
+    def __init__(self, model_path: str):
+        import keras
+
+        # Importing models.two_tower registers the custom layers for loading
+        from models.two_tower import find_two_tower
+
+        self._keras = keras
+        self.model = keras.saving.load_model(model_path, compile=False)
+        self.two_tower = find_two_tower(self.model)
+        self.emb_size = self.two_tower.emb_size
+        self.source_paths: Tuple[str, ...] = (model_path,)
+
+    def _tower(self, tower) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        def forward(num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+            out = tower([num, txt], training=False)
+            return self._keras.ops.convert_to_numpy(out)
+
+        return forward
+
+    def encode_users(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        forward = self._tower(self.two_tower.employee_tower)
+        return run_batched(forward, num, txt, self.emb_size)
+
+    def encode_projects(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        forward = self._tower(self.two_tower.project_tower)
+        return run_batched(forward, num, txt, self.emb_size)
+
+
+def _warn_if_stale(path: str, model_path: str) -> None:
+    if os.path.exists(model_path) and os.path.getmtime(path) < os.path.getmtime(
+        model_path
+    ):
+        logger.warning("%s is older than %s; re-export it", path, model_path)
+
+
+class OnnxTowers:
+    """
+    Employee and project towers run through onnxruntime.
+
+    Loads the graphs written by `python -m models.onnx_export`; Keras is
+    never imported. Sessions are safe to call from several executor threads
+    at once.
+
+    Parameters:
+    -----------
+    model_path : str
+        The Keras model the graphs were exported from, only used to warn
+        when the export is older than it.
+    onnx_dir : str
+        Directory holding `employee_tower.onnx` and `project_tower.onnx`.
+    intra_op_threads, inter_op_threads : int
+        onnxruntime thread pool sizes; 0 keeps onnxruntime's default.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_path: str,
+        onnx_dir: str,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 0,
+    ):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+
+        self.sessions = {}
+        for tower_name in TOWER_NAMES:
+            path = onnx_path(tower_name, onnx_dir)
+            if not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"{path} not found; run `python -m models.onnx_export` first"
+                )
+            _warn_if_stale(path, model_path)
+            self.sessions[tower_name] = ort.InferenceSession(
+                path, options, providers=["CPUExecutionProvider"]
+            )
+        self.emb_size = self.sessions["project_tower"].get_outputs()[0].shape[1]
+        self.source_paths: Tuple[str, ...] = tuple(
+            onnx_path(tower_name, onnx_dir) for tower_name in TOWER_NAMES
+        )
+
+    def _tower(self, tower_name: str) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        session = self.sessions[tower_name]
+
+        def forward(num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+            return session.run(None, {"num": num, "txt": txt})[0]
+
+        return forward
+
+    def encode_users(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        return run_batched(self._tower("employee_tower"), num, txt, self.emb_size)
+
+    def encode_projects(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        return run_batched(self._tower("project_tower"), num, txt, self.emb_size)
+
+
+class NumpyTowers:
+    """
+    Employee and project towers run as plain NumPy matmuls.
+
+    Loads the folded weights written by `python -m models.numpy_tower`;
+    neither Keras nor onnxruntime is imported, and a single-row request is a
+    dozen small matmuls with no framework dispatch.
+
+    Parameters:
+    -----------
+    model_path : str
+        The Keras model the weights were extracted from, only used to warn
+        when the extraction is older than it.
+    path : str
+        The folded-weights .npz file.
+    """
+
+    name = "numpy"
+
+    def __init__(self, model_path: str, path: str = FOLDED_TOWERS_PATH):
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"{path} not found; run `python -m models.numpy_tower` first"
+            )
+        _warn_if_stale(path, model_path)
+        self.towers = load_folded(path)
+        self.emb_size = self.towers["project_tower"].emb_size
+        self.source_paths: Tuple[str, ...] = (path,)
+
+    def encode_users(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        tower = self.towers["employee_tower"]
+        return run_batched(lambda n, t: forward(tower, n, t), num, txt, self.emb_size)
+
+    def encode_projects(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        tower = self.towers["project_tower"]
+        return run_batched(lambda n, t: forward(tower, n, t), num, txt, self.emb_size)
+
+
+def load_towers(backend: str, model_path: str):
+    """Build the tower runner selected by INFERENCE_BACKEND."""
+    if backend == "keras":
+        return KerasTowers(model_path)
+    if backend == "onnx":
+        return OnnxTowers(
+            model_path,
+            settings.ONNX_MODEL_DIR,
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS,
+            inter_op_threads=settings.ONNX_INTER_OP_THREADS,
+        )
+    if backend == "numpy":
+        return NumpyTowers(model_path)
+    raise ValueError(
+        f"Unknown inference backend {backend!r}; expected one of {BACKENDS}"
+    )
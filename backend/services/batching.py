@@ -0,0 +1,156 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple
+
+from services.executor import ExecutorOverloaded
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls into batched calls.
+
+    Coroutines `await submit(item)`; a background task gathers queued items
+    until either `max_batch` items are waiting or `max_wait_ms` has passed
+    since the first one arrived, runs `process_batch` once on the whole list
+    in an executor and resolves every caller's future with its own result.
+    Batches are dispatched without waiting for the previous one to finish, up
+    to `max_in_flight` at a time, so every executor worker can be busy.
+
+    Parameters:
+    -----------
+    process_batch : Callable[[List[Any]], List[Any]]
+        Blocking function mapping a list of items to a list of results of the
+        same length and order.
+    max_batch : int
+        Upper bound on items per `process_batch` call.
+    max_wait_ms : float
+        Longest time the first item of a batch waits for company.
+    executor : concurrent.futures.Executor, optional
+        Where `process_batch` runs. Defaults to the loop's default executor.
+    max_queue : int
+        Items allowed to wait for a batch; `submit` beyond that raises
+        `ExecutorOverloaded` so callers shed load. 0 means unbounded.
+    max_in_flight : int, optional
+        Batches running at once. Defaults to the executor's `max_workers`,
+        or 1 when it has none.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int = 32,
+        max_wait_ms: float = 2.0,
+        executor: Optional[Executor] = None,
+        max_queue: int = 0,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.process_batch = process_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.max_queue = max(0, max_queue)
+        self.max_in_flight = max(
+            1, max_in_flight or getattr(executor, "max_workers", 1)
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Fail whatever was still queued rather than leaving callers hanging
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result; raises when the queue is full."""
+        if not self.running:
+            raise RuntimeError("MicroBatcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise ExecutorOverloaded(
+                f"Micro-batch queue is full ({self.max_queue} waiting)"
+            ) from None
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Bound here so batches finishing after a restart free their own slots
+        slots = self._slots
+        while True:
+            # A free slot first, so items keep queueing while all batches run
+            await slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                slots.release()
+                raise
+            items = [item for item, _ in batch]
+            try:
+                running = loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as e:
+                # e.g. ExecutorOverloaded from a bounded executor's submit
+                slots.release()
+                self._fail(batch, e)
+                continue
+            running.add_done_callback(functools.partial(self._resolve, slots, batch))
+
+    def _resolve(
+        self,
+        slots: asyncio.Semaphore,
+        batch: List[Tuple[Any, asyncio.Future]],
+        running: asyncio.Future,
+    ) -> None:
+        slots.release()
+        if running.cancelled():
+            self._fail(batch, RuntimeError("MicroBatcher batch was cancelled"))
+            return
+        if running.exception() is not None:
+            self._fail(batch, running.exception())
+            return
+        for (_, future), result in zip(batch, running.result()):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Any, asyncio.Future]], error: BaseException) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
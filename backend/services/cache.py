@@ -0,0 +1,278 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, collapsed whitespace, stripped."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    """Stable hash of an already normalized text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header lists `etag` (weakly compared) or is *."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+
+def encode_cursor(key: str, offset: int, size: int) -> str:
+    """Page token of a cached ranked list: its key, the page start and size."""
+    return f"{key}.{offset}.{size}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, int]:
+    """(key, offset, size) of a token made by `encode_cursor`."""
+    try:
+        key, offset, size = cursor.rsplit(".", 2)
+        offset, size = int(offset), int(size)
+    except ValueError:
+        raise ValueError(f"Malformed result cursor {cursor!r}") from None
+    if not key or offset < 0 or size < 1:
+        raise ValueError(f"Malformed result cursor {cursor!r}")
+    return key, offset, size
+
+
+class LRUCache:
+    """
+    Thread-safe bounded LRU cache with optional time-to-live and hit/miss counters.
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of entries kept; the least recently used is evicted first.
+    ttl : float, optional
+        Seconds after which an entry is treated as missing. None disables expiry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class DiskEmbeddingStore:
+    """
+    SQLite-backed embedding store that survives restarts and is shared by workers.
+
+    Vectors are stored as raw float32 bytes keyed by the normalized text hash.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = (
+            self._conn()
+            .execute("SELECT vector FROM embeddings WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def set(self, key: str, vector: np.ndarray) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            (key, np.asarray(vector, dtype=np.float32).tobytes()),
+        )
+        conn.commit()
+
+
+# Cached response: serialized body and the result cursor it was returned with
+CachedResponse = Tuple[bytes, Optional[str]]
+
+
+class MemoryResponseCache:
+    """
+    Per-process response cache: an LRUCache for the current catalog version.
+
+    The first lookup with a new version drops every entry, and entries
+    stored under an older version (a request that started before the change)
+    are ignored.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.version: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hits(self) -> int:
+        return self.entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self.entries.misses
+
+    def get(self, version: str, key: str) -> Optional[CachedResponse]:
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+        return self.entries.get(key)
+
+    def set(self, version: str, key: str, value: CachedResponse) -> None:
+        if version == self.version:
+            self.entries.set(key, value)
+
+
+class DiskResponseCache:
+    """
+    SQLite response cache shared by the workers of a pod.
+
+    Calls block on SQLite, so async callers run them in a worker thread;
+    each thread keeps its own connection. Rows are tagged with the catalog version they were computed against and
+    only returned for that version; a worker that sees a new version deletes
+    the rows of every other one. At most `maxsize` rows are kept, the oldest
+    are deleted first, and rows older than `ttl` seconds are treated as
+    missing.
+    """
+
+    # Rows are trimmed to `maxsize` once every this many writes
+    TRIM_EVERY = 256
+
+    def __init__(self, path: str, maxsize: int = 4096, ttl: Optional[float] = None):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+            "version TEXT, body BLOB, cursor TEXT, created REAL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            # A lost cache row only costs a recomputation; skip the fsync per write
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, version: str, key: str) -> Optional[CachedResponse]:
+        conn = self._conn()
+        if version != self.version:
+            conn.execute("DELETE FROM responses WHERE version != ?", (version,))
+            conn.commit()
+            self.version = version
+        row = conn.execute(
+            "SELECT body, cursor FROM responses "
+            "WHERE key = ? AND version = ? AND created > ?",
+            (key, version, time.time() - self.ttl if self.ttl else float("-inf")),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return bytes(row[0]), row[1]
+
+    def set(self, version: str, key: str, value: CachedResponse) -> None:
+        if version != self.version or self.maxsize <= 0:
+            return
+        body, cursor = value
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, version, body, cursor, time.time()),
+        )
+        with self._lock:
+            self._writes += 1
+            trim = self._writes % self.TRIM_EVERY == 0
+        if trim:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+        conn.commit()
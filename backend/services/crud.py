@@ -36,7 +36,9 @@ def create_project(
     project: crud.ProjectBase,
     skills: List[crud.SkillBase],
 ) -> crud.Project:
-    db_proj = orm.Project(external_id=project.external_id)
+    db_proj = orm.Project(
+        external_id=project.external_id, description=project.description
+    )
     db.add(db_proj)
     db.commit()
     db.refresh(db_proj)
@@ -0,0 +1,153 @@
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from constants import LEVEL_WEIGHT, skill2idx
+from data.load_projects import load_user_records, source_mtime
+from data.load_weights import load_weight_array, save_array_atomic
+from services.topk import top_k as select_top_k, top_k_streaming
+
+EMPLOYEE_TOWER_EMBS_PATH = "data/weights/employee_tower_embs.npy"
+EMPLOYEE_IDS_PATH = "data/weights/employee_ids.npy"
+
+# Descriptions embedded per TextEmbedding.embed call while building the index
+EMBED_BATCH_SIZE = 256
+
+
+class EmployeeIndexNotReady(RuntimeError):
+    """Raised while the employee index is still being loaded or built."""
+
+
+def user_skill_vector(skills: List[Dict[str, Any]]) -> np.ndarray:
+    """Same encoding as `RecommendationService.build_user_vector`, skipping unknown entries."""
+    vec = np.zeros(len(skill2idx), dtype=np.float32)
+    for s in skills:
+        name, level = s.get("skill_name"), s.get("level")
+        if name in skill2idx and level in LEVEL_WEIGHT:
+            vec[skill2idx[name]] = s.get("months", 0) * LEVEL_WEIGHT[level]
+    return vec
+
+
+class EmployeeIndex:
+    """
+    Precomputed employee-tower embeddings for every known employee.
+
+    Ranking employees for a project is the mirror image of `/predict`: the
+    project tower runs once and the result is scored against this matrix with
+    a single matrix-vector product, so no employee goes through the network at
+    query time.
+
+    Attributes:
+    -----------
+    employee_ids : np.ndarray
+        Employee ids aligned with the rows of `embs`.
+    embs : np.ndarray
+        Employee-tower outputs of shape (n_employees, emb_size).
+    """
+
+    def __init__(self, employee_ids: np.ndarray, embs: np.ndarray):
+        self.employee_ids = employee_ids
+        self.embs = embs
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    def search(
+        self, project_emb: np.ndarray, top_k: int, block_size: int = 262144
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the top-K employee rows and scores for one project embedding."""
+        if len(self) <= block_size:
+            return select_top_k(self.embs @ project_emb, top_k)
+        chunks = (
+            (start, self.embs[start : start + block_size] @ project_emb)
+            for start in range(0, len(self), block_size)
+        )
+        return top_k_streaming(chunks, top_k)
+
+    @classmethod
+    def build(
+        cls,
+        users: List[Tuple[str, Dict[str, Any]]],
+        embed: Callable[[List[str]], np.ndarray],
+        encode_users: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        emb_size: int,
+        embs_path: str = EMPLOYEE_TOWER_EMBS_PATH,
+        ids_path: str = EMPLOYEE_IDS_PATH,
+    ) -> "EmployeeIndex":
+        """
+        Encode all users through the employee tower and persist the result.
+
+        Parameters:
+        -----------
+        users : List[Tuple[str, Dict[str, Any]]]
+            (user_id, {"description", "skills"}) pairs.
+        embed : Callable[[List[str]], np.ndarray]
+            Batch text embedder for user descriptions.
+        encode_users : Callable[[np.ndarray, np.ndarray], np.ndarray]
+            Employee tower over (skill vectors, text embeddings).
+        emb_size : int
+            Width of the tower output, which an index without users still needs.
+        """
+        ids = np.array([uid for uid, _ in users], dtype=str)
+        blocks = []
+        for start in range(0, len(users), EMBED_BATCH_SIZE):
+            batch = [rec for _, rec in users[start : start + EMBED_BATCH_SIZE]]
+            num = np.vstack([user_skill_vector(r.get("skills", [])) for r in batch])
+            txt = embed([r.get("description", "") for r in batch])
+            blocks.append(encode_users(num, txt))
+        embs = (
+            np.vstack(blocks).astype(np.float32)
+            if blocks
+            else np.zeros((0, emb_size), dtype=np.float32)
+        )
+        save_array_atomic(embs_path, embs)
+        save_array_atomic(ids_path, ids)
+        return cls(ids, embs)
+
+    @classmethod
+    def load(
+        cls,
+        embs_path: str = EMPLOYEE_TOWER_EMBS_PATH,
+        ids_path: str = EMPLOYEE_IDS_PATH,
+        dtype: str = "float32",
+        mmap: bool = False,
+    ) -> "EmployeeIndex":
+        return cls(
+            np.load(ids_path, mmap_mode="r" if mmap else None),
+            load_weight_array(embs_path, dtype, mmap),
+        )
+
+    @staticmethod
+    def is_fresh(
+        source_paths: Tuple[str, ...],
+        embs_path: str = EMPLOYEE_TOWER_EMBS_PATH,
+        ids_path: str = EMPLOYEE_IDS_PATH,
+    ) -> bool:
+        """True when the persisted index is newer than the model and user data."""
+        if not (os.path.exists(embs_path) and os.path.exists(ids_path)):
+            return False
+        built = min(os.path.getmtime(embs_path), os.path.getmtime(ids_path))
+        return all(source_mtime(p) <= built for p in source_paths if os.path.exists(p))
+
+
+def load_employee_index(
+    users_path: str,
+    model_paths: Tuple[str, ...],
+    embed: Callable[[List[str]], np.ndarray],
+    encode_users: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    emb_size: int,
+    dtype: str = "float32",
+    mmap: bool = False,
+) -> EmployeeIndex:
+    """
+    Load the persisted employee index, rebuilding it when stale or missing.
+
+    `model_paths` are the files of the active tower backend (its
+    `source_paths`), so swapping the model on any backend triggers a rebuild.
+    """
+    if not EmployeeIndex.is_fresh((users_path, *model_paths)):
+        EmployeeIndex.build(
+            load_user_records(users_path), embed, encode_users, emb_size
+        )
+    return EmployeeIndex.load(dtype=dtype, mmap=mmap)
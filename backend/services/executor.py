@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorOverloaded(RuntimeError):
+    """Raised when the inference executor has no free worker or queue slot."""
+
+
+class InferenceExecutor(Executor):
+    """
+    Bounded thread pool for blocking CPU inference (Keras, fastembed, NumPy).
+
+    At most `max_workers` tasks run concurrently and at most `max_queue` more
+    wait for a worker. Submitting beyond that raises `ExecutorOverloaded`
+    immediately instead of queueing without limit, so callers can shed load
+    and keep tail latency bounded. NumPy, ONNX Runtime and the Keras backends
+    release the GIL inside their kernels, so threads give real parallelism.
+
+    Parameters:
+    -----------
+    max_workers : int
+        Number of inference threads.
+    max_queue : int
+        Number of tasks allowed to wait for a free thread.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Tasks currently running or queued."""
+        return self._pending
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks waiting for a free worker thread."""
+        return max(0, self._pending - self.max_workers)
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorOverloaded(
+                f"Inference queue is full ({self.max_workers} running, "
+                f"{self.max_queue} queued)"
+            )
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run `fn(*args)` on the pool and await its result."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -0,0 +1,275 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from constants import LEVEL_WEIGHT, SKILL_CATEGORIES, skill2idx
+from data.load_projects import (
+    CatalogMetadataSnapshot,
+    ExtendedMetadataSnapshot,
+    load_interactions,
+)
+from schemas.predict import RecommendationRequest, SkillMetadata
+
+# Levels ordered by their model weight, so "at least CollegeResearch" also
+# accepts Professional
+LEVEL_RANK: Dict[str, int] = {
+    level: rank for rank, level in enumerate(sorted(LEVEL_WEIGHT, key=LEVEL_WEIGHT.get))
+}
+
+# Skill level code of a project that does not require the skill
+NO_SKILL = -1
+
+# Catalog rows converted per block when building the index from columns
+BUILD_BLOCK_ROWS = 1048576
+
+if len(SKILL_CATEGORIES) > 64:
+    raise ValueError("Skill bitmasks hold at most 64 skill categories")
+
+
+@dataclass
+class ProjectFilter:
+    """
+    Constraints of one request on the projects it may be recommended.
+
+    Attributes:
+    -----------
+    required : List[Tuple[int, int]]
+        (skill index, minimum level rank) pairs the project must all require;
+        a rank of 0 accepts any level.
+    exclude_project_ids : List[str]
+        Projects never to return.
+    exclude_rated_by : str, optional
+        User whose rated projects are excluded.
+    """
+
+    required: List[Tuple[int, int]] = field(default_factory=list)
+    exclude_project_ids: List[str] = field(default_factory=list)
+    exclude_rated_by: Optional[str] = None
+
+    @classmethod
+    def from_request(cls, request: RecommendationRequest) -> Optional["ProjectFilter"]:
+        """The request's prefilter, or None when it has no constraints."""
+        filters = cls(
+            required=[
+                (skill2idx[r.skill_name], LEVEL_RANK[r.min_level] if r.min_level else 0)
+                for r in request.required_skills
+            ],
+            exclude_project_ids=list(request.exclude_project_ids),
+            exclude_rated_by=request.exclude_rated_by,
+        )
+        if filters.required or filters.exclude_project_ids or filters.exclude_rated_by:
+            return filters
+        return None
+
+
+def _encode(
+    skill_idx: np.ndarray, level_rank: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bitmask and level matrix of (n, width) skill-index / level-rank arrays,
+    padded with -1.
+    """
+    n = skill_idx.shape[0]
+    bits = np.zeros(n, dtype=np.uint64)
+    levels = np.full((len(SKILL_CATEGORIES), n), NO_SKILL, dtype=np.int8)
+    rows = np.arange(n)
+    for col in range(skill_idx.shape[1]):
+        skill, rank = skill_idx[:, col], level_rank[:, col]
+        valid = skill >= 0
+        bits[valid] |= np.left_shift(np.uint64(1), skill[valid].astype(np.uint64))
+        # A skill listed twice keeps its highest level
+        np.maximum.at(levels, (skill[valid], rows[valid]), rank[valid])
+    return bits, levels
+
+
+def _encode_rows(
+    skill_lists: Sequence[List[SkillMetadata]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    width = max((len(skills) for skills in skill_lists), default=0)
+    skill_idx = np.full((len(skill_lists), width), -1, dtype=np.int64)
+    level_rank = np.full((len(skill_lists), width), NO_SKILL, dtype=np.int8)
+    for row, skills in enumerate(skill_lists):
+        for col, s in enumerate(skills):
+            if s.skill_name in skill2idx:
+                skill_idx[row, col] = skill2idx[s.skill_name]
+                level_rank[row, col] = LEVEL_RANK.get(s.level, NO_SKILL)
+    return _encode(skill_idx, level_rank)
+
+
+def _encode_catalog(snapshot: CatalogMetadataSnapshot) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized encoding of a columnar catalog, a block of rows at a time."""
+    catalog = snapshot.catalog
+    # Catalog vocabularies may hold names outside SKILL_CATEGORIES; those map to -1
+    skill_map = np.array([skill2idx.get(s, -1) for s in catalog.skill_names] + [-1])
+    level_map = np.array(
+        [LEVEL_RANK.get(l, NO_SKILL) for l in catalog.level_names] + [NO_SKILL],
+        dtype=np.int8,
+    )
+    skill_codes = catalog.columns["project_skill_idx"]
+    level_codes = catalog.columns["project_skill_level"]
+    bits = np.zeros(catalog.n_projects, dtype=np.uint64)
+    levels = np.full((len(SKILL_CATEGORIES), catalog.n_projects), NO_SKILL, np.int8)
+    for start in range(0, catalog.n_projects, BUILD_BLOCK_ROWS):
+        stop = min(start + BUILD_BLOCK_ROWS, catalog.n_projects)
+        # Padding (-1) indexes the trailing -1 of each map
+        skill_idx = skill_map[np.asarray(skill_codes[start:stop])]
+        level_rank = level_map[np.asarray(level_codes[start:stop])]
+        level_rank[skill_idx < 0] = NO_SKILL
+        bits[start:stop], levels[:, start:stop] = _encode(skill_idx, level_rank)
+    return bits, levels
+
+
+def _keep(bits: np.ndarray, levels: np.ndarray, required) -> np.ndarray:
+    keep = np.ones(bits.shape[0], dtype=bool)
+    if not required:
+        return keep
+    # OR, not sum: a skill required twice (at two min levels) sets one bit
+    want = np.bitwise_or.reduce(
+        np.left_shift(np.uint64(1), np.array([s for s, _ in required], np.uint64))
+    )
+    np.equal(bits & want, want, out=keep)
+    for skill, rank in required:
+        if rank > 0:
+            keep &= levels[skill] >= rank
+    return keep
+
+
+class ProjectFilterIndex:
+    """
+    Per-project skill bitmask and level matrix for vectorized prefiltering.
+
+    `bits[i]` has bit `j` set when project `i` requires `SKILL_CATEGORIES[j]`,
+    and `levels[j, i]` is the rank (see `LEVEL_RANK`) of that requirement, or
+    -1. A filter of k required skills is one AND/compare over the bitmask plus
+    one contiguous int8 compare per skill with a minimum level.
+
+    Like the metadata snapshots, an index is never modified: `extend` returns
+    a new index sharing the base arrays, with the runtime rows kept apart so
+    that ingesting a project does not copy the catalog-sized arrays.
+
+    Attributes:
+    -----------
+    bits : np.ndarray
+        (n,) uint64 skill bitmask of the base catalog.
+    levels : np.ndarray
+        (n_skills, n) int8 level ranks of the base catalog.
+    extra_bits, extra_levels : np.ndarray
+        The same for rows appended at runtime.
+    """
+
+    def __init__(
+        self,
+        bits: np.ndarray,
+        levels: np.ndarray,
+        extra_bits: Optional[np.ndarray] = None,
+        extra_levels: Optional[np.ndarray] = None,
+    ):
+        self.bits = bits
+        self.levels = levels
+        self.extra_bits = (
+            extra_bits if extra_bits is not None else np.zeros(0, dtype=np.uint64)
+        )
+        self.extra_levels = (
+            extra_levels
+            if extra_levels is not None
+            else np.zeros((len(SKILL_CATEGORIES), 0), dtype=np.int8)
+        )
+
+    def __len__(self) -> int:
+        return self.bits.shape[0] + self.extra_bits.shape[0]
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "ProjectFilterIndex":
+        """Build the index of a project metadata snapshot."""
+        if isinstance(snapshot, ExtendedMetadataSnapshot):
+            return cls.from_snapshot(snapshot.base).extend(
+                [skills for _, _, skills in snapshot.extra]
+            )
+        if isinstance(snapshot, CatalogMetadataSnapshot):
+            return cls(*_encode_catalog(snapshot))
+        return cls(*_encode_rows([snapshot.row(i)[2] for i in range(len(snapshot))]))
+
+    @classmethod
+    def from_level_matrix(cls, level_rank: np.ndarray) -> "ProjectFilterIndex":
+        """
+        Build the index of an (n, n_skills) matrix of level ranks in
+        SKILL_CATEGORIES order, -1 where a project does not require the skill.
+        """
+        n = level_rank.shape[0]
+        bits = np.zeros(n, dtype=np.uint64)
+        levels = np.empty((len(SKILL_CATEGORIES), n), dtype=np.int8)
+        skill_bits = np.left_shift(
+            np.uint64(1), np.arange(len(SKILL_CATEGORIES), dtype=np.uint64)
+        )
+        for start in range(0, n, BUILD_BLOCK_ROWS):
+            block = np.asarray(level_rank[start : start + BUILD_BLOCK_ROWS])
+            levels[:, start : start + block.shape[0]] = block.T
+            bits[start : start + block.shape[0]] = np.bitwise_or.reduce(
+                np.where(block >= 0, skill_bits, np.uint64(0)), axis=1
+            )
+        return cls(bits, levels)
+
+    def extend(
+        self, skill_lists: Sequence[List[SkillMetadata]]
+    ) -> "ProjectFilterIndex":
+        """A new index with rows for projects appended at runtime."""
+        bits, levels = _encode_rows(skill_lists)
+        return ProjectFilterIndex(
+            self.bits,
+            self.levels,
+            np.concatenate([self.extra_bits, bits]),
+            np.concatenate([self.extra_levels, levels], axis=1),
+        )
+
+    def mask(self, required: Sequence[Tuple[int, int]]) -> np.ndarray:
+        """Boolean mask of the projects meeting every (skill, min rank) requirement."""
+        keep = _keep(self.bits, self.levels, required)
+        if self.extra_bits.shape[0]:
+            keep = np.concatenate(
+                [keep, _keep(self.extra_bits, self.extra_levels, required)]
+            )
+        return keep
+
+
+class RatedProjectIndex:
+    """
+    Catalog rows rated by each user.
+
+    The catalog stores interactions project-major; this is the user-major
+    transpose (CSR), so the projects of one user are a contiguous slice.
+
+    Parameters:
+    -----------
+    project_rows, user_rows : np.ndarray
+        One entry per interaction.
+    user_ids : np.ndarray
+        Ids of the users `user_rows` refers to.
+    n_projects : int
+        Catalog size the rows refer to.
+    """
+
+    def __init__(
+        self,
+        project_rows: np.ndarray,
+        user_rows: np.ndarray,
+        user_ids: np.ndarray,
+        n_projects: int,
+    ):
+        order = np.argsort(user_rows, kind="stable")
+        self.indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(user_rows, minlength=len(user_ids)), out=self.indptr[1:])
+        self.project_rows = np.asarray(project_rows, dtype=np.int64)[order]
+        self.user_row = {str(uid): i for i, uid in enumerate(user_ids)}
+        self.n_projects = n_projects
+
+    @classmethod
+    def load(cls, file_path: str, n_projects: int) -> "RatedProjectIndex":
+        return cls(*load_interactions(file_path), n_projects)
+
+    def rows(self, user_id: str) -> np.ndarray:
+        """Catalog rows the user rated; empty for unknown users."""
+        row = self.user_row.get(user_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64)
+        return self.project_rows[self.indptr[row] : self.indptr[row + 1]]
@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from constants import HYBRID_ALPHA
+from services.ann import IVF_MANIFEST_FILE, IVFIndex
+
+# Catalog rows normalized per block when building the hybrid vectors
+BUILD_BLOCK_ROWS = 262144
+
+
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit L2 norm; all-zero rows stay zero."""
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+
+def hybrid_vectors(profiles: np.ndarray, text_embs: np.ndarray) -> np.ndarray:
+    """
+    Project side of the hybrid score: [profile / |profile|, text / |text|].
+
+    Both halves are unit vectors, so the inner product with `hybrid_query`
+    is the weighted sum of the two cosines. The weight lives in the query
+    only, so the stored vectors do not depend on it.
+    """
+    n = profiles.shape[0]
+    out = np.empty((n, profiles.shape[1] + text_embs.shape[1]), dtype=np.float32)
+    split = profiles.shape[1]
+    for start in range(0, n, BUILD_BLOCK_ROWS):
+        stop = min(start + BUILD_BLOCK_ROWS, n)
+        out[start:stop, :split] = _normalize_rows(profiles[start:stop])
+        out[start:stop, split:] = _normalize_rows(text_embs[start:stop])
+    return out
+
+
+def hybrid_query(
+    user_num: np.ndarray, user_txt: np.ndarray, alpha: float = HYBRID_ALPHA
+) -> np.ndarray:
+    """
+    User side of the hybrid score, as in the dataset generator:
+    `alpha` x skill cosine + (1 - alpha) x description cosine.
+    """
+    return np.concatenate(
+        [alpha * _normalize_rows(user_num), (1 - alpha) * _normalize_rows(user_txt)],
+        axis=-1,
+    )
+
+
+def load_hybrid_index(
+    build_vectors: Callable[[], np.ndarray],
+    n_projects: int,
+    index_path: str,
+    source_paths: Sequence[str],
+    n_lists: Optional[int] = None,
+    mmap: bool = True,
+) -> IVFIndex:
+    """
+    Load the IVF index over the hybrid vectors at `index_path`.
+
+    It is rebuilt, from `build_vectors()`, when older than any of
+    `source_paths` or when its size differs from `n_projects`; the hybrid
+    vectors are only materialized in that case.
+    """
+    manifest = Path(index_path) / IVF_MANIFEST_FILE
+    if manifest.exists() and all(
+        os.path.getmtime(manifest) >= os.path.getmtime(p) for p in source_paths
+    ):
+        index = IVFIndex.load(index_path, mmap=mmap)
+        if len(index) == n_projects:
+            return index
+    IVFIndex.build(build_vectors(), n_lists=n_lists).save(index_path)
+    return IVFIndex.load(index_path, mmap=mmap)
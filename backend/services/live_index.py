@@ -0,0 +1,223 @@
+import threading
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from data.quantize import QuantizedMatrix
+from services.metrics import metrics
+from services.topk import (
+    merge_top_k_rows,
+    top_k as select_top_k,
+    top_k_rows,
+    top_k_streaming,
+)
+
+# Catalogs larger than this are scored chunk by chunk with a streaming top-K
+SCORE_BLOCK_SIZE = 262144
+
+# Max elements of one (users, projects) score block in batch scoring
+BATCH_SCORE_BLOCK_ELEMENTS = 16_777_216
+
+# Above this share of surviving rows, a prefiltered search scans every row
+# and discards the rest; below it, only the survivors are gathered and scored
+DENSE_CANDIDATE_FRACTION = 0.25
+
+
+class ProjectIndexSnapshot:
+    """
+    Immutable view of the project-tower index at one point in time.
+
+    Rows `[0, n_base)` live in the (typically memory-mapped, possibly
+    quantized) base matrix built offline; rows from `n_base` on were appended at runtime. Superseded rows
+    are listed in `masked` and never returned by a search.
+    """
+
+    def __init__(self, base: QuantizedMatrix, delta: np.ndarray, masked: np.ndarray):
+        self.base = base
+        self.delta = delta
+        self.masked = masked
+        self.n_base = base.shape[0]
+
+    def __len__(self) -> int:
+        return self.n_base + self.delta.shape[0]
+
+    def row(self, idx: int) -> np.ndarray:
+        """Project-tower embedding of one row."""
+        if idx < self.n_base:
+            return self.base[idx]
+        return self.delta[idx - self.n_base]
+
+    def _mask(self, scores: np.ndarray, offset: int) -> np.ndarray:
+        """Set scores of masked rows inside [offset, offset + n) to -inf."""
+        if self.masked.size:
+            n = scores.shape[-1]
+            local = self.masked[(self.masked >= offset) & (self.masked < offset + n)]
+            scores[..., local - offset] = -np.inf
+        return scores
+
+    def score_chunks(self, user_emb: np.ndarray) -> Iterable[Tuple[int, np.ndarray]]:
+        """Yield (offset, scores) blocks of one user's scores against every row."""
+        for start in range(0, self.n_base, SCORE_BLOCK_SIZE):
+            scores = self.base.matmul(user_emb, start, start + SCORE_BLOCK_SIZE)
+            yield start, self._mask(scores, start)
+        if self.delta.shape[0]:
+            yield self.n_base, self._mask(self.delta @ user_emb, self.n_base)
+
+    def _score_blocks(
+        self, user_embs: np.ndarray, chunk: int
+    ) -> Iterable[Tuple[int, np.ndarray]]:
+        """Yield (offset, (B, chunk) scores) blocks of a batch against every row."""
+        for start in range(0, self.n_base, chunk):
+            yield start, self.base.matmul(user_embs, start, start + chunk)
+        if self.delta.shape[0]:
+            yield self.n_base, user_embs @ self.delta.T
+
+    def search(
+        self, user_emb: np.ndarray, top_k: int, keep: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-K rows and scores for one user embedding.
+
+        With `keep`, a boolean mask over the rows, only rows where it is True
+        are candidates; see `search_candidates`.
+        """
+        if keep is not None:
+            return self.search_candidates(user_emb, top_k, keep)
+        if len(self) <= SCORE_BLOCK_SIZE and not self.delta.shape[0]:
+            with metrics.stage("score"):
+                scores = self._mask(self.base.matmul(user_emb), 0)
+            with metrics.stage("top_k"):
+                return select_top_k(scores, top_k)
+        # Scoring and selection interleave chunk by chunk here
+        with metrics.stage("score_top_k"):
+            return top_k_streaming(self.score_chunks(user_emb), top_k)
+
+    def search_candidates(
+        self, user_emb: np.ndarray, top_k: int, keep: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact top-K among the rows where `keep` is True.
+
+        When few rows survive, only those are gathered and scored, so a
+        selective filter costs a fraction of a full scan. When most survive,
+        gathering would cost more than it saves: every row is scored block by
+        block and the rest are set to -inf before selection. Masked rows are
+        never returned either way.
+        """
+        if self.masked.size:
+            keep = keep.copy()
+            keep[self.masked] = False
+        rows = np.flatnonzero(keep)
+        if rows.size > DENSE_CANDIDATE_FRACTION * len(self):
+
+            def chunks():
+                for start, scores in self.score_chunks(user_emb):
+                    scores[~keep[start : start + scores.shape[0]]] = -np.inf
+                    yield start, scores
+
+            with metrics.stage("score_top_k"):
+                return top_k_streaming(chunks(), top_k)
+
+        with metrics.stage("score_candidates"):
+            scores = np.empty(rows.size, dtype=np.float32)
+            split = int(np.searchsorted(rows, self.n_base))
+            for lo in range(0, split, SCORE_BLOCK_SIZE):
+                hi = min(lo + SCORE_BLOCK_SIZE, split)
+                scores[lo:hi] = self.base[rows[lo:hi]] @ user_emb
+            scores[split:] = self.delta[rows[split:] - self.n_base] @ user_emb
+        with metrics.stage("top_k"):
+            best, values = select_top_k(scores, top_k)
+        return rows[best], values
+
+    def search_delta(
+        self, user_emb: np.ndarray, top_k: int, keep: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-K over the runtime-appended rows only, optionally prefiltered."""
+        scores = self._mask(self.delta @ user_emb, self.n_base)
+        if keep is not None:
+            scores[~keep[self.n_base : len(self)]] = -np.inf
+        idxs, scores = select_top_k(scores, top_k)
+        return idxs + self.n_base, scores
+
+    def search_batch(
+        self, user_embs: np.ndarray, top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (B, top_k) rows and scores for a batch of user embeddings."""
+        # Bound the (B, chunk) score matrix so memory does not grow with the catalog
+        chunk = max(1, BATCH_SCORE_BLOCK_ELEMENTS // max(1, user_embs.shape[0]))
+        best = None
+        for start, scores in self._score_blocks(user_embs, chunk):
+            scores = self._mask(scores, start)
+            block_best = top_k_rows(scores, top_k, offset=start)
+            best = (
+                block_best
+                if best is None
+                else merge_top_k_rows(best, block_best, top_k)
+            )
+        return best
+
+
+class LiveProjectIndex:
+    """
+    Project-tower index that accepts appends and updates without a reload.
+
+    Readers call `snapshot` once per request and work on that immutable view.
+    The single writer never modifies anything a published snapshot can see:
+    new rows are written past the end of the delta buffer's published length
+    (or into a freshly grown copy), updates append a replacement row and mask
+    the old one through a new `masked` array, and the new snapshot is then
+    published with one attribute assignment. Readers therefore never take a
+    lock and never observe a partial write.
+
+    The base matrix is left untouched, so a memory-mapped base stays shared
+    between workers; only the runtime delta lives in each process's heap.
+    """
+
+    def __init__(self, base: QuantizedMatrix):
+        self._delta_buffer = np.zeros((16, base.shape[1]), dtype=np.float32)
+        self._write_lock = threading.Lock()
+        self.snapshot = ProjectIndexSnapshot(
+            base, self._delta_buffer[:0], np.empty(0, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def upsert(
+        self, embs: np.ndarray, replaces: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Append rows and mask the rows they supersede.
+
+        Parameters:
+        -----------
+        embs : np.ndarray
+            (m, emb_size) project-tower outputs to add.
+        replaces : np.ndarray, optional
+            For every new row, the row it replaces, or -1 for a new project.
+
+        Returns:
+        --------
+        np.ndarray
+            The row numbers assigned to the new embeddings.
+        """
+        with self._write_lock:
+            current = self.snapshot
+            n_delta = current.delta.shape[0]
+            needed = n_delta + embs.shape[0]
+            if needed > self._delta_buffer.shape[0]:
+                grown = np.zeros(
+                    (max(needed, 2 * self._delta_buffer.shape[0]), embs.shape[1]),
+                    dtype=np.float32,
+                )
+                grown[:n_delta] = current.delta
+                self._delta_buffer = grown
+            self._delta_buffer[n_delta:needed] = embs
+
+            masked = current.masked
+            if replaces is not None and (replaces >= 0).any():
+                masked = np.union1d(masked, replaces[replaces >= 0])
+            self.snapshot = ProjectIndexSnapshot(
+                current.base, self._delta_buffer[:needed], masked
+            )
+            return np.arange(current.n_base + n_delta, current.n_base + needed)
@@ -0,0 +1,295 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from settings import settings
+
+# Latency buckets in seconds, from sub-millisecond matmuls to slow embeddings
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels) or self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[i] += 1
+            total[0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), s[0]) for k, (c, s) in self._values.items()]
+        lines = []
+        for key, counts, total in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {running}"
+                )
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {running}")
+        return lines
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time, so nothing is paid per request.
+
+    `kind="counter"` exposes a monotonic count that is kept elsewhere, such
+    as the embedding cache's hit counter.
+    """
+
+    def __init__(
+        self, name: str, doc: str, read: Callable[[], float], kind: str = "gauge"
+    ):
+        self.name, self.doc, self.read, self.kind = name, doc, read, kind
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.read())}"]
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text exposition format.
+
+    With `enabled=False` nothing is recorded: `stage` returns a shared no-op
+    context manager and `inc`/`observe` return immediately, so the
+    instrumentation left in the request path costs a couple of attribute
+    lookups.
+
+    Example:
+    --------
+    >>> with metrics.stage("embed_text"):
+    ...     vectors = text_model.embed(texts)
+    >>> metrics.render()
+    '# HELP predict_stage_seconds ...'
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._noop = nullcontext()
+        self.stage_seconds = self.histogram(
+            "predict_stage_seconds",
+            "Time spent in each stage of the predict pipeline.",
+            labels=("stage",),
+        )
+
+    def counter(self, name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, doc, labels))
+
+    def histogram(
+        self,
+        name: str,
+        doc: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, doc, labels, buckets))
+
+    def gauge(
+        self, name: str, doc: str, read: Callable[[], float], kind: str = "gauge"
+    ) -> Gauge:
+        """Register (or replace) a callback metric."""
+        gauge = Gauge(name, doc, read, kind)
+        self._metrics[name] = gauge
+        return gauge
+
+    def inc(self, counter: Counter, *labels: str, amount: float = 1.0) -> None:
+        if self.enabled:
+            counter.inc(amount, *labels)
+
+    def observe(self, histogram: Histogram, value: float, *labels: str) -> None:
+        if self.enabled:
+            histogram.observe(value, *labels)
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds.observe(time.perf_counter() - start, stage)
+
+    def stage(self, name: str):
+        """Context manager timing one pipeline stage into `predict_stage_seconds`."""
+        return self._timed(name) if self.enabled else self._noop
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            samples = metric.samples()
+            lines.append(f"# HELP {metric.name} {metric.doc}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+REQUESTS = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    labels=("route", "method", "status"),
+)
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    labels=("route",),
+)
+BATCH_SIZE = metrics.histogram(
+    "predict_batch_size",
+    "Rows per employee-tower batch, by source (micro-batcher or /predict/batch).",
+    labels=("source",),
+    buckets=SIZE_BUCKETS,
+)
+
+
+def register_service_gauges(service) -> None:
+    """Expose cache and executor state of a RecommendationService at scrape time."""
+    cache, executor = service.embedding_cache, service.executor
+
+    def hit_ratio() -> float:
+        total = cache.hits + cache.misses
+        return cache.hits / total if total else 0.0
+
+    metrics.gauge(
+        "embedding_cache_hits_total",
+        "Embedding LRU cache hits.",
+        lambda: cache.hits,
+        kind="counter",
+    )
+    metrics.gauge(
+        "embedding_cache_misses_total",
+        "Embedding LRU cache misses.",
+        lambda: cache.misses,
+        kind="counter",
+    )
+    metrics.gauge(
+        "embedding_cache_hit_ratio", "Embedding LRU cache hit ratio.", hit_ratio
+    )
+    metrics.gauge(
+        "embedding_cache_size",
+        "Entries in the embedding LRU cache.",
+        lambda: len(cache),
+    )
+    metrics.gauge(
+        "result_cursor_cache_size",
+        "Ranked lists kept for result cursors.",
+        lambda: len(service.result_cache),
+    )
+    responses = service.response_cache
+    if responses is not None:
+        metrics.gauge(
+            "response_cache_hits_total",
+            "Whole-response cache hits of /predict.",
+            lambda: responses.hits,
+            kind="counter",
+        )
+        metrics.gauge(
+            "response_cache_misses_total",
+            "Whole-response cache misses of /predict.",
+            lambda: responses.misses,
+            kind="counter",
+        )
+        metrics.gauge(
+            "response_cache_size",
+            "Entries in the /predict response cache.",
+            lambda: len(responses),
+        )
+    metrics.gauge(
+        "inference_executor_queue_depth",
+        "Inference jobs waiting for a worker thread.",
+        lambda: executor.queue_depth,
+    )
+    metrics.gauge(
+        "inference_executor_pending",
+        "Inference jobs queued or running.",
+        lambda: executor.pending,
+    )
+    metrics.gauge(
+        "project_catalog_size",
+        "Projects currently searchable.",
+        lambda: len(service.live_projects.snapshot)
+        - service.live_projects.snapshot.masked.size,
+    )
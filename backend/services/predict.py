@@ -1,35 +1,340 @@
-import keras
+import asyncio
+import json
+import logging
+import os
+import secrets
+from dataclasses import dataclass
 import numpy as np
-from fastembed import TextEmbedding
-from typing import List, Dict, Tuple, Any
+from fastapi import HTTPException, Request
+from pydantic import TypeAdapter, ValidationError
+from typing import AsyncIterator, Callable, List, Dict, Optional, Tuple, Any
 from schemas.predict import (
+    BatchRecommendationResult,
+    EmployeeRecommendationResult,
     RecommendationRequest,
     SkillMetadata,
     RecommendationWithMetaDataResult,
 )
 from constants import LEVEL_WEIGHT, SKILL_CATEGORIES, skill2idx
-from models.two_tower import Tower, TwoTowerModel, ResidualBlock
-from data.load_projects import load_projects
+from services.topk import merge_top_k_rows, top_k as select_top_k
+from services.backends import load_towers, model_version
+from services.cache import (
+    CachedResponse,
+    DiskEmbeddingStore,
+    DiskResponseCache,
+    LRUCache,
+    MemoryResponseCache,
+    decode_cursor,
+    encode_cursor,
+    normalize_text,
+    text_hash,
+)
+from services.batching import MicroBatcher
+from services.executor import InferenceExecutor
+from services.ann import IVFIndex, load_ann_index
+from services.hybrid import hybrid_query, hybrid_vectors, load_hybrid_index
+from services.employees import (
+    EmployeeIndex,
+    EmployeeIndexNotReady,
+    load_employee_index,
+    user_skill_vector,
+)
+from services.filters import ProjectFilter, ProjectFilterIndex, RatedProjectIndex
+from services.live_index import (
+    DENSE_CANDIDATE_FRACTION,
+    LiveProjectIndex,
+    ProjectIndexSnapshot,
+)
+from services.startup import StartupReport
+from services.metrics import BATCH_SIZE, metrics, register_service_gauges
+from services.project_feed import ProjectChangeFeed, has_changed
+from data.load_projects import ProjectMetadataStore
+from data.load_weights import load_weight_array, save_array_atomic
+from data.quantize import QuantizedMatrix, load_quantized
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = "data/weights/two_tower_model.keras"
+PROJECT_PROFILES_PATH = "data/weights/project_profiles.npy"
+PROJECT_TEXT_EMBS_PATH = "data/weights/project_text_embs.npy"
+PROJECT_TOWER_EMBS_PATH = "data/weights/project_tower_embs.npy"
+
+RESULTS_ADAPTER = TypeAdapter(List[RecommendationWithMetaDataResult])
+
+
+def canonical_request(request: RecommendationRequest) -> str:
+    """
+    Canonical JSON of a request, equal for requests that get the same response.
+
+    Skills are ordered by name, stably because a repeated skill keeps its
+    last entry; required skills are sorted, excluded ids deduplicated and
+    sorted, and the description normalized as it is for embedding.
+    """
+    data = request.model_dump(mode="json")
+    data["skills"] = sorted(data["skills"], key=lambda s: s["skill_name"])
+    data["required_skills"] = sorted(
+        data["required_skills"], key=lambda r: (r["skill_name"], r["min_level"] or "")
+    )
+    data["exclude_project_ids"] = sorted(set(data["exclude_project_ids"]))
+    data["description"] = normalize_text(data["description"])
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def build_response_cache():
+    """The RESPONSE_CACHE_BACKEND response cache, or None when disabled."""
+    ttl = settings.RESPONSE_CACHE_TTL or None
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryResponseCache(settings.RESPONSE_CACHE_SIZE, ttl)
+    if settings.RESPONSE_CACHE_BACKEND == "disk":
+        return DiskResponseCache(
+            settings.RESPONSE_CACHE_PATH, settings.RESPONSE_CACHE_SIZE, ttl
+        )
+    if settings.RESPONSE_CACHE_BACKEND:
+        raise ValueError(
+            f"Unknown RESPONSE_CACHE_BACKEND {settings.RESPONSE_CACHE_BACKEND!r}"
+        )
+    return None
+
+
+def build_project_index(
+    encode_projects: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    project_profiles: np.ndarray,
+    project_text_embs: np.ndarray,
+    output_path: str = PROJECT_TOWER_EMBS_PATH,
+) -> np.ndarray:
+    """
+    Materialize the project-tower output for every project and persist it.
+
+    The matrix is written to a temporary file first and then renamed, so a
+    concurrently starting worker never reads a half-written index.
+    """
+    project_embs = encode_projects(project_profiles, project_text_embs)
+    save_array_atomic(output_path, project_embs)
+    return project_embs
+
+
+def load_project_index(
+    encode_projects: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    project_profiles: np.ndarray,
+    project_text_embs: np.ndarray,
+    index_path: str = PROJECT_TOWER_EMBS_PATH,
+    source_paths: Tuple[str, ...] = (
+        MODEL_PATH,
+        PROJECT_PROFILES_PATH,
+        PROJECT_TEXT_EMBS_PATH,
+    ),
+    precision: str = "float32",
+    mmap: bool = False,
+) -> QuantizedMatrix:
+    """
+    Load the persisted project-tower matrix, rebuilding it when it is missing,
+    older than the model or weights it was derived from, or of the wrong size.
+
+    `precision` and `mmap` are forwarded to `load_quantized`.
+    """
+    if os.path.exists(index_path):
+        index_mtime = os.path.getmtime(index_path)
+        is_stale = any(
+            os.path.exists(p) and os.path.getmtime(p) > index_mtime
+            for p in source_paths
+        )
+        if not is_stale:
+            project_embs = load_quantized(index_path, precision, mmap)
+            if project_embs.shape[0] == project_profiles.shape[0]:
+                return project_embs
+    build_project_index(
+        encode_projects, project_profiles, project_text_embs, index_path
+    )
+    return load_quantized(index_path, precision, mmap)
+
+
+@dataclass
+class ServiceComponents:
+    """
+    The loaded parts a RecommendationService is assembled from.
+
+    `load_components` reads them from the trained model and catalog files;
+    benchmarks and tests build them directly around other data. Everything
+    else the service holds (caches, executor, micro-batcher, live index) is
+    derived from these and the settings by `RecommendationService.__init__`.
+    """
+
+    towers: Any
+    model_version: str
+    project_profiles: np.ndarray
+    project_embs: QuantizedMatrix
+    text_model: Any
+    projects: Any
+    filters: ProjectFilterIndex
+    rated_projects: RatedProjectIndex
+    ann_index: Optional[IVFIndex] = None
+    hybrid_index: Optional[IVFIndex] = None
+    project_feed: Optional[ProjectChangeFeed] = None
+    embedding_store: Optional[DiskEmbeddingStore] = None
+
+
+def load_components(startup: StartupReport) -> ServiceComponents:
+    """Load the model, weights, indexes and catalog, timing each stage in `startup`."""
+    # Load the trained model for inference; the runtime is imported here
+    with startup.stage("load towers"):
+        towers = load_towers(settings.INFERENCE_BACKEND, MODEL_PATH)
+
+    # Mapped read-only so that all workers share one page-cache copy
+    with startup.stage("load weights"):
+        project_profiles = load_weight_array(
+            PROJECT_PROFILES_PATH, settings.WEIGHTS_DTYPE, settings.WEIGHTS_MMAP
+        )
+    with startup.stage("load text model"):
+        from fastembed import TextEmbedding
+
+        text_model = TextEmbedding()
+
+    # The project tower only depends on the catalog, so compute it once,
+    # from the source-precision text embeddings
+    with startup.stage("load project index"):
+        project_embs = load_project_index(
+            towers.encode_projects,
+            project_profiles,
+            load_weight_array(PROJECT_TEXT_EMBS_PATH, dtype=None),
+            source_paths=(
+                *towers.source_paths,
+                PROJECT_PROFILES_PATH,
+                PROJECT_TEXT_EMBS_PATH,
+            ),
+            precision=settings.EMBEDDING_PRECISION,
+            mmap=settings.WEIGHTS_MMAP,
+        )
+
+    project_feed = None
+    if settings.PROJECT_FEED_INTERVAL > 0:
+        if not settings.PROJECT_FEED_DATABASE_URL:
+            raise ValueError(
+                "PROJECT_FEED_INTERVAL is set but PROJECT_FEED_DATABASE_URL "
+                "is empty; point it at the CRUD app's database"
+            )
+        project_feed = ProjectChangeFeed(
+            settings.PROJECT_FEED_DATABASE_URL,
+            full_scan_every=settings.PROJECT_FEED_FULL_SCAN_EVERY,
+        )
+
+    ann_index = None
+    if settings.RETRIEVAL_MODE == "ann":
+        with startup.stage("load ann index"):
+            ann_index = load_ann_index(
+                project_embs,
+                settings.ANN_INDEX_PATH,
+                PROJECT_TOWER_EMBS_PATH,
+                n_lists=settings.ANN_N_LISTS or None,
+                mmap=settings.WEIGHTS_MMAP,
+            )
+
+    hybrid_index = None
+    if settings.RETRIEVAL_MODE == "hybrid":
+        with startup.stage("load hybrid index"):
+            hybrid_index = load_hybrid_index(
+                lambda: hybrid_vectors(
+                    project_profiles,
+                    load_weight_array(PROJECT_TEXT_EMBS_PATH, dtype=None),
+                ),
+                project_profiles.shape[0],
+                settings.HYBRID_INDEX_PATH,
+                (PROJECT_PROFILES_PATH, PROJECT_TEXT_EMBS_PATH),
+                n_lists=settings.ANN_N_LISTS or None,
+                mmap=settings.WEIGHTS_MMAP,
+            )
+
+    with startup.stage("load metadata"):
+        projects = ProjectMetadataStore()
+    with startup.stage("load filter index"):
+        filters = ProjectFilterIndex.from_snapshot(projects.snapshot)
+        rated_projects = RatedProjectIndex.load(
+            projects.file_path, project_profiles.shape[0]
+        )
+
+    return ServiceComponents(
+        towers=towers,
+        model_version=model_version(towers.source_paths),
+        project_profiles=project_profiles,
+        project_embs=project_embs,
+        text_model=text_model,
+        projects=projects,
+        filters=filters,
+        rated_projects=rated_projects,
+        ann_index=ann_index,
+        hybrid_index=hybrid_index,
+        project_feed=project_feed,
+        embedding_store=(
+            DiskEmbeddingStore(settings.EMBEDDING_CACHE_PATH)
+            if settings.EMBEDDING_CACHE_PATH
+            else None
+        ),
+    )
 
 
 class RecommendationService:
-    def __init__(self):
+    def __init__(
+        self,
+        components: Optional[ServiceComponents] = None,
+        batch_max_size: Optional[int] = None,
+    ):
         """
         A service to generate project recommendations using a two-tower neural network model.
 
         This class loads a trained model and preprocessed data to generate personalized
         recommendations for users based on their skills and textual description.
 
+        Parameters:
+        -----------
+        components : ServiceComponents, optional
+            Towers, weights, catalog and indexes to serve. Loaded from the
+            trained model and catalog files by `load_components` when omitted.
+        batch_max_size : int, optional
+            Micro-batch size, overriding BATCH_MAX_SIZE; 1 disables batching.
+
         Attributes:
         -----------
-        model : keras.Model
-            A pre-trained Two-Tower Keras model that computes similarity between user and project vectors.
+        towers : KerasTowers or OnnxTowers
+            Employee and project towers of the trained two-tower model, run through INFERENCE_BACKEND.
         project_profiles : np.ndarray
             Numeric skill profile vectors for each project.
-        project_text_embs : np.ndarray
-            Text embeddings of project descriptions.
+        project_embs : QuantizedMatrix
+            Precomputed project-tower outputs of shape (n_projects, emb_size), stored in EMBEDDING_PRECISION.
+        live_projects : LiveProjectIndex
+            `project_embs` plus rows for projects ingested at runtime from the CRUD database.
+        project_feed : ProjectChangeFeed, optional
+            Poller of the CRUD `projects` table, enabled by PROJECT_FEED_INTERVAL and PROJECT_FEED_DATABASE_URL.
+        ann_index : IVFIndex, optional
+            Approximate index over `project_embs`, built when RETRIEVAL_MODE is "ann".
+        hybrid_index : IVFIndex, optional
+            IVF index over normalized `project_profiles` and text embeddings, the
+            first stage of RETRIEVAL_MODE "hybrid".
+        projects : ProjectMetadataStore
+            Startup-loaded project ids, descriptions and skills aligned with the weight rows.
+        filters : ProjectFilterIndex
+            Skill bitmask and level matrix of every project, for request prefilters.
+        rated_projects : RatedProjectIndex
+            Catalog rows each user rated, for `exclude_rated_by`.
         text_model : fastembed.TextEmbedding
             Embedding model used to convert textual descriptions into vector form.
+        model_version : str
+            Short content hash of the loaded tower files, or MODEL_VERSION when set.
+        startup : StartupReport
+            Time spent in each loading stage, including the lazy imports of fastembed and the tower runtime.
+        embedding_cache : LRUCache
+            Bounded cache of description embeddings keyed on the normalized text hash.
+        embedding_store : DiskEmbeddingStore, optional
+            On-disk second level behind `embedding_cache`, enabled by EMBEDDING_CACHE_PATH.
+        result_cache : LRUCache
+            Ranked lists behind result cursors, expiring after RESULT_CURSOR_TTL seconds.
+        response_cache : MemoryResponseCache or DiskResponseCache, optional
+            Serialized /predict responses per `catalog_version`, chosen by RESPONSE_CACHE_BACKEND.
+        executor : InferenceExecutor
+            Bounded thread pool running all blocking inference off the event loop.
+        user_batcher : MicroBatcher, optional
+            Coalesces concurrent requests into one text-embedding and employee-tower call.
+        employees : EmployeeIndex, optional
+            Precomputed employee-tower embeddings, loaded or built in the background by `start`.
         n_projects : int
             Total number of projects.
 
@@ -41,12 +346,64 @@ class RecommendationService:
         embed_text(text: str) -> np.ndarray
             Convert a text description into a dense vector using the embedding model.
 
+        embed_texts(texts: List[str]) -> np.ndarray
+            Cached batch version of `embed_text`; cache misses go through one `embed` call.
+
+        encode_users(user_num: np.ndarray, user_txt: np.ndarray) -> np.ndarray
+            Run only the employee tower over a batch of user features.
+
+        encode_requests(items: List[Tuple[np.ndarray, str]]) -> List[np.ndarray]
+            Embed descriptions and run the employee tower for a batch of (skill vector, description) pairs.
+
+        search(user_emb: np.ndarray, top_k: int, mode: Optional[str], filters: Optional[ProjectFilter]) -> Tuple[np.ndarray, np.ndarray]
+            Score one employee-tower embedding against the project index ("exact") or the IVF index ("ann"),
+            only over the projects passing `filters`.
+
+        search_hybrid(user_emb: np.ndarray, user_num: np.ndarray, description: str, top_k: int, filters: Optional[ProjectFilter]) -> Tuple[np.ndarray, np.ndarray]
+            Pull a pool of skill/description cosine matches from `hybrid_index` and re-rank it with `user_emb`.
+
+        candidate_mask(index: ProjectIndexSnapshot, filters: ProjectFilter) -> np.ndarray
+            Boolean mask of the rows of `index` a request's prefilter lets through.
+
+        async start() / async stop()
+            Start or stop the background micro-batcher; must run inside the event loop.
+
+        async warm_up() -> None
+            Run one throwaway inference so the first real request does not pay for graph tracing.
+
+        describe() -> Dict[str, Any]
+            Model version, backend, catalog size and warm-up duration for the readiness endpoint.
+
         async recommend(skills: List[Dict[str, Any]], description: str, top_k: int) -> Tuple[List[int], List[float]]
-            Compute similarity scores between the user and all projects, return top K matches.
+            Score the user against the precomputed project index, return top K matches.
 
         async recommend_with_metadata(skills: List[Dict[str, Any]], description: str, top_k: int) -> List[RecommendationWithMetaDataResult]
             Wrapper over `recommend` that adds project metadata and returns full details.
 
+        async recommend_with_cursor(request: RecommendationRequest) -> Tuple[List[RecommendationWithMetaDataResult], Optional[str]]
+            First page of a request's ranking plus a cursor to the next page, kept in `result_cache`.
+
+        result_page(cursor: str, limit: Optional[int]) -> Tuple[List[RecommendationWithMetaDataResult], Optional[str]]
+            A later page of a cached ranking, without recomputation.
+
+        async recommend_response(request: RecommendationRequest) -> Tuple[bytes, Optional[str]]
+            Serialized `recommend_with_cursor` response, served from `response_cache` for repeated requests.
+
+        catalog_version() -> str
+            Model version and catalog state every cached response is tied to.
+
+        search_batch(user_embs: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]
+            Block-wise (B, n_projects) scoring with a per-row top K.
+
+        async recommend_batch(requests: List[RecommendationRequest]) -> AsyncIterator[BatchRecommendationResult]
+            Score many requests with one embedding call and one employee-tower pass, yielding results per request.
+
+        sync_projects() -> int
+            Ingest new or changed CRUD projects into the metadata store and live index.
+
+        async recommend_employees(project_id: Optional[str], skills: List[Dict[str, Any]], description: str, top_k: int) -> List[EmployeeRecommendationResult]
+            Run the project tower once and rank employees against the employee index.
+
         Example:
         --------
         >>> service = RecommendationService()
@@ -57,85 +414,731 @@ class RecommendationService:
             )
         ([3, 5, 0], [0.923, 0.902, 0.876])
         """
-        # Load the trained model for inference
-        model_path = "data/weights/two_tower_model.keras"
-        project_profiles_path = "data/weights/project_profiles.npy"
-        project_text_embs_path = "data/weights/project_text_embs.npy"
+        self.startup = StartupReport()
+        if components is None:
+            components = load_components(self.startup)
+        self.towers = components.towers
+        self.model_version = components.model_version
+        self.project_profiles = components.project_profiles
+        self.project_embs = components.project_embs
+        self.text_model = components.text_model
+        self.projects = components.projects
+        self.filters = components.filters
+        self.rated_projects = components.rated_projects
+        self.ann_index = components.ann_index
+        self.hybrid_index = components.hybrid_index
+        self.project_feed = components.project_feed
+        self.embedding_store = components.embedding_store
+        self.n_projects = self.project_profiles.shape[0]
+        if len(self.projects) != self.n_projects:
+            raise ValueError(
+                f"Project metadata has {len(self.projects)} rows "
+                f"but the weights have {self.n_projects}"
+            )
 
-        self.model = keras.saving.load_model(model_path, compile=False)
+        self.embedding_cache = LRUCache(
+            maxsize=settings.EMBEDDING_CACHE_SIZE,
+            ttl=settings.EMBEDDING_CACHE_TTL or None,
+        )
+        self.result_cache = LRUCache(
+            maxsize=settings.RESULT_CURSOR_CACHE_SIZE,
+            ttl=settings.RESULT_CURSOR_TTL or None,
+        )
+        self.response_cache = build_response_cache()
 
-        self.project_profiles = np.load(project_profiles_path)
-        self.project_text_embs = np.load(project_text_embs_path)
-        self.text_model = TextEmbedding()
-        self.n_projects = self.project_profiles.shape[0]
+        self.executor = InferenceExecutor(
+            max_workers=settings.INFERENCE_WORKERS,
+            max_queue=settings.INFERENCE_QUEUE_DEPTH,
+        )
+        batch_max_size = batch_max_size or settings.BATCH_MAX_SIZE
+        self.user_batcher = (
+            MicroBatcher(
+                self.encode_requests,
+                max_batch=batch_max_size,
+                max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+                executor=self.executor,
+                max_queue=settings.INFERENCE_QUEUE_DEPTH,
+            )
+            if batch_max_size > 1
+            else None
+        )
+        self.live_projects = LiveProjectIndex(self.project_embs)
+
+        register_service_gauges(self)
+
+        self.employees: Optional[EmployeeIndex] = None
+        self._employee_task: Optional[asyncio.Task] = None
+        self._feed_task: Optional[asyncio.Task] = None
 
     def build_user_vector(self, skills: List[Dict[str, Any]]) -> np.ndarray:
         """Convert skill dicts into a numeric feature vector."""
-        vec = np.zeros(len(SKILL_CATEGORIES), dtype=float)
-        for s in skills:
-            name = s["skill_name"]
-            level = s["level"]
-            months = s["months"]
-            if name not in skill2idx or level not in LEVEL_WEIGHT:
-                raise ValueError(f"Invalid skill entry: {s}")
-            vec[skill2idx[name]] = months * LEVEL_WEIGHT[level]
-        return vec
+        with metrics.stage("build_user_vector"):
+            vec = np.zeros(len(SKILL_CATEGORIES), dtype=float)
+            for s in skills:
+                name = s["skill_name"]
+                level = s["level"]
+                months = s["months"]
+                if name not in skill2idx or level not in LEVEL_WEIGHT:
+                    raise ValueError(f"Invalid skill entry: {s}")
+                vec[skill2idx[name]] = months * LEVEL_WEIGHT[level]
+            return vec
 
     def embed_text(self, text: str) -> np.ndarray:
         """Generate a text embedding vector."""
-        emb_gen = self.text_model.embed([text])
-        return np.vstack(list(emb_gen))[0]
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts, serving repeats from the embedding caches."""
+        with metrics.stage("embed_text"):
+            normalized = [normalize_text(t) for t in texts]
+            keys = [text_hash(t) for t in normalized]
+            vectors: Dict[str, np.ndarray] = {}
+            for key in keys:
+                if key in vectors:
+                    continue
+                vec = self.embedding_cache.get(key)
+                if vec is None and self.embedding_store is not None:
+                    vec = self.embedding_store.get(key)
+                    if vec is not None:
+                        self.embedding_cache.set(key, vec)
+                if vec is not None:
+                    vectors[key] = vec
+
+            missing = {k: t for k, t in zip(keys, normalized) if k not in vectors}
+            if missing:
+                embedded = self.text_model.embed(list(missing.values()))
+                for key, vec in zip(missing.keys(), embedded):
+                    vec = np.asarray(vec, dtype=np.float32)
+                    vec.setflags(write=False)
+                    vectors[key] = vec
+                    self.embedding_cache.set(key, vec)
+                    if self.embedding_store is not None:
+                        self.embedding_store.set(key, vec)
+            return np.vstack([vectors[k] for k in keys])
+
+    def encode_users(self, user_num: np.ndarray, user_txt: np.ndarray) -> np.ndarray:
+        """Run the employee tower over (B, n_skills) and (B, text_dim) inputs."""
+        with metrics.stage("employee_tower"):
+            return self.towers.encode_users(user_num, user_txt)
+
+    def encode_projects(self, num: np.ndarray, txt: np.ndarray) -> np.ndarray:
+        """Run the project tower over (B, n_skills) and (B, text_dim) inputs."""
+        with metrics.stage("project_tower"):
+            return self.towers.encode_projects(num, txt)
+
+    def encode_requests(self, items: List[Tuple[np.ndarray, str]]) -> List[np.ndarray]:
+        """Return one employee-tower embedding per (skill vector, description) pair."""
+        metrics.observe(BATCH_SIZE, len(items), "micro_batch")
+        user_num = np.vstack([num for num, _ in items])
+        user_txt = self.embed_texts([text for _, text in items])
+        return list(self.encode_users(user_num, user_txt))
+
+    async def start(self) -> None:
+        """Start background workers; call from the running event loop."""
+        if self.user_batcher is not None:
+            await self.user_batcher.start()
+        if settings.EMPLOYEE_INDEX_ENABLED:
+            self._employee_task = asyncio.create_task(self.load_employees())
+        if self.project_feed is not None:
+            self._feed_task = asyncio.create_task(self.follow_project_feed())
+
+    async def stop(self) -> None:
+        if self.user_batcher is not None:
+            await self.user_batcher.stop()
+        for task in (self._employee_task, self._feed_task):
+            if task is not None:
+                task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def load_employees(self) -> None:
+        """Load (or build and persist) the employee index without blocking startup."""
+
+        def embed(texts: List[str]) -> np.ndarray:
+            # Bypass the request cache; every description is seen exactly once
+            return np.vstack(list(self.text_model.embed(texts)))
+
+        try:
+            # Runs on its own thread so a long build never occupies inference slots
+            self.employees = await asyncio.to_thread(
+                load_employee_index,
+                self.projects.file_path,
+                self.towers.source_paths,
+                embed,
+                self.encode_users,
+                self.project_embs.shape[1],
+                settings.WEIGHTS_DTYPE,
+                settings.WEIGHTS_MMAP,
+            )
+            logger.info("Employee index ready with %d employees", len(self.employees))
+        except Exception:
+            logger.exception("Failed to load the employee index")
+
+    async def follow_project_feed(self) -> None:
+        """Poll the CRUD database forever, ingesting project changes as they appear."""
+        while True:
+            try:
+                ingested = await asyncio.to_thread(self.sync_projects)
+                if ingested:
+                    logger.info("Ingested %d new or changed projects", ingested)
+            except Exception:
+                logger.exception("Project feed poll failed")
+            await asyncio.sleep(settings.PROJECT_FEED_INTERVAL)
+
+    def sync_projects(self) -> int:
+        """
+        Pull new and changed projects from the CRUD database into the live index.
+
+        For each batch from the feed, the skill vector and description
+        embedding go through the project tower, then the metadata rows are
+        published before the index rows so that any row a reader finds in the
+        index is already resolvable. Changed projects get a new row and their
+        old row is masked out of search results.
+
+        A project whose skills do not validate is logged and skipped, and a
+        batch that fails to embed is logged and dropped; the feed has already
+        moved past both, and the next full scan retries them.
+        """
+        ingested = 0
+        for batch in self.project_feed.poll():
+            catalog = self.projects.snapshot
+            changed, replaces, rows = [], [], []
+            for record in batch:
+                try:
+                    skills = [SkillMetadata(**s) for s in record.skills]
+                except ValidationError as e:
+                    logger.warning(
+                        "Skipping project %s with invalid skills: %s",
+                        record.external_id,
+                        e,
+                    )
+                    continue
+                row = catalog.index_of(record.external_id)
+                if row is None:
+                    description = record.description
+                else:
+                    _, description, old_skills = catalog.row(row)
+                    if not has_changed(
+                        record, description, [s.model_dump() for s in old_skills]
+                    ):
+                        continue
+                    description = record.description or description
+                changed.append(record)
+                replaces.append(-1 if row is None else row)
+                rows.append((record.external_id, description, skills))
+            if not changed:
+                continue
+
+            try:
+                num = np.vstack([user_skill_vector(r.skills) for r in changed])
+                txt = np.vstack(list(self.text_model.embed([d for _, d, _ in rows])))
+                embs = self.encode_projects(num, txt)
+            except Exception:
+                logger.exception("Failed to embed %d projects", len(changed))
+                continue
+            # Filters and metadata before the index rows, as readers expect
+            self.filters = self.filters.extend([skills for _, _, skills in rows])
+            self.projects.append(rows)
+            self.live_projects.upsert(embs, np.array(replaces, dtype=np.int64))
+            ingested += len(changed)
+        return ingested
+
+    async def encode_user(self, skills: List[Dict[str, Any]], description: str):
+        """Employee-tower embedding for one request, batched with concurrent ones."""
+        item = (self.build_user_vector(skills), description)
+        if self.user_batcher is not None and self.user_batcher.running:
+            return await self.user_batcher.submit(item)
+        return (await self.executor.run(self.encode_requests, [item]))[0]
 
     async def recommend(
-        self, skills: List[Dict[str, Any]], description: str, top_k: int = 5
+        self,
+        skills: List[Dict[str, Any]],
+        description: str,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        filters: Optional[ProjectFilter] = None,
     ) -> Tuple[List[int], List[float]]:
         """Return top-K project indices and match scores."""
-        user_num = self.build_user_vector(skills)
-        user_txt = self.embed_text(description)
-        num_tile = np.tile(user_num, (self.n_projects, 1))
-        txt_tile = np.tile(user_txt, (self.n_projects, 1))
-
-        # For inference, compile=False model can still run predict
-        preds = self.model.predict(
-            [num_tile, txt_tile, self.project_profiles, self.project_text_embs],
-            verbose=0,
-        ).flatten()
-        idxs = np.argsort(preds)[-top_k:][::-1]
-        return idxs.tolist(), preds[idxs].tolist()
+        user_emb = await self.encode_user(skills, description)
+        if (mode or settings.RETRIEVAL_MODE) == "hybrid":
+            idxs, scores = await self.executor.run(
+                self.search_hybrid,
+                user_emb,
+                self.build_user_vector(skills),
+                description,
+                top_k,
+                filters,
+            )
+        else:
+            idxs, scores = await self.executor.run(
+                self.search, user_emb, top_k, mode, filters
+            )
+        return idxs.tolist(), scores.tolist()
+
+    def search(
+        self,
+        user_emb: np.ndarray,
+        top_k: int,
+        mode: Optional[str] = None,
+        filters: Optional[ProjectFilter] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the top-K project rows and scores for one user embedding.
+
+        With `filters`, only the projects passing them are scored. A selective
+        filter is served by exact scoring of the survivors even in "ann" mode,
+        which is cheaper than probing IVF lists and discarding most hits.
+        """
+        mode = mode or settings.RETRIEVAL_MODE
+        index = self.live_projects.snapshot
+        keep = self.candidate_mask(index, filters) if filters is not None else None
+        share = 1.0 if keep is None else np.count_nonzero(keep) / max(1, keep.size)
+        if mode == "ann" and share > DENSE_CANDIDATE_FRACTION:
+            if self.ann_index is None:
+                raise ValueError("ANN retrieval requested but no ANN index is loaded")
+            # The IVF index covers the base rows; runtime rows are scanned exactly.
+            # Over-fetch by the share of rows the filter removes
+            fetch = int(np.ceil(top_k / share)) + index.masked.size
+            with metrics.stage("ann_search"):
+                idxs, scores = self.ann_index.search(
+                    user_emb, fetch, nprobe=settings.ANN_NPROBE
+                )
+            ok = keep[idxs] if keep is not None else ~np.isin(idxs, index.masked)
+            idxs, scores = idxs[ok][:top_k], scores[ok][:top_k]
+            if keep is not None and idxs.size < top_k:
+                # The probed lists held too few survivors; fall back to exact
+                idxs, scores = index.search(user_emb, top_k, keep)
+            else:
+                idxs, scores = self.merge_delta(
+                    index, user_emb, top_k, idxs, scores, keep
+                )
+        else:
+            # The model's Dot layer reduces to one GEMV against the project index
+            idxs, scores = index.search(user_emb, top_k, keep)
+        finite = np.isfinite(scores)
+        return idxs[finite], scores[finite]
+
+    def search_hybrid(
+        self,
+        user_emb: np.ndarray,
+        user_num: np.ndarray,
+        description: str,
+        top_k: int,
+        filters: Optional[ProjectFilter] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Two-stage retrieval: a pool of HYBRID_POOL_SIZE projects by the
+        dataset generator's score (HYBRID_ALPHA x skill cosine + the rest x
+        description cosine), re-ranked by the two-tower score.
+
+        The pool comes from an IVF index over the normalized profiles and
+        text embeddings, so the work per request grows with the pool and
+        ANN_NPROBE rather than with the catalog. Projects ingested at runtime
+        are not in that index and are scored exactly, as in "ann" mode.
+        Selective filters, and pools left with fewer than `top_k` survivors,
+        are served by exact scoring instead.
+        """
+        if self.hybrid_index is None:
+            raise ValueError("Hybrid retrieval requested but no hybrid index is loaded")
+        index = self.live_projects.snapshot
+        keep = self.candidate_mask(index, filters) if filters is not None else None
+        share = 1.0 if keep is None else np.count_nonzero(keep) / max(1, keep.size)
+        if share <= DENSE_CANDIDATE_FRACTION:
+            idxs, scores = index.search(user_emb, top_k, keep)
+        else:
+            pool_size = max(settings.HYBRID_POOL_SIZE, top_k)
+            with metrics.stage("hybrid_retrieve"):
+                # The description embedding is a cache hit after `encode_user`
+                query = hybrid_query(user_num, self.embed_text(description))
+                pool, _ = self.hybrid_index.search(
+                    query,
+                    int(np.ceil(pool_size / share)) + index.masked.size,
+                    nprobe=settings.ANN_NPROBE,
+                )
+            ok = keep[pool] if keep is not None else ~np.isin(pool, index.masked)
+            pool = np.sort(pool[ok][:pool_size])
+            if keep is not None and pool.size < top_k:
+                idxs, scores = index.search(user_emb, top_k, keep)
+            else:
+                with metrics.stage("rerank"):
+                    best, scores = select_top_k(index.base[pool] @ user_emb, top_k)
+                idxs, scores = self.merge_delta(
+                    index, user_emb, top_k, pool[best], scores, keep
+                )
+        finite = np.isfinite(scores)
+        return idxs[finite], scores[finite]
+
+    @staticmethod
+    def merge_delta(
+        index: ProjectIndexSnapshot,
+        user_emb: np.ndarray,
+        top_k: int,
+        idxs: np.ndarray,
+        scores: np.ndarray,
+        keep: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge a top-K over the base rows with the exact top-K of the runtime rows."""
+        if not index.delta.shape[0]:
+            return idxs, scores
+        delta = index.search_delta(user_emb, top_k, keep)
+        best = merge_top_k_rows(
+            (idxs[np.newaxis], scores[np.newaxis]),
+            tuple(a[np.newaxis] for a in delta),
+            top_k,
+        )
+        return best[0][0], best[1][0]
+
+    def candidate_mask(
+        self, index: ProjectIndexSnapshot, filters: ProjectFilter
+    ) -> np.ndarray:
+        """
+        Boolean mask over the rows of `index` that pass a request's prefilter.
+
+        The filter index and metadata are taken after `index`; both are
+        published before the index rows, so they cover every row of it.
+        """
+        with metrics.stage("prefilter"):
+            keep = self.filters.mask(filters.required)[: len(index)]
+            keep[index.masked] = False
+            catalog = self.projects.snapshot
+            excluded_ids = list(filters.exclude_project_ids)
+            if filters.exclude_rated_by is not None:
+                rated = self.rated_projects.rows(filters.exclude_rated_by)
+                keep[rated[rated < keep.size]] = False
+                if len(catalog) > self.rated_projects.n_projects:
+                    # Projects edited at runtime moved to a new row; follow them by id
+                    excluded_ids.extend(catalog.row(r)[0] for r in rated.tolist())
+                if self.project_feed is not None:
+                    excluded_ids.extend(
+                        self.project_feed.rated_project_ids(filters.exclude_rated_by)
+                    )
+            for project_id in excluded_ids:
+                row = catalog.index_of(project_id)
+                if row is not None and row < keep.size:
+                    keep[row] = False
+            return keep
+
+    def refresh_metadata(self) -> None:
+        """Reload changed project metadata, and the filter index built from it."""
+        if self.projects.refresh():
+            self.filters = ProjectFilterIndex.from_snapshot(self.projects.snapshot)
+
+    def search_batch(
+        self, user_embs: np.ndarray, top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (B, top_k) project rows and scores for a batch of user embeddings."""
+        with metrics.stage("score_batch"):
+            return self.live_projects.snapshot.search_batch(user_embs, top_k)
 
     async def recommend_with_metadata(
         self,
         skills: List[Dict[str, Any]],
         description: str,
         top_k: int = 5,
+        filters: Optional[ProjectFilter] = None,
     ) -> List[RecommendationRequest]:
         """Wraps recommend and returns enriched metadata as Pydantic models."""
-        training_data_dict = await load_projects()
-        idx2proj = {
-            i: pid for i, pid in enumerate(training_data_dict["projects"].keys())
-        }
-        top_idxs, scores = await self.recommend(skills, description, top_k=top_k)
-        enriched: List[RecommendationRequest] = []
-        for rank, (idx, score) in enumerate(zip(top_idxs, scores), start=1):
-            pid = idx2proj[idx]
-            project_data = training_data_dict["projects"].get(pid, {})
-            skill_objs = [
-                SkillMetadata(
-                    skill_name=s.get("skill_name", "Unknown"),
-                    level=s.get("level", "Unknown"),
-                    months=s.get("months", 0),
+        if self.projects.refresh_due():
+            await self.executor.run(self.refresh_metadata)
+        top_idxs, scores = await self.recommend(
+            skills, description, top_k=top_k, filters=filters
+        )
+        # Taken after scoring: metadata is published before index rows
+        catalog = self.projects.snapshot
+        return self.enrich(catalog, top_idxs, scores)
+
+    async def recommend_with_cursor(
+        self, request: RecommendationRequest
+    ) -> Tuple[List[RecommendationWithMetaDataResult], Optional[str]]:
+        """
+        `recommend_with_metadata` for one request, plus a cursor to its next page.
+
+        The ranking is computed RESULT_CURSOR_DEPTH deep and kept in
+        `result_cache` together with the catalog snapshot it was ranked
+        against, so `result_page` serves the next pages by slicing it. Only
+        the returned page is enriched. The cache key is the request hash plus
+        a random suffix, so a cursor never moves to a list recomputed later
+        for the same request. The cursor is None when cursors are disabled,
+        when `top_k` already reaches RESULT_CURSOR_DEPTH, or when nothing is
+        left.
+        """
+        skills = [s.model_dump() for s in request.skills]
+        filters = ProjectFilter.from_request(request)
+        if (
+            settings.RESULT_CURSOR_TTL <= 0
+            or request.top_k >= settings.RESULT_CURSOR_DEPTH
+        ):
+            results = await self.recommend_with_metadata(
+                skills, request.description, top_k=request.top_k, filters=filters
+            )
+            return results, None
+        if self.projects.refresh_due():
+            await self.executor.run(self.refresh_metadata)
+        top_idxs, scores = await self.recommend(
+            skills,
+            request.description,
+            top_k=settings.RESULT_CURSOR_DEPTH,
+            filters=filters,
+        )
+        # Taken after scoring: metadata is published before index rows
+        catalog = self.projects.snapshot
+        page = self.enrich(catalog, top_idxs[: request.top_k], scores[: request.top_k])
+        if len(top_idxs) <= request.top_k:
+            return page, None
+        request_hash = text_hash(self.model_version + canonical_request(request))
+        key = f"{request_hash}-{secrets.token_hex(4)}"
+        self.result_cache.set(
+            key,
+            (
+                catalog,
+                np.asarray(top_idxs, dtype=np.int64),
+                np.asarray(scores, dtype=np.float32),
+            ),
+        )
+        return page, encode_cursor(key, request.top_k, request.top_k)
+
+    def catalog_version(self) -> str:
+        """
+        Model version plus catalog state: the metadata file's mtime and the
+        live index's row and masked counts. Workers that ingested the same
+        changes report the same version.
+        """
+        index = self.live_projects.snapshot
+        return (
+            f"{self.model_version}-{self.projects.snapshot.mtime}"
+            f"-{len(index)}-{index.masked.size}"
+        )
+
+    async def response_cache_call(self, method: str, *args):
+        """
+        `response_cache.<method>(*args)`, in a worker thread for the disk
+        backend so its SQLite I/O does not block the event loop.
+        """
+        call = getattr(self.response_cache, method)
+        if isinstance(self.response_cache, DiskResponseCache):
+            return await asyncio.to_thread(call, *args)
+        return call(*args)
+
+    async def recommend_response(
+        self, request: RecommendationRequest
+    ) -> CachedResponse:
+        """
+        Serialized `recommend_with_cursor` results for one request, and its cursor.
+
+        Responses are cached under `canonical_request` for the current
+        `catalog_version`, so identical requests skip embedding and scoring
+        until the model or catalog changes. Requests excluding a user's rated
+        projects are not cached while the project feed runs, since new
+        ratings do not change the version. A cached cursor is only returned
+        while this worker still holds its ranked list.
+        """
+        if self.projects.refresh_due():
+            await self.executor.run(self.refresh_metadata)
+        cacheable = self.response_cache is not None and not (
+            request.exclude_rated_by is not None and self.project_feed is not None
+        )
+        if cacheable:
+            version = self.catalog_version()
+            key = text_hash(canonical_request(request))
+            hit = await self.response_cache_call("get", version, key)
+            if hit is not None:
+                body, cursor = hit
+                if (
+                    cursor is not None
+                    and self.result_cache.get(decode_cursor(cursor)[0]) is None
+                ):
+                    cursor = None
+                return body, cursor
+        results, cursor = await self.recommend_with_cursor(request)
+        body = RESULTS_ADAPTER.dump_json(results)
+        if cacheable:
+            await self.response_cache_call("set", version, key, (body, cursor))
+        return body, cursor
+
+    def result_page(
+        self, cursor: str, limit: Optional[int] = None
+    ) -> Tuple[List[RecommendationWithMetaDataResult], Optional[str]]:
+        """
+        The page of a cached ranking a cursor points to, and the cursor after it.
+
+        Pages hold `limit` results, or as many as the first page did. Raises
+        ValueError for a malformed cursor and KeyError once it has expired.
+        """
+        key, offset, size = decode_cursor(cursor)
+        entry = self.result_cache.get(key)
+        if entry is None:
+            raise KeyError("Result cursor expired or unknown")
+        catalog, top_idxs, scores = entry
+        stop = offset + (limit or size)
+        page = self.enrich(
+            catalog,
+            top_idxs[offset:stop].tolist(),
+            scores[offset:stop].tolist(),
+            start_rank=offset + 1,
+        )
+        return page, (
+            encode_cursor(key, stop, limit or size) if stop < len(top_idxs) else None
+        )
+
+    def enrich(
+        self,
+        catalog,
+        top_idxs: List[int],
+        scores: List[float],
+        start_rank: int = 1,
+    ) -> List[RecommendationWithMetaDataResult]:
+        """Join ranked catalog rows with their project metadata."""
+        with metrics.stage("enrich"):
+            enriched: List[RecommendationWithMetaDataResult] = []
+            ranked = [(i, s) for i, s in zip(top_idxs, scores) if np.isfinite(s)]
+            for rank, (idx, score) in enumerate(ranked, start=start_rank):
+                pid, project_description, skill_objs = catalog.row(idx)
+                enriched.append(
+                    RecommendationWithMetaDataResult(
+                        rank=rank,
+                        project_id=pid,
+                        score=score,
+                        description=project_description,
+                        required_skills=skill_objs,
+                    )
                 )
-                for s in project_data.get("skills", [])
+            return enriched
+
+    def encode_project(
+        self, project_id: Optional[str], skills: List[Dict[str, Any]], description: str
+    ) -> np.ndarray:
+        """Project-tower embedding of a catalog project or of an ad-hoc project."""
+        if project_id is not None:
+            row = self.projects.snapshot.index_of(project_id)
+            if row is None:
+                raise KeyError(f"Unknown project_id: {project_id}")
+            return self.live_projects.snapshot.row(row)
+        num = self.build_user_vector(skills)[np.newaxis]
+        txt = self.embed_texts([description])
+        return self.encode_projects(num, txt)[0]
+
+    async def recommend_employees(
+        self,
+        project_id: Optional[str],
+        skills: List[Dict[str, Any]],
+        description: str,
+        top_k: int = 5,
+    ) -> List[EmployeeRecommendationResult]:
+        """Return the top-K employees for a project, best match first."""
+        employees = self.employees
+        if employees is None:
+            raise EmployeeIndexNotReady("Employee index is not loaded yet")
+        project_emb = await self.executor.run(
+            self.encode_project, project_id, skills, description
+        )
+        idxs, scores = await self.executor.run(employees.search, project_emb, top_k)
+        return [
+            EmployeeRecommendationResult(
+                rank=rank, employee_id=str(employees.employee_ids[idx]), score=score
+            )
+            for rank, (idx, score) in enumerate(
+                zip(idxs.tolist(), scores.tolist()), start=1
+            )
+        ]
+
+    def encode_batch(self, requests: List[RecommendationRequest]) -> np.ndarray:
+        """Employee-tower embeddings for a list of requests in one pass."""
+        metrics.observe(BATCH_SIZE, len(requests), "batch_endpoint")
+        user_num = np.vstack(
+            [
+                self.build_user_vector([s.model_dump() for s in r.skills])
+                for r in requests
             ]
+        )
+        user_txt = self.embed_texts([r.description for r in requests])
+        return self.encode_users(user_num, user_txt)
 
-            enriched.append(
-                RecommendationWithMetaDataResult(
-                    rank=rank,
-                    project_id=pid,
-                    score=score,
-                    description=project_data.get("description", ""),
-                    required_skills=skill_objs,
+    async def recommend_batch(
+        self, requests: List[RecommendationRequest], rows_per_block: int = 256
+    ) -> AsyncIterator[BatchRecommendationResult]:
+        """
+        Yield enriched recommendations for many requests, in request order.
+
+        All descriptions are embedded and pushed through the employee tower in
+        one executor task; scoring then proceeds `rows_per_block` requests at a
+        time so results can be streamed while later blocks are still scored.
+        Requests with a prefilter have their own candidate set and are scored
+        one by one with `search`.
+        """
+        if not requests:
+            return
+        if self.projects.refresh_due():
+            await self.executor.run(self.refresh_metadata)
+        filters = [ProjectFilter.from_request(r) for r in requests]
+        user_embs = await self.executor.run(self.encode_batch, requests)
+        for start in range(0, len(requests), rows_per_block):
+            block = requests[start : start + rows_per_block]
+            embs = user_embs[start : start + len(block)]
+            plain = [row for row in range(len(block)) if filters[start + row] is None]
+            if plain:
+                k = max(block[row].top_k for row in plain)
+                idxs, scores = await self.executor.run(
+                    self.search_batch, embs[plain], k
                 )
+                batch_results = dict(zip(plain, zip(idxs, scores)))
+            for row, request in enumerate(block):
+                if filters[start + row] is None:
+                    top_idxs, top_scores = batch_results[row]
+                else:
+                    top_idxs, top_scores = await self.executor.run(
+                        self.search,
+                        embs[row],
+                        request.top_k,
+                        "exact",
+                        filters[start + row],
+                    )
+                # Taken after scoring: metadata is published before index rows
+                catalog = self.projects.snapshot
+                yield BatchRecommendationResult(
+                    index=start + row,
+                    results=self.enrich(
+                        catalog,
+                        top_idxs[: request.top_k].tolist(),
+                        top_scores[: request.top_k].tolist(),
+                    ),
+                )
+
+    def describe(self) -> Dict[str, Any]:
+        """Model and catalog state reported by the readiness endpoint."""
+        index = self.live_projects.snapshot
+        return {
+            "model_version": self.model_version,
+            "backend": self.towers.name,
+            "embedding_precision": settings.EMBEDDING_PRECISION,
+            "retrieval_mode": settings.RETRIEVAL_MODE,
+            "catalog_size": len(index) - index.masked.size,
+            "employee_index_loaded": self.employees is not None,
+            "warm_up_seconds": round(self.startup.stages.get("warm up", 0.0), 4),
+        }
+
+    async def warm_up(self) -> None:
+        """Run a dummy recommendation so lazy model initialisation happens at boot."""
+        with self.startup.stage("warm up"):
+            await self.recommend(
+                skills=[
+                    {"skill_name": SKILL_CATEGORIES[0], "level": "Basic", "months": 1}
+                ],
+                description="warm up",
+                top_k=1,
             )
 
-        return enriched
+
+def get_recommendation_service(request: Request) -> RecommendationService:
+    """
+    FastAPI dependency returning the process-wide service built at startup.
+
+    The service loads in the background after the app starts accepting
+    connections; until it is ready, requests get a 503 with Retry-After.
+    """
+    service = request.app.state.recommendation_service
+    if service is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model is still loading, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return service
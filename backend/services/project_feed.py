@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+@dataclass
+class ProjectRecord:
+    id: int
+    external_id: str
+    description: str
+    skills: List[Dict[str, Any]]
+
+
+def skill_key(skills: List[Dict[str, Any]]) -> Tuple[Tuple[str, str, int], ...]:
+    """Order-independent representation of a skill list for change detection."""
+    return tuple(
+        sorted((s["skill_name"], s["level"], int(s["months"])) for s in skills)
+    )
+
+
+def has_changed(
+    record: ProjectRecord, description: str, skills: List[Dict[str, Any]]
+) -> bool:
+    """
+    True when a CRUD row differs from the metadata the index was built from.
+
+    Rows created before the `description` column existed have an empty
+    description; only their skills are compared.
+    """
+    if record.description and record.description != description:
+        return True
+    return skill_key(record.skills) != skill_key(skills)
+
+
+class ProjectChangeFeed:
+    """
+    Polls the CRUD pod's `projects` table for new and changed projects.
+
+    New projects are found with an id watermark, so a regular poll only reads
+    rows inserted since the previous one. Every `full_scan_every` polls the
+    watermark is reset and the whole table is read again, which is how edits
+    to existing rows are picked up.
+
+    The same connection serves `rated_project_ids`, which the prefilter of
+    `/predict` uses to exclude projects a user rated through the CRUD pod.
+
+    Parameters:
+    -----------
+    database_url : str
+        SQLAlchemy URL of the CRUD database.
+    batch_size : int
+        Maximum number of projects read per query.
+    full_scan_every : int
+        Re-read the whole table every N polls; 0 only follows new rows.
+    """
+
+    def __init__(
+        self, database_url: str, batch_size: int = 500, full_scan_every: int = 20
+    ):
+        # Imported here so that the inference pod only loads SQLAlchemy when
+        # the feed is enabled, and off the import path of the app
+        from sqlalchemy import create_engine
+
+        connect_args = (
+            {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+        )
+        self.engine: "Engine" = create_engine(database_url, connect_args=connect_args)
+        self.batch_size = batch_size
+        self.full_scan_every = full_scan_every
+        self.watermark = 0
+        self.polls = 0
+        self._has_description: Optional[bool] = None
+
+    def _description_column(self) -> str:
+        if self._has_description is None:
+            from sqlalchemy import inspect
+
+            columns = {c["name"] for c in inspect(self.engine).get_columns("projects")}
+            self._has_description = "description" in columns
+        return "p.description" if self._has_description else "''"
+
+    def fetch_since(self, watermark: int) -> List[ProjectRecord]:
+        """Read up to `batch_size` projects with id greater than `watermark`."""
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT p.id, p.external_id, {self._description_column()} "
+                    "FROM projects p WHERE p.id > :watermark "
+                    "ORDER BY p.id LIMIT :limit"
+                ),
+                {"watermark": watermark, "limit": self.batch_size},
+            ).fetchall()
+            if not rows:
+                return []
+            records = {r[0]: ProjectRecord(r[0], r[1], r[2] or "", []) for r in rows}
+            skills = conn.execute(
+                text(
+                    "SELECT ps.project_id, s.name, s.level, s.months "
+                    "FROM project_skill ps JOIN skills s ON s.id = ps.skill_id "
+                    "WHERE ps.project_id BETWEEN :lo AND :hi"
+                ),
+                {"lo": rows[0][0], "hi": rows[-1][0]},
+            ).fetchall()
+        for project_id, name, level, months in skills:
+            if project_id in records:
+                records[project_id].skills.append(
+                    {"skill_name": name, "level": level, "months": months or 0}
+                )
+        return list(records.values())
+
+    def rated_project_ids(self, user_id: str) -> List[str]:
+        """External ids of the projects `user_id` rated through the CRUD pod."""
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT DISTINCT project_id FROM interactions "
+                    "WHERE user_id = :user_id"
+                ),
+                {"user_id": user_id},
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def poll(self) -> Iterator[List[ProjectRecord]]:
+        """
+        Yield batches of projects past the watermark, advancing it as it goes.
+
+        The watermark moves past a batch before it is yielded, so a consumer
+        that fails on a batch does not get stuck on it: the next poll carries
+        on after it, and the next full scan reads it again.
+        """
+        if self.full_scan_every and self.polls % self.full_scan_every == 0:
+            self.watermark = 0
+        self.polls += 1
+        while True:
+            batch = self.fetch_since(self.watermark)
+            if not batch:
+                return
+            self.watermark = batch[-1].id
+            yield batch
@@ -0,0 +1,103 @@
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\S+)")
+
+
+class StartupReport:
+    """
+    Wall-clock duration of each startup stage of the inference pod.
+
+    Heavy modules (fastembed, the tower runtime) are imported inside the
+    stage that first needs them, so this also serves as the per-import
+    breakdown of what the service itself loads. Imports of the app modules
+    are covered by `python -m services.startup`.
+
+    Example:
+    --------
+    >>> report = StartupReport()
+    >>> with report.stage("load text model"):
+    ...     text_model = TextEmbedding()
+    >>> report.as_dict()
+    {'stages': {'load text model': 0.41}, 'total_seconds': 0.41}
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "stages": {name: round(s, 4) for name, s in self.stages.items()},
+            "total_seconds": round(self.total, 4),
+        }
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name} {s:.2f}s" for name, s in self.stages.items())
+        return f"startup {self.total:.2f}s ({parts})"
+
+
+def import_times(module: str) -> List[Tuple[str, float, float]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime`.
+
+    Returns:
+    --------
+    List[Tuple[str, float, float]]
+        (module name, self seconds, cumulative seconds) for every import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, name = match.groups()
+            rows.append((name, int(own) / 1e6, int(cumulative) / 1e6))
+    return rows
+
+
+def main():
+    """
+    Per-package import-time report of an app module.
+
+    Usage, from the backend directory:
+        python -m services.startup [module] [n]
+    """
+    module = sys.argv[1] if len(sys.argv) > 1 else "inference_app"
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = import_times(module)
+
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, own, _ in rows:
+        by_package[name.split(".")[0]] += own
+    total = sum(by_package.values())
+
+    print(f"import {module}: {total:.3f}s")
+    for package, seconds in sorted(by_package.items(), key=lambda kv: -kv[1])[:n]:
+        print(f"{seconds:8.3f}s {100 * seconds / total:5.1f}%  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import heapq
+import numpy as np
+from typing import Iterable, List, Tuple
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k highest scores without sorting the whole array.
+
+    `np.argpartition` isolates the winners in O(n), after which only those k
+    entries are sorted, so the cost is O(n + k log k) instead of O(n log n).
+
+    Parameters:
+    -----------
+    scores : np.ndarray
+        One-dimensional array of scores.
+    k : int
+        Number of entries to keep. Clamped to the length of `scores`.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Indices into `scores` and the matching values, highest score first.
+    """
+    n = scores.shape[0]
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.int64), scores[:0]
+    if k < n:
+        candidates = np.argpartition(scores, n - k)[n - k :]
+    else:
+        candidates = np.arange(n)
+    order = np.argsort(scores[candidates], kind="stable")[::-1]
+    idxs = candidates[order]
+    return idxs, scores[idxs]
+
+
+def top_k_streaming(
+    chunks: Iterable[Tuple[int, np.ndarray]], k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k highest scores from a stream of score chunks.
+
+    Each chunk is reduced to its own top k with `top_k`, and the survivors are
+    merged into a bounded min-heap. Only one chunk and k candidates are held in
+    memory at a time, so the full score vector never has to be materialized.
+
+    Parameters:
+    -----------
+    chunks : Iterable[Tuple[int, np.ndarray]]
+        Pairs of (offset, scores) where `offset` is the global index of the
+        first entry in the chunk.
+    k : int
+        Number of entries to keep.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Global indices and their scores, highest score first.
+    """
+    heap: List[Tuple[float, int]] = []
+    if k > 0:
+        for offset, chunk in chunks:
+            idxs, vals = top_k(chunk, k)
+            for idx, val in zip(idxs.tolist(), vals.tolist()):
+                if len(heap) < k:
+                    heapq.heappush(heap, (val, offset + idx))
+                elif val > heap[0][0]:
+                    heapq.heapreplace(heap, (val, offset + idx))
+                else:
+                    # Chunk winners are sorted, so nothing later can enter the heap
+                    break
+    heap.sort(reverse=True)
+    idxs = np.array([i for _, i in heap], dtype=np.int64)
+    vals = np.array([v for v, _ in heap], dtype=np.float32)
+    return idxs, vals
+
+
+def top_k_rows(
+    scores: np.ndarray, k: int, offset: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise `top_k` over a (B, n) score matrix.
+
+    Parameters:
+    -----------
+    scores : np.ndarray
+        Score matrix with one row per query.
+    k : int
+        Number of entries to keep per row. Clamped to `n`.
+    offset : int
+        Added to the returned column indices, for matrices that cover a slice
+        of the catalog.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (B, k) global indices and scores, each row sorted highest first.
+    """
+    n = scores.shape[1]
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64), scores[:, :0]
+    if k < n:
+        candidates = np.argpartition(scores, n - k, axis=1)[:, n - k :]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    vals = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(vals, axis=1, kind="stable")[:, ::-1]
+    idxs = np.take_along_axis(candidates, order, axis=1)
+    return idxs + offset, np.take_along_axis(vals, order, axis=1)
+
+
+def merge_top_k_rows(
+    a: Tuple[np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray], k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge two row-wise top-K results (indices, scores) into one."""
+    idxs = np.concatenate([a[0], b[0]], axis=1)
+    vals = np.concatenate([a[1], b[1]], axis=1)
+    pos, vals = top_k_rows(vals, k)
+    return np.take_along_axis(idxs, pos, axis=1), vals
@@ -22,6 +22,102 @@ class AppSettings(BaseSettings):
     QDRANT_URL: str = os.getenv("QDRANT_URL", "")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
 
+    # Prometheus metrics at /metrics; when disabled nothing is recorded
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Reported by /readyz; empty derives it from the model files
+    MODEL_VERSION: str = os.getenv("MODEL_VERSION", "")
+
+    # Load and warm up the model after the app starts serving; /readyz reports
+    # when it is done. Set to false to block startup until the model is ready
+    WARM_UP_IN_BACKGROUND: bool = (
+        os.getenv("WARM_UP_IN_BACKGROUND", "true").lower() == "true"
+    )
+
+    # Tower runtime: "keras", "onnx" (graphs from `python -m models.onnx_export`;
+    # onnxruntime thread counts of 0 keep its defaults) or "numpy" (folded
+    # weights from `python -m models.numpy_tower`)
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "keras")
+    ONNX_MODEL_DIR: str = os.getenv("ONNX_MODEL_DIR", "data/weights")
+    ONNX_INTRA_OP_THREADS: int = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+    ONNX_INTER_OP_THREADS: int = int(os.getenv("ONNX_INTER_OP_THREADS", "0"))
+
+    # Inference weight storage: mmap shares pages across workers,
+    # float16 halves the footprint of the project matrices
+    WEIGHTS_MMAP: bool = os.getenv("WEIGHTS_MMAP", "true").lower() == "true"
+    WEIGHTS_DTYPE: str = os.getenv("WEIGHTS_DTYPE", "float32")
+    # Storage of the project-tower outputs scanned per request: "float32",
+    # "float16" or "int8" (per-row scale). Text embeddings are only read at
+    # startup, to build the indexes, and stay in their file's precision
+    EMBEDDING_PRECISION: str = os.getenv(
+        "EMBEDDING_PRECISION", os.getenv("WEIGHTS_DTYPE", "float32")
+    )
+
+    # Description embedding cache (TTL in seconds, 0 disables expiry;
+    # an empty path disables the on-disk store)
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+    EMBEDDING_CACHE_TTL: float = float(os.getenv("EMBEDDING_CACHE_TTL", "0"))
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")
+
+    # Ranked lists behind /predict result cursors, kept for paging without
+    # recomputation (a TTL of 0 disables cursors). Requests with a top_k of at
+    # least the depth get a single page and no cursor
+    RESULT_CURSOR_TTL: float = float(os.getenv("RESULT_CURSOR_TTL", "300"))
+    RESULT_CURSOR_CACHE_SIZE: int = int(os.getenv("RESULT_CURSOR_CACHE_SIZE", "4096"))
+    RESULT_CURSOR_DEPTH: int = int(os.getenv("RESULT_CURSOR_DEPTH", "100"))
+
+    # Whole /predict responses keyed on the canonical request: "memory" (per
+    # worker), "disk" (a SQLite file shared by the workers) or "" to disable
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_PATH: str = os.getenv(
+        "RESPONSE_CACHE_PATH", "data/response_cache.db"
+    )
+
+    # Micro-batching of concurrent /predict requests (max size 1 disables it)
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "32"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "2"))
+
+    # Inference thread pool; requests beyond workers + queue depth get a 503
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "2"))
+    INFERENCE_QUEUE_DEPTH: int = int(os.getenv("INFERENCE_QUEUE_DEPTH", "64"))
+
+    # Project retrieval: "exact" scans every project, "ann" probes an IVF index,
+    # "hybrid" re-ranks a pool of skill/description cosine matches with the towers
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "exact")
+    ANN_INDEX_PATH: str = os.getenv("ANN_INDEX_PATH", "data/weights/project_ann")
+    ANN_N_LISTS: int = int(os.getenv("ANN_N_LISTS", "0"))  # 0 = sqrt(n_projects)
+    ANN_NPROBE: int = int(os.getenv("ANN_NPROBE", "8"))
+    HYBRID_INDEX_PATH: str = os.getenv(
+        "HYBRID_INDEX_PATH", "data/weights/project_hybrid_ann"
+    )
+    HYBRID_POOL_SIZE: int = int(os.getenv("HYBRID_POOL_SIZE", "200"))
+
+    # Follow projects created through the CRUD pod (interval in seconds, 0
+    # disables). The URL must point at the database the CRUD app writes to:
+    # in docker-compose the two apps run in separate containers, so this needs
+    # a shared volume for sql_app.db or a shared database server. There is no
+    # default URL; a positive interval without one fails startup
+    PROJECT_FEED_INTERVAL: float = float(os.getenv("PROJECT_FEED_INTERVAL", "0"))
+    PROJECT_FEED_DATABASE_URL: str = os.getenv("PROJECT_FEED_DATABASE_URL", "")
+    PROJECT_FEED_FULL_SCAN_EVERY: int = int(
+        os.getenv("PROJECT_FEED_FULL_SCAN_EVERY", "20")
+    )
+
+    # Build/load the employee-tower index used by /predict/employees
+    EMPLOYEE_INDEX_ENABLED: bool = (
+        os.getenv("EMPLOYEE_INDEX_ENABLED", "true").lower() == "true"
+    )
+
+    # Largest top_k accepted by /predict, /predict/batch and /predict/employees
+    MAX_TOP_K: int = int(os.getenv("MAX_TOP_K", "1000"))
+
+    # Upper bound on requests accepted by /predict/batch
+    PREDICT_BATCH_MAX_REQUESTS: int = int(
+        os.getenv("PREDICT_BATCH_MAX_REQUESTS", "10000")
+    )
+
 
 # Exporting for use
-settings = AppSettings()
\ No newline at end of file
+settings = AppSettings()
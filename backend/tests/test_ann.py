@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from services.ann import ExactIndex, IVFIndex, load_ann_index, recall_at_k
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(0)
+    centres = rng.normal(scale=4, size=(16, 8))
+    points = centres[rng.integers(0, 16, 2000)] + rng.normal(size=(2000, 8))
+    return points.astype(np.float32)
+
+
+def test_build_lays_out_every_vector_once(vectors):
+    index = IVFIndex.build(vectors, n_lists=16)
+    assert len(index) == len(vectors) and index.n_lists == 16
+    assert index.list_offsets[0] == 0 and index.list_offsets[-1] == len(vectors)
+    assert sorted(index.ids.tolist()) == list(range(len(vectors)))
+    np.testing.assert_array_equal(index.vectors, vectors[index.ids])
+
+
+def test_probing_every_list_is_exact(vectors):
+    index = IVFIndex.build(vectors, n_lists=16)
+    exact = ExactIndex(vectors)
+    query = vectors[3]
+    idxs, vals = index.search(query, 10, nprobe=16)
+    expected_idxs, expected_vals = exact.search(query, 10)
+    np.testing.assert_array_equal(idxs, expected_idxs)
+    np.testing.assert_allclose(vals, expected_vals, rtol=1e-5)
+
+
+def test_recall_grows_with_nprobe(vectors):
+    index = IVFIndex.build(vectors, n_lists=32)
+    exact = ExactIndex(vectors)
+    queries = vectors[::50] + 0.1
+    low = recall_at_k(index, exact, queries, 10, nprobe=1)
+    high = recall_at_k(index, exact, queries, 10, nprobe=8)
+    assert low <= high and high >= 0.9
+
+
+def test_save_load_round_trip(vectors, tmp_path):
+    index = IVFIndex.build(vectors, n_lists=8)
+    path = str(tmp_path / "ivf")
+    index.save(path)
+    index.save(path)  # replacing an existing index
+    loaded = IVFIndex.load(path)
+    assert isinstance(loaded.vectors, np.memmap)
+    for name in ("centroids", "list_offsets", "ids", "vectors"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name))
+    assert sorted(os.listdir(tmp_path)) == ["ivf"]
+
+
+def test_load_ann_index_rebuilds_when_source_changes(vectors, tmp_path):
+    source = tmp_path / "embs.npy"
+    np.save(source, vectors)
+    path = str(tmp_path / "ivf")
+    assert len(load_ann_index(vectors, path, str(source), n_lists=8)) == len(vectors)
+
+    # Same mtime but a different row count still triggers a rebuild
+    grown = np.vstack([vectors, vectors[:5]])
+    assert len(load_ann_index(grown, path, str(source), n_lists=8)) == len(grown)
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.batching import MicroBatcher
+from services.executor import ExecutorOverloaded, InferenceExecutor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_results_follow_submission_order():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [2 * x for x in items]
+
+    async def main():
+        batcher = MicroBatcher(double, max_batch=4, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        finally:
+            await batcher.stop()
+
+    assert run(main()) == [2 * i for i in range(10)]
+    assert [len(c) for c in calls] == [4, 4, 2]
+
+
+def test_batches_run_concurrently_up_to_max_in_flight():
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def slow(items):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return items
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            batcher = MicroBatcher(
+                slow, max_batch=2, max_wait_ms=1, executor=pool, max_in_flight=3
+            )
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(12)))
+            finally:
+                await batcher.stop()
+
+    assert run(main()) == list(range(12))
+    assert peak[0] == 3
+
+
+def test_max_in_flight_defaults_to_executor_workers():
+    executor = InferenceExecutor(max_workers=3)
+    try:
+        assert MicroBatcher(list, executor=executor).max_in_flight == 3
+    finally:
+        executor.shutdown()
+    assert MicroBatcher(list).max_in_flight == 1
+
+
+def test_batch_error_reaches_every_caller_and_batcher_keeps_running():
+    def flaky(items):
+        if "bad" in items:
+            raise ValueError("bad batch")
+        return items
+
+    async def main():
+        batcher = MicroBatcher(flaky, max_batch=2, max_wait_ms=20)
+        await batcher.start()
+        try:
+            failed = await asyncio.gather(
+                batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True
+            )
+            return failed, await batcher.submit("again")
+        finally:
+            await batcher.stop()
+
+    failed, again = run(main())
+    assert all(isinstance(e, ValueError) for e in failed)
+    assert again == "again"
+
+
+def test_full_queue_raises_overloaded():
+    release = threading.Event()
+
+    def blocked(items):
+        release.wait(5)
+        return items
+
+    async def main():
+        batcher = MicroBatcher(
+            blocked, max_batch=1, max_wait_ms=0, max_queue=1, max_in_flight=1
+        )
+        await batcher.start()
+        try:
+            first = asyncio.ensure_future(batcher.submit(0))
+            await asyncio.sleep(0.05)  # picked up, now running
+            second = asyncio.ensure_future(batcher.submit(1))
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorOverloaded):
+                await batcher.submit(2)
+            release.set()
+            return await asyncio.gather(first, second)
+        finally:
+            release.set()
+            await batcher.stop()
+
+    assert run(main()) == [0, 1]
+
+
+def test_submit_requires_start_and_survives_restart():
+    async def main():
+        batcher = MicroBatcher(lambda items: items, max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            await batcher.submit(1)
+        await batcher.start()
+        assert await batcher.submit(1) == 1
+        await batcher.stop()
+        assert not batcher.running
+        await batcher.start()
+        try:
+            return await batcher.submit(2)
+        finally:
+            await batcher.stop()
+
+    assert run(main()) == 2
@@ -0,0 +1,73 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from benchmarks.stats import summarize, write_report
+from benchmarks.synthetic import (
+    SyntheticMetadata,
+    generate_catalog,
+    random_request,
+    synthetic_service,
+)
+from constants import LEVEL_WEIGHT
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    return generate_catalog(300, str(tmp_path_factory.mktemp("catalog")))
+
+
+def test_summarize_percentiles():
+    stats = summarize([0.001] * 99 + [0.101])
+    assert stats["n"] == 100
+    assert stats["p50_ms"] == 1.0 and stats["max_ms"] == 101.0
+    assert stats["throughput_per_s"] == round(100 / 0.2, 2)
+    assert summarize([0.5, 0.5], wall_seconds=0.5)["throughput_per_s"] == 4.0
+    assert summarize([]) == {"n": 0}
+
+
+def test_write_report(tmp_path):
+    path = tmp_path / "out" / "report.json"
+    report = write_report(str(path), "micro", {"n": 1}, {"stage": {"n": 0}})
+    assert path.exists() and report["benchmark"] == "micro"
+    assert set(report["environment"]) >= {"python", "numpy", "git_commit"}
+
+
+def test_generated_catalog_is_reused(catalog):
+    profiles = np.load(catalog.profiles_path)
+    levels = np.load(catalog.levels_path)
+    assert profiles.shape[0] == levels.shape[0] == 300
+    assert np.array_equal(profiles > 0, levels >= 0)
+    again = generate_catalog(300, catalog.out_dir, seed=1)
+    np.testing.assert_array_equal(np.load(again.profiles_path), profiles)
+
+
+def test_synthetic_metadata_reads_rows_back(catalog):
+    profiles = np.load(catalog.profiles_path)
+    metadata = SyntheticMetadata(profiles, np.load(catalog.levels_path))
+    pid, description, skills = metadata.row(12)
+    assert pid == "project_12" and description
+    assert len(skills) == np.count_nonzero(profiles[12])
+    for s in skills:
+        assert 1 <= s.months <= 60 and s.level in LEVEL_WEIGHT
+    assert metadata.index_of("project_12") == 12
+    assert metadata.index_of("project_300") is None
+    assert metadata.index_of("other_1") is None
+
+
+def test_synthetic_service_matches_exact_scoring(catalog):
+    service = synthetic_service(catalog, batch_max_size=1)
+    try:
+        request = random_request(np.random.default_rng(0), top_k=7)
+        idxs, scores = asyncio.run(
+            service.recommend(request["skills"], request["description"], top_k=7)
+        )
+        user_emb = service.encode_requests(
+            [(service.build_user_vector(request["skills"]), request["description"])]
+        )[0]
+        expected = np.argsort(-(np.load(catalog.tower_embs_path) @ user_emb))[:7]
+        assert idxs == expected.tolist()
+        assert scores == sorted(scores, reverse=True)
+    finally:
+        service.executor.shutdown()
@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+import pytest
+
+from services import cache
+from services.cache import (
+    DiskEmbeddingStore,
+    DiskResponseCache,
+    LRUCache,
+    MemoryResponseCache,
+    body_etag,
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+    normalize_text,
+    text_hash,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_normalize_text_is_whitespace_and_unicode_insensitive():
+    composed = normalize_text("  Café\n backend\tdev ")
+    assert composed == "Café backend dev"
+    assert normalize_text("Café backend dev") == composed
+    assert text_hash(composed) == text_hash(normalize_text("Café  backend dev"))
+    assert text_hash(composed) != text_hash("café backend dev")
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 3,
+        "misses": 1,
+        "hit_ratio": 0.75,
+    }
+
+
+def test_lru_ttl_expires_entries(clock):
+    lru = LRUCache(maxsize=4, ttl=10)
+    lru.set("a", 1)
+    clock[0] += 9
+    assert lru.get("a") == 1
+    clock[0] += 2
+    assert lru.get("a") is None
+    assert len(lru) == 0
+
+
+def test_lru_disabled_with_zero_maxsize():
+    lru = LRUCache(maxsize=0)
+    lru.set("a", 1)
+    assert lru.get("a") is None and len(lru) == 0
+
+
+def test_lru_is_thread_safe():
+    lru = LRUCache(maxsize=50)
+
+    def worker(offset):
+        for i in range(2000):
+            lru.set((offset, i % 100), i)
+            lru.get((offset, (i * 7) % 100))
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(lru) == 50
+    assert lru.hits + lru.misses == 4 * 2000
+
+
+def test_disk_embedding_store_persists_float32(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    vector = np.array([0.5, -1.25, 3.0], dtype=np.float64)
+    DiskEmbeddingStore(path).set("k", vector)
+
+    reopened = DiskEmbeddingStore(path)
+    loaded = reopened.get("k")
+    assert loaded.dtype == np.float32
+    np.testing.assert_array_equal(loaded, vector)
+    assert reopened.get("missing") is None
+
+    reopened.set("k", np.zeros(3))
+    np.testing.assert_array_equal(reopened.get("k"), 0)
+
+
+def test_disk_embedding_store_connection_per_thread(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path / "emb.sqlite"))
+    store.set("main", np.ones(2))
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(store.get("main")))
+    thread.start()
+    thread.join()
+    np.testing.assert_array_equal(seen[0], 1)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("abc.def-12", 20, 10)
+    assert decode_cursor(cursor) == ("abc.def-12", 20, 10)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "abc", "abc.1", ".0.5", "k.-1.5", "k.0.0", "k.x.5"]
+)
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_etags():
+    etag = body_etag(b"[]")
+    assert etag.startswith('"') and etag.endswith('"') and etag != body_etag(b"[ ]")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('"other"', etag)
+
+
+@pytest.fixture(params=["memory", "disk"])
+def response_cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryResponseCache(maxsize=8, ttl=60)
+    return DiskResponseCache(str(tmp_path / "responses.sqlite"), maxsize=8, ttl=60)
+
+
+def test_response_cache_is_scoped_to_the_catalog_version(response_cache):
+    assert response_cache.get("v1", "k") is None
+    response_cache.set("v1", "k", (b"body", "cursor"))
+    assert response_cache.get("v1", "k") == (b"body", "cursor")
+
+    # A new version drops the old entries, and late writes for it are ignored
+    assert response_cache.get("v2", "k") is None
+    response_cache.set("v1", "late", (b"stale", None))
+    assert response_cache.get("v2", "late") is None
+    assert len(response_cache) == 0
+    assert (response_cache.hits, response_cache.misses) == (1, 3)
+
+
+def test_response_cache_ttl(response_cache, clock):
+    response_cache.get("v1", "k")
+    response_cache.set("v1", "k", (b"body", None))
+    clock[0] += 59
+    assert response_cache.get("v1", "k") == (b"body", None)
+    clock[0] += 2
+    assert response_cache.get("v1", "k") is None
+
+
+def test_disk_response_cache_is_shared_and_trimmed(tmp_path, monkeypatch, clock):
+    path = str(tmp_path / "responses.sqlite")
+    monkeypatch.setattr(DiskResponseCache, "TRIM_EVERY", 1)
+    writer, reader = DiskResponseCache(path, maxsize=2), DiskResponseCache(path)
+    writer.get("v1", "probe")
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        writer.set("v1", key, (key.encode(), None))
+    assert len(writer) == 2
+    assert reader.get("v1", "a") is None
+    assert reader.get("v1", "c") == (b"c", None)
@@ -0,0 +1,105 @@
+import json
+
+import numpy as np
+import pytest
+
+from data.catalog import MANIFEST_FILE, ColumnarCatalog, write_catalog
+from data.load_projects import build_snapshot, load_interactions, load_user_records
+
+TRAINING_DATA = {
+    "users": {
+        "u1": {
+            "description": "Data engineer, café owner",
+            "skills": [{"skill_name": "Python", "level": "Professional", "months": 36}],
+        },
+        "u2": {"description": "", "skills": []},
+    },
+    "projects": {
+        "p1": {
+            "description": "ETL pipelines",
+            "skills": [
+                {"skill_name": "SQL", "level": "Basic", "months": 6},
+                {"skill_name": "Python", "level": "Other", "months": 12},
+            ],
+            "interactions": [
+                {"user_id": "u1", "rating": 4.5},
+                {"user_id": "ghost", "rating": 1.0},
+            ],
+        },
+        "p2": {"description": "日本語の説明", "skills": [], "interactions": []},
+    },
+}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    json_path = tmp_path / "training_data.json"
+    json_path.write_text(json.dumps(TRAINING_DATA), encoding="utf-8")
+    return json_path, write_catalog(TRAINING_DATA, tmp_path / "catalog")
+
+
+def test_catalog_round_trips_projects_and_users(paths):
+    _, catalog_dir = paths
+    catalog = ColumnarCatalog(str(catalog_dir))
+    assert catalog.n_projects == 2
+    assert list(catalog.project_ids) == ["p1", "p2"]
+    assert catalog.description("project", 1) == "日本語の説明"
+    assert catalog.skills("project", 0) == TRAINING_DATA["projects"]["p1"]["skills"]
+    assert catalog.skills("project", 1) == []
+    users = dict(catalog.iter_users())
+    assert users["u1"] == TRAINING_DATA["users"]["u1"]
+    # Users only seen in interactions get an id row after the real users
+    assert catalog.n_users == 2 and "ghost" not in users
+    assert str(catalog.user_ids[catalog.n_users]) == "ghost"
+
+
+def test_catalog_interactions(paths):
+    _, catalog_dir = paths
+    catalog = ColumnarCatalog(str(catalog_dir))
+    user_rows, ratings = catalog.project_interactions(0)
+    assert [str(catalog.user_ids[r]) for r in user_rows] == ["u1", "ghost"]
+    np.testing.assert_allclose(ratings, [4.5, 1.0])
+    assert catalog.project_interactions(1)[0].size == 0
+
+
+def test_catalog_and_json_snapshots_agree(paths):
+    json_path, catalog_dir = paths
+    from_json = build_snapshot(str(json_path))
+    from_catalog = build_snapshot(str(catalog_dir))
+    assert len(from_json) == len(from_catalog) == 2
+    for i in range(2):
+        assert from_json.row(i) == from_catalog.row(i)
+    assert from_catalog.index_of("p2") == 1
+    assert from_catalog.index_of("missing") is None
+
+
+def test_catalog_and_json_interactions_and_users_agree(paths):
+    json_path, catalog_dir = paths
+    for path in (json_path, catalog_dir):
+        project_rows, user_rows, user_ids = load_interactions(str(path))
+        assert project_rows.tolist() == [0, 0]
+        assert [str(user_ids[r]) for r in user_rows] == ["u1", "ghost"]
+    from_json = dict(load_user_records(str(json_path)))
+    from_catalog = dict(load_user_records(str(catalog_dir)))
+    assert from_catalog["u1"] == from_json["u1"]
+
+
+def test_unknown_format_version_is_rejected(paths):
+    _, catalog_dir = paths
+    manifest_path = catalog_dir / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["format_version"] = 999
+    manifest_path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        ColumnarCatalog(str(catalog_dir))
+
+
+def test_rewriting_a_catalog_replaces_it(paths, tmp_path):
+    _, catalog_dir = paths
+    smaller = {"users": {}, "projects": {"p9": {"description": "x", "skills": []}}}
+    write_catalog(smaller, catalog_dir)
+    assert list(ColumnarCatalog(str(catalog_dir)).project_ids) == ["p9"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "catalog",
+        "training_data.json",
+    ]
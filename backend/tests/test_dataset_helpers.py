@@ -0,0 +1,198 @@
+import asyncio
+import json
+import math
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pandas as pd
+import pytest
+
+from dataset_generation import helpers
+from dataset_generation.helpers import (
+    SkillList,
+    dedupe_skills,
+    extract_csv,
+    job_record,
+    job_text,
+    read_checkpoint,
+    recognize_skills,
+    write_outputs,
+)
+
+REQUEST = httpx.Request("POST", "https://llm.invalid/v1/chat/completions")
+PYTHON = {"skill_name": "Python", "level": "Basic", "months": 6}
+
+
+def connection_error():
+    return openai.APIConnectionError(request=REQUEST)
+
+
+def bad_request():
+    return openai.BadRequestError(
+        "bad request", response=httpx.Response(400, request=REQUEST), body=None
+    )
+
+
+class FakeClient:
+    """Answers `beta.chat.completions.parse` from a function of the user text."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.texts = []
+        self.in_flight = self.peak = 0
+        self.beta = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(parse=self.parse))
+        )
+
+    async def parse(self, messages, response_format, **_):
+        text = messages[-1]["content"]
+        self.texts.append(text)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            result = self.answer(text)
+        finally:
+            self.in_flight -= 1
+        if isinstance(result, Exception):
+            raise result
+        parsed = None if result is None else response_format(skills=result)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))]
+        )
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(helpers, "RETRY_BASE_DELAY", 0.0)
+
+
+def recognize(client, **kwargs):
+    return asyncio.run(recognize_skills(client, "model", "text", **kwargs))
+
+
+def test_dedupe_skills_keeps_first_occurrence():
+    other = {"skill_name": "Git", "level": "Basic", "months": 6}
+    assert dedupe_skills([PYTHON, other, dict(PYTHON)]) == [PYTHON, other]
+
+
+def test_transient_errors_are_retried():
+    failures = [connection_error(), connection_error()]
+    client = FakeClient(lambda _: failures.pop() if failures else [PYTHON])
+    assert recognize(client) == [PYTHON]
+    assert len(client.texts) == 3
+
+
+def test_errors_are_raised_after_the_last_retry():
+    client = FakeClient(lambda _: connection_error())
+    with pytest.raises(openai.APIConnectionError):
+        recognize(client, max_retries=2)
+    assert len(client.texts) == 3
+
+
+def test_other_api_errors_are_raised_at_once():
+    client = FakeClient(lambda _: bad_request())
+    with pytest.raises(openai.BadRequestError):
+        recognize(client)
+    assert len(client.texts) == 1
+
+
+def test_unparsed_response_means_no_skills():
+    assert recognize(FakeClient(lambda _: None)) == []
+
+
+def test_read_checkpoint_drops_a_partial_last_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    assert read_checkpoint(str(path)) == set()
+    path.write_text('{"row": 0}\n{"row": 3, "key": "k"}\n{"row": 5, "ke')
+    assert read_checkpoint(str(path)) == {0, 3}
+    assert path.read_text() == '{"row": 0}\n{"row": 3, "key": "k"}\n'
+    # Complete files are left alone
+    assert read_checkpoint(str(path)) == {0, 3}
+    assert path.read_text().count("\n") == 2
+
+
+@pytest.fixture
+def jobs_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    pd.DataFrame(
+        {
+            "jobtitle": [f"job{i}" for i in range(7)],
+            "jobdescription": [f"desc{i}" for i in range(7)],
+            "experience": ["2 years", None, "1 year", "", "3 years", "5 years", None],
+        }
+    ).to_csv(path, index=False)
+    return str(path)
+
+
+def run_jobs(client, jobs_csv, out, **kwargs):
+    asyncio.run(
+        extract_csv(
+            client,
+            "model",
+            jobs_csv,
+            job_text,
+            job_record,
+            str(out),
+            max_tokens=10,
+            chunk_rows=3,
+            **kwargs,
+        )
+    )
+
+
+def answer_jobs(text):
+    if text.startswith("job2:"):
+        return bad_request()
+    if text.startswith("job4:"):
+        return []
+    return [PYTHON, PYTHON]
+
+
+def test_extract_csv_records_rows_and_resumes_failures(jobs_csv, tmp_path):
+    out = tmp_path / "jobs.jsonl"
+    client = FakeClient(answer_jobs)
+    run_jobs(client, jobs_csv, out, concurrency=2)
+    assert client.peak <= 2
+    # The failed row is left for the next run; the skill-less row is recorded
+    assert read_checkpoint(str(out)) == {0, 1, 3, 4, 5, 6}
+    records = {r["row"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert "key" not in records[4]
+    assert records[0]["parsed"]["skills"] == [PYTHON]
+    assert math.isnan(records[1]["data"]["experience"])
+
+    retry = FakeClient(lambda _: [PYTHON])
+    run_jobs(retry, jobs_csv, out)
+    assert retry.texts == ["job2: desc2"]
+    assert read_checkpoint(str(out)) == set(range(7))
+
+    paths = [str(tmp_path / f"{name}.json") for name in ("parsed", "data", "map")]
+    write_outputs(str(out), *paths)
+    parsed = json.loads(open(paths[0]).read())
+    mapping = json.loads(open(paths[2]).read())
+    assert [list(p) for p in parsed] == [
+        ["project_1"],
+        ["project_2"],
+        ["project_3"],
+        ["project_4"],
+        ["project_6"],
+        ["project_7"],
+    ]
+    assert mapping["3"] == {
+        "parsed_index": 2,
+        "data_index": 2,
+        "parsed_key": "project_3",
+    }
+
+
+def test_extract_csv_honours_max_records(jobs_csv, tmp_path):
+    out = tmp_path / "jobs.jsonl"
+    client = FakeClient(lambda _: [PYTHON])
+    run_jobs(client, jobs_csv, out, max_records=4)
+    assert read_checkpoint(str(out)) == {0, 1, 2, 3}
+
+
+def test_skill_list_rejects_unknown_skills():
+    with pytest.raises(ValueError):
+        SkillList(skills=[{"skill_name": "COBOL", "level": "Basic", "months": 1}])
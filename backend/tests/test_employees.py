@@ -0,0 +1,108 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from constants import LEVEL_WEIGHT, skill2idx
+from services.employees import (
+    EMPLOYEE_IDS_PATH,
+    EMPLOYEE_TOWER_EMBS_PATH,
+    EmployeeIndex,
+    load_employee_index,
+    user_skill_vector,
+)
+
+SKILL = next(iter(skill2idx))
+LEVEL = next(iter(LEVEL_WEIGHT))
+EMB_SIZE = 4
+
+
+def embed(texts):
+    return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def encode_users(num, txt):
+    rng = np.random.default_rng(int(num.sum() + txt.sum()))
+    return rng.normal(size=(len(num), EMB_SIZE)).astype(np.float32)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.dirname(EMPLOYEE_TOWER_EMBS_PATH))
+    users = {
+        f"u{i}": {
+            "description": "x" * i,
+            "skills": [{"skill_name": SKILL, "level": LEVEL, "months": i}],
+        }
+        for i in range(5)
+    }
+    with open("training_data.json", "w") as f:
+        json.dump({"users": users, "projects": {}}, f)
+    model = tmp_path / "model.keras"
+    model.write_bytes(b"v1")
+    return tmp_path
+
+
+def test_user_skill_vector_skips_unknown_entries():
+    vec = user_skill_vector(
+        [
+            {"skill_name": SKILL, "level": LEVEL, "months": 10},
+            {"skill_name": "Not a skill", "level": LEVEL, "months": 10},
+            {"skill_name": SKILL, "level": "Wizard", "months": 10},
+        ]
+    )
+    assert vec[skill2idx[SKILL]] == 10 * LEVEL_WEIGHT[LEVEL]
+    assert np.count_nonzero(vec) == 1
+
+
+def test_search_matches_dense_scores_and_streams_large_indexes():
+    embs = np.random.default_rng(0).normal(size=(50, EMB_SIZE)).astype(np.float32)
+    index = EmployeeIndex(np.array([f"u{i}" for i in range(50)]), embs)
+    query = np.ones(EMB_SIZE, dtype=np.float32)
+    expected = np.argsort(-(embs @ query), kind="stable")[:7]
+    np.testing.assert_array_equal(index.search(query, 7)[0], expected)
+    np.testing.assert_array_equal(index.search(query, 7, block_size=8)[0], expected)
+
+
+def test_build_persists_and_loads_back(workdir):
+    users = [(f"u{i}", {"description": "d", "skills": []}) for i in range(3)]
+    built = EmployeeIndex.build(users, embed, encode_users, EMB_SIZE)
+    loaded = EmployeeIndex.load()
+    assert list(loaded.employee_ids) == ["u0", "u1", "u2"]
+    np.testing.assert_array_equal(loaded.embs, built.embs)
+
+
+def test_empty_index_keeps_its_width(workdir):
+    index = EmployeeIndex.build([], embed, encode_users, EMB_SIZE)
+    assert index.embs.shape == (0, EMB_SIZE) and index.embs.dtype == np.float32
+    idxs, vals = EmployeeIndex.load().search(np.ones(EMB_SIZE, np.float32), 5)
+    assert idxs.size == 0 and vals.size == 0
+
+
+def test_load_employee_index_rebuilds_only_when_stale(workdir):
+    model_paths = (str(workdir / "model.keras"),)
+    calls = []
+
+    def counting_encode(num, txt):
+        calls.append(len(num))
+        return encode_users(num, txt)
+
+    def load():
+        return load_employee_index(
+            "training_data.json", model_paths, embed, counting_encode, EMB_SIZE
+        )
+
+    assert len(load()) == 5 and calls == [5]
+    load()
+    assert calls == [5]
+
+    # A model file newer than the persisted index makes it stale
+    stale = os.path.getmtime(model_paths[0]) - 10
+    os.utime(EMPLOYEE_IDS_PATH, (stale, stale))
+    load()
+    assert calls == [5, 5]
+    assert EmployeeIndex.is_fresh(model_paths)
+    os.remove(EMPLOYEE_TOWER_EMBS_PATH)
+    assert not EmployeeIndex.is_fresh(model_paths)
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.executor import ExecutorOverloaded, InferenceExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_submit_beyond_workers_and_queue_is_rejected(executor):
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+    queued = executor.submit(lambda: "queued")
+    assert executor.pending == 2 and executor.queue_depth == 1
+    with pytest.raises(ExecutorOverloaded):
+        executor.submit(lambda: "rejected")
+    release.set()
+    assert running.result(5) is True and queued.result(5) == "queued"
+
+
+def test_slots_are_released_after_completion_and_errors(executor):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        executor.submit(fail).result(5)
+    for i in range(5):
+        assert executor.submit(lambda x: x * 2, i).result(5) == 2 * i
+    # Slots are freed by a done-callback that may run just after result()
+    deadline = time.monotonic() + 5
+    while executor.pending and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert executor.pending == 0
+
+
+def test_run_awaits_the_result(executor):
+    async def main():
+        return await asyncio.gather(*(executor.run(pow, 2, n) for n in range(2)))
+
+    assert asyncio.run(main()) == [1, 2]
@@ -0,0 +1,139 @@
+import json
+
+import numpy as np
+import pytest
+
+from constants import LEVEL_WEIGHT, SKILL_CATEGORIES, skill2idx
+from data.catalog import write_catalog
+from data.load_projects import build_snapshot
+from schemas.predict import RecommendationRequest, SkillMetadata
+from services.filters import (
+    LEVEL_RANK,
+    ProjectFilter,
+    ProjectFilterIndex,
+    RatedProjectIndex,
+)
+
+LEVELS = list(LEVEL_WEIGHT)
+
+
+def random_projects(n, seed=0):
+    rng = np.random.default_rng(seed)
+    projects = {}
+    for i in range(n):
+        skills = [
+            {
+                "skill_name": SKILL_CATEGORIES[rng.integers(len(SKILL_CATEGORIES))],
+                "level": LEVELS[rng.integers(len(LEVELS))],
+                "months": 1,
+            }
+            for _ in range(rng.integers(0, 4))
+        ]
+        # Skills outside SKILL_CATEGORIES are ignored by the filters
+        if i % 7 == 0:
+            skills.append({"skill_name": "COBOL", "level": "Basic", "months": 1})
+        projects[f"p{i}"] = {"description": "", "skills": skills, "interactions": []}
+    return projects
+
+
+def reference_mask(projects, required):
+    keep = []
+    for project in projects.values():
+        best = {}
+        for s in project["skills"]:
+            if s["skill_name"] in skill2idx:
+                j = skill2idx[s["skill_name"]]
+                best[j] = max(best.get(j, -1), LEVEL_RANK[s["level"]])
+        keep.append(all(best.get(j, -1) >= max(rank, 0) for j, rank in required))
+    return np.array(keep)
+
+
+REQUIREMENTS = [
+    [],
+    [(0, 0)],
+    [(1, LEVEL_RANK["CollegeResearch"])],
+    [(0, 0), (2, LEVEL_RANK["Professional"])],
+    # The same skill twice, at two minimum levels
+    [(3, 0), (3, LEVEL_RANK["Other"])],
+]
+
+
+@pytest.fixture(scope="module")
+def projects():
+    return random_projects(400)
+
+
+@pytest.fixture(scope="module")
+def snapshots(projects, tmp_path_factory):
+    data = {"projects": projects, "users": {}}
+    path = tmp_path_factory.mktemp("filters") / "training_data.json"
+    path.write_text(json.dumps(data))
+    catalog_dir = write_catalog(data, path.parent / "catalog")
+    return build_snapshot(str(path)), build_snapshot(str(catalog_dir))
+
+
+@pytest.mark.parametrize("required", REQUIREMENTS)
+def test_mask_matches_reference(projects, snapshots, required):
+    expected = reference_mask(projects, required)
+    for snapshot in snapshots:
+        index = ProjectFilterIndex.from_snapshot(snapshot)
+        np.testing.assert_array_equal(index.mask(required), expected)
+
+
+def test_row_and_column_builds_agree(snapshots):
+    from_rows, from_columns = (ProjectFilterIndex.from_snapshot(s) for s in snapshots)
+    np.testing.assert_array_equal(from_rows.bits, from_columns.bits)
+    np.testing.assert_array_equal(from_rows.levels, from_columns.levels)
+    from_matrix = ProjectFilterIndex.from_level_matrix(from_rows.levels.T)
+    np.testing.assert_array_equal(from_matrix.bits, from_rows.bits)
+
+
+def test_extend_adds_runtime_rows_without_touching_the_base(snapshots):
+    index = ProjectFilterIndex.from_snapshot(snapshots[0])
+    extended = index.extend(
+        [
+            [
+                SkillMetadata(
+                    skill_name=SKILL_CATEGORIES[1], level="Professional", months=1
+                )
+            ],
+            [],
+        ]
+    )
+    assert len(index) == 400 and len(extended) == 402
+    assert extended.bits is index.bits
+    required = [(1, LEVEL_RANK["Professional"])]
+    assert extended.mask(required)[400:].tolist() == [True, False]
+    np.testing.assert_array_equal(extended.mask(required)[:400], index.mask(required))
+
+
+def test_filter_from_request():
+    request = RecommendationRequest(
+        skills=[],
+        description="",
+        required_skills=[
+            {"skill_name": SKILL_CATEGORIES[2], "min_level": "CollegeResearch"},
+            {"skill_name": SKILL_CATEGORIES[0]},
+        ],
+        exclude_rated_by="u1",
+    )
+    filters = ProjectFilter.from_request(request)
+    assert filters.required == [(2, LEVEL_RANK["CollegeResearch"]), (0, 0)]
+    assert filters.exclude_rated_by == "u1"
+    assert (
+        ProjectFilter.from_request(RecommendationRequest(skills=[], description=""))
+        is None
+    )
+
+
+def test_rated_project_index_is_user_major():
+    rated = RatedProjectIndex(
+        project_rows=np.array([0, 0, 1, 2, 2]),
+        user_rows=np.array([0, 1, 1, 0, 2]),
+        user_ids=np.array(["a", "b", "c"]),
+        n_projects=3,
+    )
+    assert rated.rows("a").tolist() == [0, 2]
+    assert rated.rows("b").tolist() == [0, 1]
+    assert rated.rows("c").tolist() == [2]
+    assert rated.rows("unknown").size == 0
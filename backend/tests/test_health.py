@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import inference_app
+from services.startup import StartupReport
+from settings import settings
+
+
+class FakeService:
+    """Stands in for RecommendationService in the app's lifespan."""
+
+    fail_warm_up = False
+    loaded = threading.Event()
+
+    def __init__(self):
+        FakeService.loaded.wait(5)
+        self.startup = StartupReport()
+        self.stopped = False
+        FakeService.instance = self
+
+    async def start(self):
+        pass
+
+    async def warm_up(self):
+        with self.startup.stage("warm up"):
+            if self.fail_warm_up:
+                raise RuntimeError("warm-up inference failed")
+
+    async def stop(self):
+        self.stopped = True
+
+    def describe(self):
+        return {"model_version": "test", "catalog_size": 3}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(inference_app, "RecommendationService", FakeService)
+    monkeypatch.setattr(settings, "WARM_UP_IN_BACKGROUND", True)
+    monkeypatch.setattr(FakeService, "fail_warm_up", False)
+    monkeypatch.setattr(FakeService, "loaded", threading.Event())
+    with TestClient(inference_app.app) as client:
+        yield client
+        FakeService.loaded.set()
+
+
+def wait_for(client, status):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        body = client.get("/readyz").json()
+        if body["status"] == status:
+            return body
+        time.sleep(0.01)
+    raise AssertionError(f"/readyz never reported {status!r}: {body}")
+
+
+def test_not_ready_while_loading(client):
+    health = client.get("/healthz")
+    assert health.status_code == 200
+    assert health.json()["status"] == "alive"
+    assert health.json()["model_state"] == "loading"
+    ready = client.get("/readyz")
+    assert ready.status_code == 503 and ready.json() == {"status": "loading"}
+
+
+def test_ready_after_warm_up(client):
+    FakeService.loaded.set()
+    body = wait_for(client, "ready")
+    assert body["model_version"] == "test" and body["catalog_size"] == 3
+    assert "warm up" in body["startup"]["stages"]
+    assert client.get("/readyz").status_code == 200
+    assert client.get("/healthz").json()["model_state"] == "ready"
+
+
+def test_failed_warm_up_is_reported_and_stops_the_service(client, monkeypatch):
+    monkeypatch.setattr(FakeService, "fail_warm_up", True)
+    FakeService.loaded.set()
+    body = wait_for(client, "failed")
+    assert "warm-up inference failed" in body["error"]
+    assert client.get("/readyz").status_code == 503
+    assert FakeService.instance.stopped
+    assert inference_app.app.state.recommendation_service is None
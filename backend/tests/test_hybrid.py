@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_catalog, random_request, synthetic_service
+from services.hybrid import hybrid_query, hybrid_vectors, load_hybrid_index
+from settings import settings
+
+
+def cosine(a, b):
+    return a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+
+
+def test_inner_product_is_the_weighted_cosine():
+    rng = np.random.default_rng(0)
+    profiles, texts = rng.random((5, 9)), rng.normal(size=(5, 16))
+    user_num, user_txt = rng.random(9), rng.normal(size=16)
+    scores = hybrid_vectors(profiles, texts) @ hybrid_query(user_num, user_txt, 0.65)
+    expected = [
+        0.65 * cosine(p, user_num) + 0.35 * cosine(t, user_txt)
+        for p, t in zip(profiles, texts)
+    ]
+    np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+def test_zero_rows_score_zero_on_their_half():
+    vectors = hybrid_vectors(np.zeros((2, 3)), np.ones((2, 4)))
+    assert np.isfinite(vectors).all()
+    np.testing.assert_array_equal(vectors[:, :3], 0)
+    query = hybrid_query(np.zeros(3), np.ones(4), 0.65)
+    np.testing.assert_allclose(vectors @ query, 0.35, rtol=1e-6)
+
+
+def test_index_vectors_are_only_built_when_stale(tmp_path):
+    vectors = np.random.default_rng(1).normal(size=(60, 6)).astype(np.float32)
+    source = tmp_path / "profiles.npy"
+    np.save(source, vectors)
+    path = str(tmp_path / "hybrid")
+    builds = []
+
+    def load(n_projects):
+        def build():
+            builds.append(n_projects)
+            return vectors[:n_projects]
+
+        return load_hybrid_index(build, n_projects, path, [str(source)])
+
+    assert len(load(50)) == 50
+    assert len(load(50)) == 50
+    # A catalog of another size rebuilds even though no source file changed
+    assert len(load(60)) == 60
+    assert builds == [50, 60]
+
+
+def test_full_pool_reranks_to_the_exact_ranking(tmp_path, monkeypatch):
+    catalog = generate_catalog(300, str(tmp_path), with_text=True)
+    service = synthetic_service(catalog, batch_max_size=1, hybrid=True)
+    monkeypatch.setattr(settings, "HYBRID_POOL_SIZE", 300)
+    monkeypatch.setattr(settings, "ANN_NPROBE", service.hybrid_index.n_lists)
+    try:
+        request = random_request(np.random.default_rng(2), top_k=10)
+        skills, description = request["skills"], request["description"]
+        hybrid = asyncio.run(service.recommend(skills, description, 10, mode="hybrid"))
+        exact = asyncio.run(service.recommend(skills, description, 10, mode="exact"))
+        assert hybrid[0] == exact[0]
+        np.testing.assert_allclose(hybrid[1], exact[1], rtol=1e-5)
+    finally:
+        service.executor.shutdown()
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from data.quantize import QuantizedMatrix
+from services import live_index
+from services.live_index import LiveProjectIndex
+
+DIM = 6
+
+
+def brute_force(vectors, query, k, exclude=()):
+    scores = vectors @ query
+    scores[list(exclude)] = -np.inf
+    order = np.argsort(-scores, kind="stable")[:k]
+    return order, scores[order]
+
+
+@pytest.fixture
+def base():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(40, DIM)).astype(np.float32)
+
+
+@pytest.fixture
+def index(base):
+    return LiveProjectIndex(QuantizedMatrix(base))
+
+
+def test_upsert_appends_rows_after_the_base(index, base):
+    new = np.random.default_rng(1).normal(size=(3, DIM)).astype(np.float32)
+    rows = index.upsert(new)
+    assert rows.tolist() == [40, 41, 42] and len(index) == 43
+    np.testing.assert_array_equal(index.snapshot.row(41), new[1])
+    np.testing.assert_array_equal(index.snapshot.row(5), base[5])
+
+
+def live(result):
+    """Rows a caller keeps: masked rows only ever come back scored -inf."""
+    idxs, scores = result
+    return idxs[np.isfinite(scores)]
+
+
+def test_replaced_rows_are_never_returned(index, base):
+    query = base[7]
+    assert index.snapshot.search(query, 1)[0][0] == 7
+    (row,) = index.upsert(-base[7:8], replaces=np.array([7]))
+    snap = index.snapshot
+    assert snap.masked.tolist() == [7]
+    idxs = live(snap.search(query, len(snap)))
+    assert 7 not in idxs and row in idxs and len(idxs) == 40
+    # Replacing an appended row masks it in the delta as well
+    index.upsert(base[7:8], replaces=np.array([row]))
+    assert row not in live(index.snapshot.search(query, len(index)))
+
+
+def test_published_snapshots_never_change(index, base):
+    rng = np.random.default_rng(2)
+    first = rng.normal(size=(10, DIM)).astype(np.float32)
+    index.upsert(first)
+    old = index.snapshot
+    old_delta = old.delta.copy()
+    query = rng.normal(size=DIM).astype(np.float32)
+    old_result = old.search(query, 5)
+
+    # Fill the buffer past its capacity so it is reallocated
+    index.upsert(rng.normal(size=(30, DIM)).astype(np.float32), replaces=np.arange(30))
+    assert len(index) == 80
+    assert len(old) == 50 and old.masked.size == 0
+    np.testing.assert_array_equal(old.delta, old_delta)
+    for got, expected in zip(old.search(query, 5), old_result):
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_search_matches_brute_force_on_every_path(index, base, monkeypatch):
+    rng = np.random.default_rng(3)
+    delta = rng.normal(size=(20, DIM)).astype(np.float32)
+    index.upsert(delta, replaces=np.r_[np.arange(5), -np.ones(15, np.int64)])
+    everything = np.vstack([base, delta])
+    query = rng.normal(size=DIM).astype(np.float32)
+    expected = brute_force(everything, query, 8, exclude=range(5))
+
+    snap = index.snapshot
+    monkeypatch.setattr(live_index, "SCORE_BLOCK_SIZE", 16)
+    for got in (snap.search(query, 8), snap.search_batch(query[None], 8)):
+        np.testing.assert_array_equal(np.ravel(got[0]), expected[0])
+        np.testing.assert_allclose(np.ravel(got[1]), expected[1], rtol=1e-5)
+
+
+@pytest.mark.parametrize("share", [0.1, 0.9])
+def test_prefiltered_search_keeps_only_allowed_rows(index, base, share):
+    rng = np.random.default_rng(4)
+    delta = rng.normal(size=(10, DIM)).astype(np.float32)
+    index.upsert(delta, replaces=np.r_[[0], -np.ones(9, np.int64)])
+    snap = index.snapshot
+    keep = rng.random(len(snap)) < share
+    keep[0] = True  # masked rows stay out even when kept
+    query = rng.normal(size=DIM).astype(np.float32)
+    expected = brute_force(
+        np.vstack([base, delta]), query, 5, exclude=[0, *np.flatnonzero(~keep)]
+    )
+    idxs, vals = snap.search(query, 5, keep=keep)
+    np.testing.assert_array_equal(idxs, expected[0][: len(idxs)])
+    np.testing.assert_allclose(vals, expected[1][: len(idxs)], rtol=1e-5)
+    assert keep[idxs].all() and 0 not in idxs
+
+
+def test_search_delta_only_scores_appended_rows(index, base):
+    delta = np.random.default_rng(5).normal(size=(4, DIM)).astype(np.float32)
+    index.upsert(delta)
+    query = delta[2]
+    idxs, _ = index.snapshot.search_delta(query, 10)
+    assert sorted(idxs.tolist()) == [40, 41, 42, 43]
+    assert idxs[0] == 42
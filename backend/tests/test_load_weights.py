@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+
+from data.load_weights import (
+    DEFAULT_FILE_MODE,
+    atomic_write,
+    converted_path,
+    load_weight_array,
+    save_array_atomic,
+)
+
+
+def test_atomic_write_replaces_file_with_umask_mode(tmp_path):
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"old")
+    with atomic_write(str(path)) as f:
+        f.write(b"new")
+        # The destination is untouched until the block exits
+        assert path.read_bytes() == b"old"
+    assert path.read_bytes() == b"new"
+    assert os.stat(path).st_mode & 0o777 == DEFAULT_FILE_MODE
+    assert os.listdir(tmp_path) == ["out.bin"]
+
+
+def test_atomic_write_removes_temp_file_on_error(tmp_path):
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write(b"partial")
+            raise RuntimeError("boom")
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["out.bin"]
+
+
+def test_concurrent_writers_use_distinct_temp_files(tmp_path):
+    path = str(tmp_path / "out.bin")
+    with atomic_write(path) as a, atomic_write(path) as b:
+        assert a.name != b.name
+        a.write(b"a")
+        b.write(b"b")
+    assert open(path, "rb").read() == b"a"
+
+
+def test_save_array_atomic_round_trip(tmp_path):
+    path = str(tmp_path / "w.npy")
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    save_array_atomic(path, array)
+    np.testing.assert_array_equal(np.load(path), array)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_load_weight_array_same_dtype(tmp_path, mmap):
+    path = str(tmp_path / "w.npy")
+    array = np.random.default_rng(0).normal(size=(5, 3)).astype(np.float32)
+    np.save(path, array)
+    loaded = load_weight_array(path, "float32", mmap=mmap)
+    assert isinstance(loaded, np.memmap) == mmap
+    np.testing.assert_array_equal(loaded, array)
+    assert not os.path.exists(converted_path(path, "float32"))
+
+
+def test_load_weight_array_converts_once_and_refreshes(tmp_path):
+    path = str(tmp_path / "w.npy")
+    np.save(path, np.ones((2, 2), np.float32))
+    loaded = load_weight_array(path, "float16")
+    target = converted_path(path, "float16")
+    assert target.endswith("w.float16.npy")
+    assert loaded.dtype == np.float16 and os.path.exists(target)
+
+    # A newer source file invalidates the converted sibling
+    np.save(path, np.full((2, 2), 3, np.float32))
+    stale = os.path.getmtime(path) - 10
+    os.utime(target, (stale, stale))
+    np.testing.assert_array_equal(load_weight_array(path, "float16"), 3)
+
+
+def test_load_weight_array_keeps_file_dtype_and_rejects_unknown(tmp_path):
+    path = str(tmp_path / "w.npy")
+    np.save(path, np.ones(3, np.float16))
+    assert load_weight_array(path, None).dtype == np.float16
+    with pytest.raises(ValueError):
+        load_weight_array(path, "int8")
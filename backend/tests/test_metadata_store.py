@@ -0,0 +1,120 @@
+import json
+import os
+
+import pytest
+
+from data.load_projects import ExtendedMetadataSnapshot, ProjectMetadataStore
+from schemas.predict import SkillMetadata
+
+SKILL = {"skill_name": "Python", "level": "Basic", "months": 3}
+
+
+def write_projects(path, n):
+    projects = {
+        f"p{i}": {"description": f"d{i}", "skills": [SKILL], "interactions": []}
+        for i in range(n)
+    }
+    path.write_text(json.dumps({"projects": projects, "users": {}}))
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "training_data.json"
+    write_projects(path, 3)
+    return ProjectMetadataStore(str(path), check_interval=0)
+
+
+def skills(months):
+    return [SkillMetadata(skill_name="SQL", level="Other", months=months)]
+
+
+def test_append_adds_rows_after_the_catalog(store):
+    store.append([("p9", "new", skills(1)), ("p10", "newer", skills(2))])
+    snap = store.snapshot
+    assert isinstance(snap, ExtendedMetadataSnapshot)
+    assert len(snap) == 5 and snap.n_base == 3
+    assert snap.row(1)[0] == "p1"
+    assert snap.row(4) == ("p10", "newer", skills(2))
+    assert snap.index_of("p9") == 3 and snap.index_of("p0") == 0
+    with pytest.raises(IndexError):
+        snap.row(5)
+
+
+def test_old_snapshots_keep_their_view(store):
+    store.append([("p9", "v1", skills(1))])
+    old = store.snapshot
+    store.append([("p9", "v2", skills(2)), ("p1", "edited", skills(3))])
+    new = store.snapshot
+
+    assert len(old) == 4 and [r[1] for r in old.extra] == ["v1"]
+    assert old.index_of("p9") == 3 and old.index_of("p1") == 1
+    with pytest.raises(IndexError):
+        old.row(4)
+    # The newest row of a re-appended project wins
+    assert new.index_of("p9") == 4 and new.index_of("p1") == 5
+    assert new.row(new.index_of("p9"))[1] == "v2"
+
+
+def test_refresh_keeps_appended_rows(store, tmp_path):
+    store.append([("p9", "new", skills(1))])
+    path = tmp_path / "training_data.json"
+    data = json.loads(path.read_text())
+    data["projects"]["p0"]["description"] = "changed"
+    path.write_text(json.dumps(data))
+    touch_later(path)
+
+    assert store.refresh()
+    snap = store.snapshot
+    assert snap.row(0)[1] == "changed"
+    assert snap.row(3)[0] == "p9" and snap.index_of("p9") == 3
+
+
+def touch_later(path):
+    """Push the mtime past the filesystem's granularity so a rewrite is seen."""
+    later = path.stat().st_mtime + 10
+    os.utime(path, (later, later))
+
+
+def test_refresh_swaps_a_rewritten_catalog(store, tmp_path):
+    path = tmp_path / "training_data.json"
+    old = store.snapshot
+    assert not store.refresh()
+
+    data = json.loads(path.read_text())
+    data["projects"]["p2"]["description"] = "changed"
+    path.write_text(json.dumps(data))
+    touch_later(path)
+
+    assert store.refresh()
+    assert store.snapshot is not old and store.snapshot.row(2)[1] == "changed"
+    assert old.row(2)[1] == "d2"
+    assert not store.refresh()
+
+
+def test_refresh_refuses_a_changed_row_count(store, tmp_path):
+    path = tmp_path / "training_data.json"
+    old = store.snapshot
+    write_projects(path, 4)
+    touch_later(path)
+
+    assert not store.refresh()
+    assert store.snapshot is old and len(store) == 3
+
+
+def test_refresh_waits_for_the_check_interval(tmp_path, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("data.load_projects.time.monotonic", lambda: now[0])
+    path = tmp_path / "training_data.json"
+    write_projects(path, 3)
+    store = ProjectMetadataStore(str(path), check_interval=5)
+    data = json.loads(path.read_text())
+    data["projects"]["p0"]["description"] = "changed"
+    path.write_text(json.dumps(data))
+    touch_later(path)
+
+    now[0] += 4
+    assert not store.refresh_due() and not store.refresh()
+    assert store.snapshot.row(0)[1] == "d0"
+    now[0] += 1
+    assert store.refresh_due() and store.refresh()
+    assert store.snapshot.row(0)[1] == "changed" and not store.refresh_due()
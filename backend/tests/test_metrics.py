@@ -0,0 +1,56 @@
+import pytest
+
+from services.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(enabled=True)
+
+
+def test_counter_renders_per_label_set(registry):
+    requests = registry.counter("requests_total", "Requests.", labels=("route",))
+    registry.inc(requests, "/predict")
+    registry.inc(requests, "/predict", amount=2)
+    registry.inc(requests, "/readyz")
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/predict"} 3' in text
+    assert 'requests_total{route="/readyz"} 1' in text
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    sizes = registry.histogram("batch_size", "Rows.", buckets=(1, 4, 16))
+    for value in (1, 3, 4, 20):
+        registry.observe(sizes, value)
+    lines = registry.render().splitlines()
+    assert 'batch_size_bucket{le="1"} 1' in lines
+    assert 'batch_size_bucket{le="4"} 3' in lines
+    assert 'batch_size_bucket{le="16"} 3' in lines
+    assert 'batch_size_bucket{le="+Inf"} 4' in lines
+    assert "batch_size_sum 28" in lines and "batch_size_count 4" in lines
+
+
+def test_stage_timings_and_gauges(registry):
+    with registry.stage("embed_text"):
+        pass
+    registry.gauge("queue_depth", "Waiting tasks.", lambda: 7)
+    registry.gauge("queue_depth", "Waiting tasks.", lambda: 2)  # replaced
+    text = registry.render()
+    assert 'predict_stage_seconds_count{stage="embed_text"} 1' in text
+    assert "queue_depth 2" in text and "queue_depth 7" not in text
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    requests = registry.counter("requests_total", "Requests.")
+    registry.inc(requests)
+    with registry.stage("score"):
+        pass
+    samples = [l for l in registry.render().splitlines() if not l.startswith("#")]
+    assert samples == []
+
+
+def test_registering_twice_returns_the_same_metric(registry):
+    first = registry.counter("c_total", "C.")
+    assert registry.counter("c_total", "C.") is first
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_folded_tower
+from models.extract import TOWER_NAMES
+from models.numpy_tower import forward, load_towers, save_towers
+from services.backends import NumpyTowers
+
+N_SKILLS, TEXT_DIM, EMB_SIZE = 12, 20, 8
+
+
+def relu(x):
+    return np.maximum(x, 0)
+
+
+def reference(tower, num, txt):
+    """The folded tower written out layer by layer."""
+    out = 0
+    for x, init, blocks in (
+        (num, tower.init_num, tower.blocks_num),
+        (txt, tower.init_txt, tower.blocks_txt),
+    ):
+        x = relu(x @ init[0] + init[1])
+        for kernel, bias in blocks:
+            x = x + relu(x @ kernel + bias)
+        out = out + x
+    return out
+
+
+@pytest.fixture
+def towers():
+    rng = np.random.default_rng(0)
+    return {
+        name: random_folded_tower(rng, N_SKILLS, TEXT_DIM, EMB_SIZE, depth=2)
+        for name in TOWER_NAMES
+    }
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(1)
+    num = (rng.random((6, N_SKILLS)) * 30).astype(np.float32)
+    txt = rng.normal(0, 0.05, (6, TEXT_DIM)).astype(np.float32)
+    return num, txt
+
+
+def test_forward_matches_the_layers(towers, inputs):
+    num, txt = inputs
+    tower = towers["project_tower"]
+    out = forward(tower, num, txt)
+    np.testing.assert_allclose(out, reference(tower, num, txt), rtol=1e-5)
+    # Intermediates are updated in place, never the inputs or weights
+    np.testing.assert_array_equal(num, inputs[0])
+    np.testing.assert_allclose(forward(tower, num, txt), out)
+
+
+def test_save_load_round_trip(towers, tmp_path):
+    path = str(tmp_path / "folded.npz")
+    save_towers(towers, path)
+    loaded = load_towers(path)
+    for name, tower in towers.items():
+        assert len(loaded[name].blocks_num) == len(tower.blocks_num) == 2
+        for got, expected in zip(
+            [loaded[name].init_num, *loaded[name].blocks_txt],
+            [tower.init_num, *tower.blocks_txt],
+        ):
+            np.testing.assert_array_equal(got[0], expected[0])
+            np.testing.assert_array_equal(got[1], expected[1])
+    assert os.listdir(tmp_path) == ["folded.npz"]
+
+
+def test_load_rejects_a_file_without_both_towers(towers, tmp_path):
+    path = str(tmp_path / "folded.npz")
+    save_towers({"employee_tower": towers["employee_tower"]}, path)
+    with pytest.raises(ValueError, match="project_tower"):
+        load_towers(path)
+
+
+def test_numpy_towers_backend(towers, inputs, tmp_path):
+    path = str(tmp_path / "folded.npz")
+    save_towers(towers, path)
+    runner = NumpyTowers(str(tmp_path / "missing.keras"), path)
+    assert runner.emb_size == EMB_SIZE and runner.source_paths == (path,)
+    num, txt = inputs
+    np.testing.assert_allclose(
+        runner.encode_users(num, txt),
+        reference(towers["employee_tower"], num, txt),
+        rtol=1e-5,
+    )
+    with pytest.raises(FileNotFoundError, match="models.numpy_tower"):
+        NumpyTowers("model.keras", str(tmp_path / "absent.npz"))
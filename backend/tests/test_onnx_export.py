@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_folded_tower
+from models.extract import TOWER_NAMES, fold_batch_norm
+from models.onnx_export import onnx_path, tower_to_onnx
+from services import backends
+from services.backends import OnnxTowers
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+N_SKILLS, TEXT_DIM, EMB_SIZE = 12, 20, 8
+
+
+def relu(x):
+    return np.maximum(x, 0)
+
+
+def reference(tower, num, txt):
+    """The folded tower written out layer by layer."""
+    out = 0
+    for x, init, blocks in (
+        (num, tower.init_num, tower.blocks_num),
+        (txt, tower.init_txt, tower.blocks_txt),
+    ):
+        x = relu(x @ init[0] + init[1])
+        for kernel, bias in blocks:
+            x = x + relu(x @ kernel + bias)
+        out = out + x
+    return out
+
+
+def test_fold_batch_norm_matches_dense_then_batch_norm():
+    rng = np.random.default_rng(0)
+    kernel, bias = rng.normal(size=(5, 3)), rng.normal(size=3)
+    gamma, beta, mean = rng.normal(size=3), rng.normal(size=3), rng.normal(size=3)
+    variance = rng.random(3) + 0.1
+    x = rng.normal(size=(4, 5))
+    expected = (x @ kernel + bias - mean) * gamma / np.sqrt(variance + 1e-3) + beta
+    folded_kernel, folded_bias = fold_batch_norm(
+        kernel, bias, gamma, beta, mean, variance, 1e-3
+    )
+    assert folded_kernel.dtype == folded_bias.dtype == np.float32
+    np.testing.assert_allclose(x @ folded_kernel + folded_bias, expected, rtol=1e-5)
+
+
+@pytest.fixture
+def onnx_dir(tmp_path):
+    rng = np.random.default_rng(1)
+    towers = {
+        name: random_folded_tower(rng, N_SKILLS, TEXT_DIM, EMB_SIZE)
+        for name in TOWER_NAMES
+    }
+    for name, tower in towers.items():
+        model = tower_to_onnx(tower, name)
+        onnx.checker.check_model(model)
+        onnx.save(model, onnx_path(name, str(tmp_path)))
+    return tmp_path, towers
+
+
+def test_onnx_towers_match_the_folded_weights(onnx_dir, monkeypatch):
+    path, towers = onnx_dir
+    runner = OnnxTowers(str(path / "missing.keras"), str(path))
+    assert runner.emb_size == EMB_SIZE
+    assert runner.source_paths == tuple(onnx_path(n, str(path)) for n in TOWER_NAMES)
+
+    rng = np.random.default_rng(2)
+    num = rng.random((10, N_SKILLS)) * 30
+    txt = rng.normal(0, 0.05, (10, TEXT_DIM))
+    # Several slices, and float64 inputs converted on the way in
+    monkeypatch.setattr(backends, "ENCODE_BATCH_SIZE", 3)
+    for name, encode in (
+        ("employee_tower", runner.encode_users),
+        ("project_tower", runner.encode_projects),
+    ):
+        out = encode(num, txt)
+        assert out.dtype == np.float32 and out.shape == (10, EMB_SIZE)
+        np.testing.assert_allclose(
+            out, reference(towers[name], num, txt), rtol=1e-4, atol=1e-4
+        )
+    assert runner.encode_users(num[:0], txt[:0]).shape == (0, EMB_SIZE)
+
+
+def test_missing_export_names_the_command(tmp_path):
+    with pytest.raises(FileNotFoundError, match="models.onnx_export"):
+        OnnxTowers("model.keras", str(tmp_path))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import generate_catalog, random_request, synthetic_service
+from routes import predict
+from settings import settings
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "RESULT_CURSOR_DEPTH", 20)
+    service = synthetic_service(generate_catalog(200, str(tmp_path)), batch_max_size=1)
+    app = FastAPI()
+    app.include_router(predict.router)
+    app.state.recommendation_service = service
+    yield TestClient(app)
+    service.executor.shutdown()
+
+
+def test_repeated_request_is_served_from_cache_with_the_same_etag(client):
+    payload = random_request(np.random.default_rng(0), top_k=5)
+    first = client.post("/predict/", json=payload)
+    assert first.status_code == 200 and len(first.json()) == 5
+    # Skill order does not change the request
+    payload["skills"] = payload["skills"][::-1]
+    second = client.post("/predict/", json=payload)
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    service = client.app.state.recommendation_service
+    assert service.response_cache.hits == 1
+
+
+def test_matching_if_none_match_gets_an_empty_304(client):
+    payload = random_request(np.random.default_rng(1), top_k=5)
+    etag = client.post("/predict/", json=payload).headers["ETag"]
+    response = client.post("/predict/", json=payload, headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["ETag"] == etag
+    other = client.post(
+        "/predict/", json=payload, headers={"If-None-Match": '"something-else"'}
+    )
+    assert other.status_code == 200
+
+
+def test_cursor_header_pages_through_the_ranking(client):
+    payload = random_request(np.random.default_rng(2), top_k=8)
+    response = client.post("/predict/", json=payload)
+    ranks = [r["rank"] for r in response.json()]
+    cursor = response.headers[predict.CURSOR_HEADER]
+    while cursor:
+        page = client.get("/predict/page", params={"cursor": cursor})
+        ranks += [r["rank"] for r in page.json()]
+        cursor = page.headers.get(predict.CURSOR_HEADER)
+    assert ranks == list(range(1, 21))
+
+
+def test_requests_before_the_service_is_ready_get_503():
+    app = FastAPI()
+    app.include_router(predict.router)
+    app.state.recommendation_service = None
+    payload = random_request(np.random.default_rng(3), top_k=5)
+    response = TestClient(app).post("/predict/", json=payload)
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
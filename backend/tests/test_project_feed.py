@@ -0,0 +1,181 @@
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.synthetic import HashTextEmbedding
+from constants import skill2idx
+from data.load_projects import ProjectMetadataStore
+from data.quantize import QuantizedMatrix
+from database import Base
+from schemas.orm import Interaction, Project, Skill
+from services.filters import ProjectFilterIndex, RatedProjectIndex
+from services.predict import RecommendationService, ServiceComponents
+from services.project_feed import ProjectChangeFeed, ProjectRecord, has_changed
+
+EMB_SIZE = 4
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'crud.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(1, 6):
+            skill = Skill(name=f"Skill{i}", level="Basic", months=i)
+            session.add(
+                Project(external_id=f"p{i}", description=f"d{i}", skills=[skill])
+            )
+        session.add(Interaction(user_id="u1", project_id="p2", rating=5.0))
+        session.commit()
+    engine.dispose()
+    return url
+
+
+def add_project(url, external_id):
+    engine = create_engine(url)
+    with Session(engine) as session:
+        session.add(Project(external_id=external_id, description="new"))
+        session.commit()
+    engine.dispose()
+
+
+def test_fetch_since_reads_rows_with_their_skills(db_url):
+    feed = ProjectChangeFeed(db_url, batch_size=2)
+    batch = feed.fetch_since(1)
+    assert [r.external_id for r in batch] == ["p2", "p3"]
+    assert batch[0].description == "d2"
+    assert batch[0].skills == [{"skill_name": "Skill2", "level": "Basic", "months": 2}]
+    assert feed.rated_project_ids("u1") == ["p2"]
+
+
+def test_poll_advances_the_watermark_before_each_batch(db_url):
+    feed = ProjectChangeFeed(db_url, batch_size=2, full_scan_every=0)
+    seen = []
+    for batch in feed.poll():
+        # The watermark already covers the batch being handled
+        assert feed.watermark == batch[-1].id
+        seen.append([r.external_id for r in batch])
+    assert seen == [["p1", "p2"], ["p3", "p4"], ["p5"]]
+
+    add_project(db_url, "p6")
+    assert [[r.external_id for r in b] for b in feed.poll()] == [["p6"]]
+    assert list(feed.poll()) == []
+
+
+def test_a_failing_consumer_does_not_stall_the_watermark(db_url):
+    feed = ProjectChangeFeed(db_url, batch_size=2, full_scan_every=0)
+    polls = feed.poll()
+    next(polls)
+    polls.close()  # the consumer gave up on the first batch
+    assert [r.external_id for b in feed.poll() for r in b] == ["p3", "p4", "p5"]
+
+
+def test_full_scan_rereads_the_table(db_url):
+    feed = ProjectChangeFeed(db_url, batch_size=10, full_scan_every=2)
+    assert sum(len(b) for b in feed.poll()) == 5
+    assert sum(len(b) for b in feed.poll()) == 0
+    assert sum(len(b) for b in feed.poll()) == 5
+
+
+def test_has_changed_ignores_skill_order_and_missing_descriptions():
+    skills = [
+        {"skill_name": "A", "level": "Basic", "months": 1},
+        {"skill_name": "B", "level": "Other", "months": 2},
+    ]
+    record = ProjectRecord(1, "p1", "desc", list(reversed(skills)))
+    assert not has_changed(record, "desc", skills)
+    assert has_changed(record, "other", skills)
+    assert has_changed(record, "desc", skills[:1])
+    assert not has_changed(ProjectRecord(1, "p1", "", skills), "anything", skills)
+
+
+class FakeTowers:
+    source_paths = ()
+
+    def encode_projects(self, num, txt):
+        return txt[:, :EMB_SIZE].copy()
+
+    def encode_users(self, num, txt):
+        return txt[:, :EMB_SIZE].copy()
+
+
+@pytest.fixture
+def service(db_url, tmp_path):
+    # The catalog knows p1..p3; p3's skills have since changed in the database
+    projects = {
+        f"p{i}": {
+            "description": f"d{i}",
+            "skills": [
+                {
+                    "skill_name": f"Skill{i}",
+                    "level": "Basic",
+                    "months": 99 if i == 3 else i,
+                }
+            ],
+        }
+        for i in range(1, 4)
+    }
+    path = tmp_path / "training_data.json"
+    path.write_text(json.dumps({"projects": projects, "users": {}}))
+    store = ProjectMetadataStore(str(path))
+    embs = np.random.default_rng(0).normal(size=(3, EMB_SIZE)).astype(np.float32)
+    components = ServiceComponents(
+        towers=FakeTowers(),
+        model_version="test",
+        project_profiles=np.zeros((3, len(skill2idx)), np.float32),
+        project_embs=QuantizedMatrix(embs),
+        text_model=HashTextEmbedding(),
+        projects=store,
+        filters=ProjectFilterIndex.from_snapshot(store.snapshot),
+        rated_projects=RatedProjectIndex(
+            np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, str), 3
+        ),
+        project_feed=ProjectChangeFeed(db_url, batch_size=2, full_scan_every=0),
+    )
+    service = RecommendationService(components, batch_max_size=1)
+    yield service
+    service.executor.shutdown()
+
+
+def test_sync_projects_ingests_new_and_changed_rows(service):
+    assert service.sync_projects() == 3
+    snap = service.projects.snapshot
+    assert snap.index_of("p3") == 3 and snap.index_of("p4") == 4
+    assert snap.index_of("p5") == 5
+    live = service.live_projects.snapshot
+    assert len(live) == 6 and live.masked.tolist() == [2]
+    assert len(service.filters) == 6
+    assert service.sync_projects() == 0
+
+
+def test_sync_projects_skips_invalid_rows_and_moves_on(service, db_url):
+    engine = create_engine(db_url)
+    with Session(engine) as session:
+        session.add(
+            Project(
+                external_id="broken",
+                skills=[Skill(name=None, level="Basic", months=1)],
+            )
+        )
+        session.add(Project(external_id="p7", description="after"))
+        session.commit()
+    engine.dispose()
+
+    assert service.sync_projects() == 4
+    snap = service.projects.snapshot
+    assert snap.index_of("broken") is None and snap.index_of("p7") == 6
+    assert service.project_feed.watermark == 7
+
+
+def test_sync_projects_drops_a_batch_that_fails_to_embed(service, monkeypatch):
+    def fail(num, txt):
+        raise RuntimeError("tower failure")
+
+    monkeypatch.setattr(service.towers, "encode_projects", fail)
+    assert service.sync_projects() == 0
+    assert service.project_feed.watermark == 5
+    assert len(service.projects) == 3 and len(service.live_projects) == 3
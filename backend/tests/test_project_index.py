@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from services.predict import build_project_index, load_project_index
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    rng = np.random.default_rng(0)
+    profiles = rng.random((20, 9)).astype(np.float32)
+    texts = rng.normal(size=(20, 16)).astype(np.float32)
+    model = tmp_path / "model.keras"
+    model.write_bytes(b"v1")
+    return profiles, texts, str(model), str(tmp_path / "project_tower_embs.npy")
+
+
+class Encoder:
+    """Project tower stand-in counting how often the catalog is encoded."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, num, txt):
+        self.calls += 1
+        return np.hstack([num[:, :2], txt[:, :2]])
+
+
+def test_build_writes_the_tower_outputs(inputs):
+    profiles, texts, _, index_path = inputs
+    embs = build_project_index(Encoder(), profiles, texts, index_path)
+    np.testing.assert_array_equal(np.load(index_path), embs)
+    assert embs.shape == (20, 4)
+
+
+def test_index_is_reused_until_a_source_changes(inputs):
+    profiles, texts, model, index_path = inputs
+    encode = Encoder()
+
+    def load(n=20):
+        return load_project_index(
+            encode, profiles[:n], texts[:n], index_path, source_paths=(model,)
+        )
+
+    first = load()
+    assert encode.calls == 1 and first.shape == (20, 4)
+    load()
+    assert encode.calls == 1
+
+    newer = os.path.getmtime(index_path) + 10
+    os.utime(model, (newer, newer))
+    load()
+    assert encode.calls == 2
+
+    # A catalog of another size never reuses the old matrix
+    assert load(15).shape[0] == 15 and encode.calls == 3
+
+
+def test_index_is_served_in_the_requested_precision(inputs):
+    profiles, texts, model, index_path = inputs
+    embs = load_project_index(
+        Encoder(), profiles, texts, index_path, (model,), precision="int8"
+    )
+    assert embs.precision == "int8"
+    np.testing.assert_allclose(
+        np.asarray(embs),
+        np.load(index_path),
+        atol=np.abs(np.load(index_path)).max() / 100,
+    )
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+from data import quantize
+from data.quantize import (
+    QuantizedMatrix,
+    agreement_report,
+    load_quantized,
+    quantize_rows,
+    quantized_paths,
+)
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    array = rng.normal(size=(300, 16)).astype(np.float32)
+    array[7] = 0  # an all-zero row
+    return array
+
+
+@pytest.mark.parametrize("precision, tolerance", [("float16", 1e-3), ("int8", 1e-2)])
+def test_rows_round_trip_within_precision(matrix, precision, tolerance):
+    codes, scale = quantize_rows(matrix, precision)
+    assert codes.dtype == np.dtype(precision)
+    assert (scale is None) == (precision != "int8")
+    decoded = QuantizedMatrix(codes, scale)
+    row_max = np.abs(matrix).max(axis=1, keepdims=True)
+    assert np.all(np.abs(decoded[:] - matrix) <= tolerance * np.maximum(row_max, 1))
+    np.testing.assert_array_equal(decoded[7], 0)
+
+
+@pytest.mark.parametrize("precision", ["float32", "float16", "int8"])
+def test_matmul_matches_dequantized_scores(matrix, precision, monkeypatch):
+    # Small blocks so the scan crosses several of them
+    monkeypatch.setattr(quantize, "DEQUANT_BLOCK_ELEMENTS", 16 * 37)
+    m = QuantizedMatrix(*quantize_rows(matrix, precision))
+    queries = np.random.default_rng(1).normal(size=(3, 16)).astype(np.float32)
+    dense = np.asarray(m)
+    np.testing.assert_allclose(
+        m.matmul(queries), queries @ dense.T, rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        m.matmul(queries[0], 50, 120), dense[50:120] @ queries[0], rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(m[[3, 9]], dense[[3, 9]])
+
+
+def test_int8_needs_a_scale():
+    with pytest.raises(ValueError):
+        QuantizedMatrix(np.zeros((2, 2), np.int8))
+    with pytest.raises(ValueError):
+        quantize_rows(np.zeros((2, 2)), "int4")
+
+
+def test_load_quantized_writes_and_reuses_the_store(matrix, tmp_path):
+    path = str(tmp_path / "embs.npy")
+    np.save(path, matrix)
+    loaded = load_quantized(path, "int8")
+    codes_path, scale_path = quantized_paths(path, "int8")
+    assert os.path.exists(codes_path) and os.path.exists(scale_path)
+    assert isinstance(loaded.codes, np.memmap) and loaded.precision == "int8"
+
+    written = os.path.getmtime(codes_path)
+    load_quantized(path, "int8")
+    assert os.path.getmtime(codes_path) == written
+
+    # The source dtype is served as is, without a converted copy
+    assert load_quantized(path, "float32").precision == "float32"
+    assert not os.path.exists(quantized_paths(path, "float32")[0])
+
+
+def test_agreement_report_on_int8(matrix):
+    queries = np.random.default_rng(2).normal(size=(20, 16)).astype(np.float32)
+    report = agreement_report(
+        matrix, QuantizedMatrix(*quantize_rows(matrix, "int8")), queries, k=10
+    )
+    assert report["precision"] == "int8"
+    assert report["recall_at_k"] >= 0.9
+    assert report["bytes"]["int8"] < report["bytes"]["float32"] / 3
@@ -0,0 +1,73 @@
+import asyncio
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from benchmarks.synthetic import generate_catalog, random_request, synthetic_service
+from schemas.predict import RecommendationRequest
+from settings import settings
+
+DEPTH = 25
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CURSOR_DEPTH", DEPTH)
+    monkeypatch.setattr(settings, "RESULT_CURSOR_TTL", 300.0)
+    service = synthetic_service(generate_catalog(200, str(tmp_path)), batch_max_size=1)
+    yield service
+    service.executor.shutdown()
+
+
+def make_request(top_k):
+    return RecommendationRequest(**random_request(np.random.default_rng(0), top_k))
+
+
+def test_pages_continue_the_first_ranking(service):
+    request = make_request(10)
+    first, cursor = asyncio.run(service.recommend_with_cursor(request))
+    pages = [first]
+    while cursor is not None:
+        page, cursor = service.result_page(cursor)
+        pages.append(page)
+    assert [len(p) for p in pages] == [10, 10, 5]
+    results = [r for page in pages for r in page]
+    assert [r.rank for r in results] == list(range(1, DEPTH + 1))
+
+    deep = asyncio.run(
+        service.recommend_with_metadata(
+            [s.model_dump() for s in request.skills], request.description, top_k=DEPTH
+        )
+    )
+    assert [r.project_id for r in results] == [r.project_id for r in deep]
+
+
+def test_page_size_can_change_between_pages(service):
+    _, cursor = asyncio.run(service.recommend_with_cursor(make_request(5)))
+    page, cursor = service.result_page(cursor, limit=15)
+    assert [r.rank for r in page] == list(range(6, 21))
+    page, cursor = service.result_page(cursor)
+    assert [r.rank for r in page] == list(range(21, 26)) and cursor is None
+
+
+@pytest.mark.parametrize("top_k", [DEPTH, DEPTH + 50])
+def test_requests_at_or_past_the_depth_get_one_page(service, top_k):
+    results, cursor = asyncio.run(service.recommend_with_cursor(make_request(top_k)))
+    assert len(results) == top_k and cursor is None
+
+
+def test_expired_and_malformed_cursors(service):
+    _, cursor = asyncio.run(service.recommend_with_cursor(make_request(5)))
+    service.result_cache.clear()
+    with pytest.raises(KeyError):
+        service.result_page(cursor)
+    with pytest.raises(ValueError):
+        service.result_page("not-a-cursor")
+
+
+def test_top_k_is_bounded_by_max_top_k():
+    assert make_request(settings.MAX_TOP_K).top_k == settings.MAX_TOP_K
+    for top_k in (0, settings.MAX_TOP_K + 1):
+        with pytest.raises(ValidationError):
+            make_request(top_k)
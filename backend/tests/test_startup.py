@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from services.startup import StartupReport, import_times
+
+HEAVY_PACKAGES = ("fastembed", "keras", "onnxruntime", "sqlalchemy")
+
+
+def test_report_times_stages_even_when_they_fail():
+    report = StartupReport()
+    with report.stage("fast"):
+        pass
+    with pytest.raises(RuntimeError):
+        with report.stage("slow"):
+            time.sleep(0.02)
+            raise RuntimeError("load failed")
+    assert list(report.stages) == ["fast", "slow"]
+    assert report.stages["slow"] >= 0.02
+    assert report.total == pytest.approx(sum(report.stages.values()))
+    assert report.as_dict()["total_seconds"] == round(report.total, 4)
+    assert report.summary().startswith(f"startup {report.total:.2f}s (fast ")
+
+
+def test_import_times_reports_every_module():
+    rows = import_times("json")
+    names = {name.strip() for name, _, _ in rows}
+    assert "json" in names and "json.decoder" in names
+    assert all(cumulative >= own >= 0 for _, own, cumulative in rows)
+    with pytest.raises(RuntimeError):
+        import_times("no_such_module_anywhere")
+
+
+def test_importing_the_app_leaves_heavy_runtimes_to_startup():
+    names = {name.strip().split(".")[0] for name, _, _ in import_times("inference_app")}
+    assert not names & set(HEAVY_PACKAGES)
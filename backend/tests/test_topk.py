@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from services.topk import merge_top_k_rows, top_k, top_k_rows, top_k_streaming
+
+
+def reference(scores: np.ndarray, k: int):
+    order = np.argsort(-scores, kind="stable")[:k]
+    return order, scores[order]
+
+
+@pytest.mark.parametrize("k", [1, 5, 99, 100, 150])
+def test_top_k_matches_full_sort(k):
+    scores = np.random.default_rng(0).normal(size=100).astype(np.float32)
+    idxs, vals = top_k(scores, k)
+    expected_idxs, expected_vals = reference(scores, k)
+    np.testing.assert_array_equal(idxs, expected_idxs)
+    np.testing.assert_array_equal(vals, expected_vals)
+
+
+@pytest.mark.parametrize("k", [0, -3])
+def test_top_k_empty_for_non_positive_k(k):
+    idxs, vals = top_k(np.arange(10, dtype=np.float32), k)
+    assert idxs.shape == (0,) and idxs.dtype == np.int64
+    assert vals.shape == (0,)
+
+
+def test_top_k_streaming_matches_top_k_over_concatenation():
+    rng = np.random.default_rng(1)
+    chunks = [rng.normal(size=n).astype(np.float32) for n in (7, 50, 1, 30)]
+    offsets = np.cumsum([0] + [len(c) for c in chunks[:-1]])
+    idxs, vals = top_k_streaming(zip(offsets.tolist(), chunks), 10)
+    expected_idxs, expected_vals = top_k(np.concatenate(chunks), 10)
+    np.testing.assert_array_equal(idxs, expected_idxs)
+    np.testing.assert_allclose(vals, expected_vals)
+
+
+def test_top_k_streaming_short_stream_and_zero_k():
+    chunk = np.array([0.5, 2.0, 1.0], dtype=np.float32)
+    idxs, vals = top_k_streaming([(10, chunk)], 5)
+    np.testing.assert_array_equal(idxs, [11, 12, 10])
+    np.testing.assert_array_equal(vals, [2.0, 1.0, 0.5])
+    idxs, _ = top_k_streaming([(0, chunk)], 0)
+    assert idxs.size == 0
+
+
+@pytest.mark.parametrize("k", [1, 4, 40, 60])
+def test_top_k_rows_matches_per_row_top_k(k):
+    scores = np.random.default_rng(3).normal(size=(6, 40)).astype(np.float32)
+    idxs, vals = top_k_rows(scores, k, offset=100)
+    assert idxs.shape == vals.shape == (6, min(k, 40))
+    for row in range(6):
+        expected_idxs, expected_vals = reference(scores[row], k)
+        np.testing.assert_array_equal(idxs[row], expected_idxs + 100)
+        np.testing.assert_array_equal(vals[row], expected_vals)
+
+
+def test_top_k_rows_empty_for_non_positive_k():
+    idxs, vals = top_k_rows(np.ones((3, 5), np.float32), 0)
+    assert idxs.shape == vals.shape == (3, 0)
+
+
+def test_merge_top_k_rows_matches_top_k_over_both_slices():
+    scores = np.random.default_rng(4).normal(size=(4, 70)).astype(np.float32)
+    left = top_k_rows(scores[:, :30], 8)
+    right = top_k_rows(scores[:, 30:], 8, offset=30)
+    idxs, vals = merge_top_k_rows(left, right, 8)
+    expected_idxs, expected_vals = top_k_rows(scores, 8)
+    np.testing.assert_array_equal(idxs, expected_idxs)
+    np.testing.assert_array_equal(vals, expected_vals)